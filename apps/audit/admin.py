@@ -2,15 +2,39 @@
 from django.contrib import admin
 from django.core.exceptions import PermissionDenied
 
+from apps.tenancy.admin_changelist import CompanyIdInputFilter, KeysetChangeListMixin
+from factory_manager.query_budget import QueryBudgetAdminMixin
+
+from .constants import ADMIN_CHANGELIST_QUERY_BUDGET
+
+from .events import EVENTS
 from .models import AuditEvent
 
 
+class EventNameFilter(admin.SimpleListFilter):
+    """
+    Choices come from the EVENTS registry (no SELECT DISTINCT over audit_events).
+    """
+
+    title = "event name"
+    parameter_name = "event_name"
+
+    def lookups(self, request, model_admin):
+        return [(name, name) for name in sorted(EVENTS)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(event_name=self.value())
+        return queryset
+
+
 @admin.register(AuditEvent)
-class AuditEventAdmin(admin.ModelAdmin):
+class AuditEventAdmin(QueryBudgetAdminMixin, KeysetChangeListMixin, admin.ModelAdmin):
     list_display = ("id", "event_name", "company_id", "actor_id", "created_at")
-    list_filter = ("event_name", "created_at")
+    list_filter = (EventNameFilter, CompanyIdInputFilter, "created_at")
     search_fields = ("event_name", "company_id", "actor_id")
-    ordering = ("-created_at",)
+    ordering = ("-created_at", "-id")
+    changelist_query_budget = ADMIN_CHANGELIST_QUERY_BUDGET
     readonly_fields = ("event_name", "company_id", "actor_id", "payload", "created_at")
 
     def has_add_permission(self, request):
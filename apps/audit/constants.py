@@ -19,6 +19,10 @@ MAX_PAYLOAD_DICT_KEYS: int = 200
 MAX_PAYLOAD_LIST_ITEMS: int = 200
 MAX_STRING_CHARS: int = 2000
 
+# Query budget for emit_audit_event (single INSERT; factory_manager.query_budget)
+EMIT_QUERY_BUDGET: int = 2
+ADMIN_CHANGELIST_QUERY_BUDGET: int = 20
+
 # =========================
 # Required Keys Per Event
 # =========================
@@ -55,6 +59,25 @@ REQUIRED_PAYLOAD_KEYS: dict[str, set[str]] = {
         "unit_cost",
         "source_ref",
     },
+
+    # Batch document reverse (apps.inventory.reversals)
+    "inventory.document.reversed": {
+        "document",
+        "reason",
+        "entry_count",
+        "part_count",
+        "first_sequence",
+        "last_sequence",
+    },
+
+    # verify_stock_summary: one event per mismatching (part, field)
+    "inventory.stock_summary.mismatch": {
+        "part_id",
+        "field",
+        "summary_value",
+        "ledger_value",
+        "mode",
+    },
 }
 
 # =========================
@@ -58,6 +58,16 @@ EVENTS: Dict[str, AuditEventSpec] = {
         name="inventory.reverse.duplicate_blocked",
         notes="Attempt to reverse the same ledger entry more than once blocked (fail-closed).",
     ),
+    "inventory.document.reversed": AuditEventSpec(
+        name="inventory.document.reversed",
+        notes="Ledger document reversed as one batch (apps.inventory.reversals).",
+    ),
+
+    # --- inventory / consistency ---
+    "inventory.stock_summary.mismatch": AuditEventSpec(
+        name="inventory.stock_summary.mismatch",
+        notes="PartStockSummary differs from the ledger (verify_stock_summary).",
+    ),
 }
 
 
@@ -2,12 +2,29 @@ from __future__ import annotations
 
 from django.core.exceptions import ValidationError
 
+from factory_manager.instrumentation import instrumented
+from factory_manager.query_budget import query_budget
+
+from .constants import EMIT_QUERY_BUDGET
 from .context import AUDIT_EMIT_ALLOWED
 from .events import assert_event_registered
 from .guards import run_guards
 from .models import AuditEvent
 
 
+class AuditContext:
+    """
+    emit_audit_event() context for service code outside a request: the tenant
+    company the event belongs to, never a system actor.
+    """
+
+    def __init__(self, company_id):
+        self.company_id = company_id
+        self.is_system = False
+
+
+@instrumented("audit.emit")
+@query_budget(EMIT_QUERY_BUDGET, name="audit.emit")
 def emit_audit_event(*, event_name: str, payload: dict, context, actor_id=None):
     # Registry enforcement (non-forgettable): unknown event => hard fail
     try:
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_remove_auditevent_audit_event_event_t_a71bfc_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['created_at', 'id'], name='audit_event_created_8f335b_idx'),
+        ),
+    ]
@@ -24,6 +24,8 @@ class AuditEvent(models.Model):
         indexes = [
             models.Index(fields=["company_id", "created_at"]),
             models.Index(fields=["event_name", "created_at"]),
+            # admin keyset pagination (SYSTEM scope, no tenant predicate)
+            models.Index(fields=["created_at", "id"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -1,3 +1,39 @@
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+
+from apps.audit.admin import AuditEventAdmin
+from apps.audit.hooks import emit_audit_event
+
+
+class AuditEventAdminKeysetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = get_user_model().objects.create_superuser(
+            username="su", email="su@example.com", password="pass12345"
+        )
+        cls.company_id = uuid4()
+        for i in range(3):
+            emit_audit_event(
+                event_name="inventory.admin",
+                payload={"action": f"test.{i}"},
+                context=SimpleNamespace(company_id=cls.company_id),
+            )
+
+    def test_changelist_is_keyset_paginated_without_distinct_filters(self):
+        self.client.force_login(self.superuser)
+        url = reverse("admin:audit_auditevent_changelist")
+
+        with mock.patch.object(AuditEventAdmin, "list_per_page", 2):
+            resp = self.client.get(url, {"event_name": "inventory.admin", "company_id": str(self.company_id)})
 
-# Create your tests here.
+        self.assertEqual(resp.status_code, 200)
+        cl = resp.context["cl"]
+        self.assertEqual(len(cl.result_list), 2)
+        self.assertEqual(cl.result_count, 3)
+        self.assertIn("after=", cl.keyset_next_url)
+        self.assertContains(resp, "Next")
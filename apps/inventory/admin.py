@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass
+from functools import lru_cache
 from types import SimpleNamespace
 from typing import Any
 
 from django.contrib import admin, messages
 from django.core.exceptions import PermissionDenied
 from django.core.management import call_command
+from django.db.models import TextField
+from django.db.models.functions import Cast, Substr
+from django.urls import reverse
 from django.utils.html import format_html
 
 from apps.audit.hooks import audit_event
+from apps.tenancy.admin_changelist import CompanyIdInputFilter, KeysetChangeList, KeysetChangeListMixin
+from factory_manager.query_budget import QueryBudgetAdminMixin
 
+from .constants import QueryBudgets
 from .models import BOM, BOMItem, Part, PartStockSummary, StockLedgerEntry
+from .stock_deltas import stripe_count, with_current_qty
 
 
 # =========================
@@ -83,13 +92,27 @@ def _role_code(role) -> str:
     return str(role)
 
 
+_UNRESOLVED = object()
+
+
 def _resolve_membership_for_admin(request):
     """
     Admin requests should be tenant-safe.
     We attempt to resolve membership using the tenancy RBAC layer.
 
     Fail-closed: if we cannot resolve, fallback to DB membership; if still unknown => None.
+    Memoised on the request: one membership lookup per admin request, not per call/row.
     """
+    cached = getattr(request, "_admin_membership", _UNRESOLVED)
+    if cached is not _UNRESOLVED:
+        return cached
+
+    membership = _resolve_membership_for_admin_uncached(request)
+    request._admin_membership = membership
+    return membership
+
+
+def _resolve_membership_for_admin_uncached(request):
     # Prefer DB fallback first (deterministic & test-safe)
     m_db = _fallback_membership_from_db(request)
     if m_db and _company_id_from_membership(m_db):
@@ -233,6 +256,60 @@ def _ensure_obj_in_tenant_or_raise(request, obj, *, company_field: str = "compan
         raise PermissionDenied("Cross-company admin access is forbidden.")
 
 
+# =========================
+# Admin links (tenant decision once per request)
+# =========================
+@dataclass(frozen=True)
+class _AdminTenantDecision:
+    is_system: bool
+    company_id: Any  # None => fail-closed (no cross-object links)
+
+    def allows(self, obj_company_id) -> bool:
+        if self.is_system:
+            return True
+        return bool(self.company_id) and obj_company_id == self.company_id
+
+
+def _tenant_decision(request) -> _AdminTenantDecision:
+    """
+    SYSTEM / company decision for link rendering, memoised on the request.
+    """
+    decision = getattr(request, "_admin_tenant_decision", None)
+    if decision is None:
+        is_system = _is_system_admin_request(request)
+        decision = _AdminTenantDecision(
+            is_system=is_system,
+            company_id=None if is_system else _company_id_for_request(request),
+        )
+        request._admin_tenant_decision = decision
+    return decision
+
+
+_URL_PLACEHOLDER = "00000000-0000-0000-0000-000000000000"
+
+
+@lru_cache(maxsize=None)
+def _change_url_template(model: str) -> str:
+    """
+    reverse() once per model; rows only substitute the object id.
+    """
+    return reverse(f"admin:inventory_{model}_change", args=[_URL_PLACEHOLDER]).replace(_URL_PLACEHOLDER, "{}")
+
+
+def _admin_change_urls(decision: _AdminTenantDecision, *, model: str, rows) -> dict[Any, str | None]:
+    """
+    Vectorised link resolution: rows = iterable of (obj_id, obj_company_id).
+    Returns {obj_id: url or None}; None means the link must not be rendered.
+    """
+    template = _change_url_template(model)
+    urls: dict[Any, str | None] = {}
+    for obj_id, obj_company_id in rows:
+        if obj_id in urls or not obj_id:
+            continue
+        urls[obj_id] = template.format(obj_id) if decision.allows(obj_company_id) else None
+    return urls
+
+
 def _safe_admin_change_url_for_obj(request, *, model: str, obj_id, obj_company_id) -> str | None:
     """
     Prevent cross-tenant admin link leakage.
@@ -240,18 +317,51 @@ def _safe_admin_change_url_for_obj(request, *, model: str, obj_id, obj_company_i
     """
     if not obj_id:
         return None
+    return _admin_change_urls(_tenant_decision(request), model=model, rows=[(obj_id, obj_company_id)])[obj_id]
 
-    if _is_system_admin_request(request):
-        return f"/admin/inventory/{model}/{obj_id}/change/"
 
-    req_company_id = _company_id_for_request(request)
-    if not req_company_id:
-        return None
+class _PrecomputedLinksMixin:
+    """
+    Changelist link rendering without per-row tenant resolution.
 
-    if obj_company_id != req_company_id:
-        return None
+    admin_link_fields = ((fk_field, target_admin_model), ...). After the
+    changelist page is loaded, all link URLs of the page are resolved in one
+    pass against the memoised tenant decision; row callables only look them up.
+    """
+
+    admin_link_fields: tuple[tuple[str, str], ...] = ()
+
+    def get_changelist_instance(self, request):
+        cl = super().get_changelist_instance(request)
+        decision = _tenant_decision(request)
+        rows = list(cl.result_list)
+        request._admin_link_urls = {
+            field: _admin_change_urls(
+                decision,
+                model=model,
+                rows=(
+                    (getattr(obj, f"{field}_id"), getattr(getattr(obj, field, None), "company_id", None))
+                    for obj in rows
+                ),
+            )
+            for field, model in self.admin_link_fields
+        }
+        return cl
 
-    return f"/admin/inventory/{model}/{obj_id}/change/"
+    def _render_link(self, field: str, *, model: str, obj_id, obj_company_id, label: str) -> str:
+        request = getattr(self, "_request", None)
+        if request is None:
+            return label
+
+        urls = getattr(request, "_admin_link_urls", {}).get(field)
+        if urls is not None and obj_id in urls:
+            url = urls[obj_id]
+        else:
+            url = _safe_admin_change_url_for_obj(request, model=model, obj_id=obj_id, obj_company_id=obj_company_id)
+
+        if not url:
+            return label
+        return format_html('<a href="{}">{}</a>', url, label)
 
 
 # =========================
@@ -306,14 +416,23 @@ def _audit_admin_event(
 # =========================
 # Admin registrations
 # =========================
+class _BudgetedChangelistMixin(QueryBudgetAdminMixin):
+    # Changelists must stay constant in row count (tenant decision + links resolved once)
+    changelist_query_budget = QueryBudgets.ADMIN_CHANGELIST
+
+
 @admin.register(Part)
-class PartAdmin(admin.ModelAdmin):
+class PartAdmin(_BudgetedChangelistMixin, admin.ModelAdmin):
     list_display = ("part_no", "name", "part_type", "procurement_strategy", "company_id", "updated_at")
     list_filter = ("part_type", "procurement_strategy")
     search_fields = ("part_no", "name")
     readonly_fields = ("last_purchase_price", "created_at", "updated_at")
     ordering = ("part_no",)
 
+    def get_readonly_fields(self, request, obj=None):
+        readonly = super().get_readonly_fields(request, obj)
+        return readonly if obj is None else (*readonly, *Part.IMMUTABLE_FIELDS)
+
     def changelist_view(self, request, extra_context=None):
         _deny_if_tenant_unresolved(request)
         return super().changelist_view(request, extra_context=extra_context)
@@ -333,11 +452,12 @@ class PartAdmin(admin.ModelAdmin):
 
 
 @admin.register(BOM)
-class BOMAdmin(admin.ModelAdmin):
+class BOMAdmin(_BudgetedChangelistMixin, _PrecomputedLinksMixin, admin.ModelAdmin):
     list_display = ("parent_part_link", "revision_index", "is_active", "company_id", "created_at")
     list_filter = ("is_active", "company_id")
     search_fields = ("parent_part__part_no", "parent_part__name")
     ordering = ("-created_at",)
+    admin_link_fields = (("parent_part", "part"),)
 
     def changelist_view(self, request, extra_context=None):
         _deny_if_tenant_unresolved(request)
@@ -358,20 +478,13 @@ class BOMAdmin(admin.ModelAdmin):
         if not obj.parent_part_id:
             return "-"
 
-        request = getattr(self, "_request", None)
-        label = getattr(obj.parent_part, "part_no", str(obj.parent_part_id))
-        if request is None:
-            return label
-
-        url = _safe_admin_change_url_for_obj(
-            request,
+        return self._render_link(
+            "parent_part",
             model="part",
             obj_id=obj.parent_part_id,
             obj_company_id=getattr(obj.parent_part, "company_id", None),
+            label=getattr(obj.parent_part, "part_no", str(obj.parent_part_id)),
         )
-        if not url:
-            return label
-        return format_html('<a href="{}">{}</a>', url, label)
 
     parent_part_link.short_description = "parent_part"
 
@@ -382,11 +495,12 @@ class BOMAdmin(admin.ModelAdmin):
 
 
 @admin.register(BOMItem)
-class BOMItemAdmin(admin.ModelAdmin):
+class BOMItemAdmin(_BudgetedChangelistMixin, _PrecomputedLinksMixin, admin.ModelAdmin):
     list_display = ("bom_link", "component_part_link", "qty_per", "is_direct", "company_id", "created_at")
     list_filter = ("is_direct", "company_id")
     search_fields = ("bom__parent_part__part_no", "component_part__part_no")
     ordering = ("-created_at",)
+    admin_link_fields = (("bom", "bom"), ("component_part", "part"))
 
     def changelist_view(self, request, extra_context=None):
         _deny_if_tenant_unresolved(request)
@@ -407,25 +521,19 @@ class BOMItemAdmin(admin.ModelAdmin):
         if not obj.bom_id:
             return "-"
 
-        request = getattr(self, "_request", None)
         label = (
             f"BOM:{getattr(getattr(obj.bom, 'parent_part', None), 'part_no', '')} "
             f"rev:{getattr(obj.bom, 'revision_index', '')}"
         ).strip()
         label = label if label != "BOM: rev:" else str(obj.bom_id)
 
-        if request is None:
-            return label
-
-        url = _safe_admin_change_url_for_obj(
-            request,
+        return self._render_link(
+            "bom",
             model="bom",
             obj_id=obj.bom_id,
             obj_company_id=getattr(obj.bom, "company_id", None),
+            label=label,
         )
-        if not url:
-            return label
-        return format_html('<a href="{}">{}</a>', url, label)
 
     bom_link.short_description = "bom"
 
@@ -433,20 +541,13 @@ class BOMItemAdmin(admin.ModelAdmin):
         if not obj.component_part_id:
             return "-"
 
-        request = getattr(self, "_request", None)
-        label = getattr(obj.component_part, "part_no", str(obj.component_part_id))
-        if request is None:
-            return label
-
-        url = _safe_admin_change_url_for_obj(
-            request,
+        return self._render_link(
+            "component_part",
             model="part",
             obj_id=obj.component_part_id,
             obj_company_id=getattr(obj.component_part, "company_id", None),
+            label=getattr(obj.component_part, "part_no", str(obj.component_part_id)),
         )
-        if not url:
-            return label
-        return format_html('<a href="{}">{}</a>', url, label)
 
     component_part_link.short_description = "component_part"
 
@@ -456,8 +557,43 @@ class BOMItemAdmin(admin.ModelAdmin):
         return super().change_view(request, object_id, form_url=form_url, extra_context=extra_context)
 
 
+# =========================
+# Ledger changelist projection
+# =========================
+SOURCE_REF_PREVIEW_CHARS = 80
+
+# Columns rendered by StockLedgerEntryAdmin.list_display (+ link/tenant fields).
+LEDGER_LIST_COLUMNS = (
+    "id",
+    "company_id",
+    "created_at",
+    "part",
+    "part__part_no",
+    "part__company_id",
+    "movement_type",
+    "source_type",
+    "qty",
+    "unit_cost",
+    "transaction_value",
+    "reference_price",
+)
+
+
+class _LedgerChangeList(KeysetChangeList):
+    """
+    List page reads only displayed columns; source_ref is truncated in the
+    database (jsonb -> text substring), never transferred in full.
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        return qs.only(*LEDGER_LIST_COLUMNS).annotate(
+            source_ref_head=Substr(Cast("source_ref", TextField()), 1, SOURCE_REF_PREVIEW_CHARS + 1)
+        )
+
+
 @admin.register(StockLedgerEntry)
-class StockLedgerEntryAdmin(admin.ModelAdmin):
+class StockLedgerEntryAdmin(_BudgetedChangelistMixin, _PrecomputedLinksMixin, KeysetChangeListMixin, admin.ModelAdmin):
     list_display = (
         "company_id",
         "created_at",
@@ -470,10 +606,11 @@ class StockLedgerEntryAdmin(admin.ModelAdmin):
         "reference_price",
         "source_ref_preview",
     )
-    list_filter = ("movement_type", "source_type", "company_id")
+    # Keyset changelist: no date_hierarchy (distinct-date scans), lazy company filter
+    list_filter = ("movement_type", "source_type", CompanyIdInputFilter, "created_at")
     search_fields = ("part__part_no", "part__name")
-    date_hierarchy = "created_at"
-    ordering = ("-created_at",)
+    ordering = ("-created_at", "-id")
+    admin_link_fields = (("part", "part"),)
 
     actions = None
 
@@ -495,6 +632,9 @@ class StockLedgerEntryAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         return False
 
+    def get_changelist(self, request, **kwargs):
+        return _LedgerChangeList
+
     def changelist_view(self, request, extra_context=None):
         _deny_if_tenant_unresolved(request)
         self._request = request
@@ -583,12 +723,16 @@ class StockLedgerEntryAdmin(admin.ModelAdmin):
     source_ref_pretty.short_description = "source_ref (pretty)"
 
     def source_ref_preview(self, obj: StockLedgerEntry) -> str:
-        try:
-            payload = obj.source_ref or {}
-            s = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-        except Exception:
-            s = str(obj.source_ref)
-        return (s[:77] + "...") if len(s) > 80 else s
+        # Changelist rows carry only the DB-truncated head (see _LedgerChangeList)
+        s = getattr(obj, "source_ref_head", None)
+        if s is None:
+            try:
+                payload = obj.source_ref or {}
+                s = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+            except Exception:
+                s = str(obj.source_ref)
+        limit = SOURCE_REF_PREVIEW_CHARS
+        return (s[: limit - 3] + "...") if len(s) > limit else s
 
     source_ref_preview.short_description = "source_ref"
 
@@ -596,20 +740,13 @@ class StockLedgerEntryAdmin(admin.ModelAdmin):
         if not obj.part_id:
             return "-"
 
-        request = getattr(self, "_request", None)
-        label = getattr(obj.part, "part_no", str(obj.part_id))
-        if request is None:
-            return label
-
-        url = _safe_admin_change_url_for_obj(
-            request,
+        return self._render_link(
+            "part",
             model="part",
             obj_id=obj.part_id,
             obj_company_id=getattr(obj.part, "company_id", None),
+            label=getattr(obj.part, "part_no", str(obj.part_id)),
         )
-        if not url:
-            return label
-        return format_html('<a href="{}">{}</a>', url, label)
 
     part_link.short_description = "part"
 
@@ -623,8 +760,19 @@ class StockLedgerEntryAdmin(admin.ModelAdmin):
         raise PermissionDenied("StockLedgerEntry delete is forbidden (admin write forbidden)")
 
 
+def _with_current_qty_field(fields):
+    """
+    `current_qty` right after available_qty when summaries are striped
+    (STOCK_SUMMARY_STRIPES > 0), matching the reports/services reads.
+    """
+    if not stripe_count():
+        return fields
+    at = list(fields).index("available_qty") + 1
+    return (*fields[:at], "current_qty", *fields[at:])
+
+
 @admin.register(PartStockSummary)
-class PartStockSummaryAdmin(admin.ModelAdmin):
+class PartStockSummaryAdmin(_BudgetedChangelistMixin, _PrecomputedLinksMixin, admin.ModelAdmin):
     list_display = (
         "company_id",
         "part_link",
@@ -638,6 +786,7 @@ class PartStockSummaryAdmin(admin.ModelAdmin):
     list_filter = ("company_id",)
     date_hierarchy = "updated_at"
     ordering = ("-updated_at",)
+    admin_link_fields = (("part", "part"),)
 
     actions = ["action_rebuild_selected_summaries"]
 
@@ -648,8 +797,14 @@ class PartStockSummaryAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request).select_related("part")
+        if stripe_count():
+            # striped rows lag their outstanding deltas until compaction
+            qs = with_current_qty(qs)
         return _tenant_filter_queryset(request, qs)
 
+    def get_list_display(self, request):
+        return _with_current_qty_field(super().get_list_display(request))
+
     def get_object(self, request, object_id, from_field=None):
         _deny_if_tenant_unresolved(request)
         obj = super().get_object(request, object_id, from_field=from_field)
@@ -673,35 +828,36 @@ class PartStockSummaryAdmin(admin.ModelAdmin):
         return False
 
     def get_readonly_fields(self, request, obj=None):
-        return (
-            "id",
-            "company_id",
-            "part",
-            "available_qty",
-            "weighted_avg_cost",
-            "last_purchase_cost",
-            "last_production_cost",
-            "updated_at",
+        return _with_current_qty_field(
+            (
+                "id",
+                "company_id",
+                "part",
+                "available_qty",
+                "weighted_avg_cost",
+                "last_purchase_cost",
+                "last_production_cost",
+                "updated_at",
+            )
         )
 
+    def current_qty(self, obj: PartStockSummary):
+        return obj.current_qty
+
+    current_qty.short_description = "current_qty"
+    current_qty.admin_order_field = "current_qty"
+
     def part_link(self, obj: PartStockSummary) -> str:
         if not obj.part_id:
             return "-"
 
-        request = getattr(self, "_request", None)
-        label = getattr(obj.part, "part_no", str(obj.part_id))
-        if request is None:
-            return label
-
-        url = _safe_admin_change_url_for_obj(
-            request,
+        return self._render_link(
+            "part",
             model="part",
             obj_id=obj.part_id,
             obj_company_id=getattr(obj.part, "company_id", None),
+            label=getattr(obj.part, "part_no", str(obj.part_id)),
         )
-        if not url:
-            return label
-        return format_html('<a href="{}">{}</a>', url, label)
 
     part_link.short_description = "part"
 
@@ -0,0 +1,218 @@
+# apps/inventory/bench_data.py
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from decimal import Decimal
+from uuid import UUID
+
+from django.db import transaction
+
+# LOCKED: no model imports at module import time (generator is imported by commands/tests only)
+
+
+@dataclass(frozen=True)
+class BenchDataSpec:
+    """
+    Shape of the synthetic multi-tenant dataset.
+
+    parts_per_company is split into `bom_depth` made-part layers (FG on top,
+    semi-finished below) plus raw materials; every made part gets one active
+    BOM whose components come from the layer directly beneath it.
+    """
+
+    companies: int = 2
+    parts_per_company: int = 50
+    bom_depth: int = 3
+    bom_fanout: int = 3
+    made_ratio: float = 0.4
+    ledger_entries_per_part: int = 10
+    seed: int = 42
+
+
+@dataclass
+class BenchCompany:
+    company_id: UUID
+    layers: list[list] = field(default_factory=list)  # made parts, layers[0] = finished goods
+    raw_parts: list = field(default_factory=list)
+    boms: list = field(default_factory=list)
+    ledger_entries: int = 0
+
+    @property
+    def parts(self) -> list:
+        return [p for layer in self.layers for p in layer] + list(self.raw_parts)
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _split_parts(spec: BenchDataSpec) -> tuple[list[int], int]:
+    """
+    Layer widths for made parts (top to bottom) and the raw-material count.
+    """
+    depth = max(0, spec.bom_depth)
+    made = int(spec.parts_per_company * spec.made_ratio) if depth else 0
+    made = max(made, depth)
+    widths = [max(1, made // depth) for _ in range(depth)] if depth else []
+    raw = max(1, spec.parts_per_company - sum(widths))
+    return widths, raw
+
+
+def _create_parts(company_id: UUID, spec: BenchDataSpec, rng: random.Random) -> BenchCompany:
+    from apps.inventory.models import Part
+
+    widths, raw = _split_parts(spec)
+    company = BenchCompany(company_id=company_id)
+
+    rows = []
+    for level, width in enumerate(widths):
+        part_type = Part.PartType.FINISHED_GOOD if level == 0 else Part.PartType.SEMI_FINISHED
+        prefix = "FG" if level == 0 else f"SF{level}"
+        layer = [
+            Part(
+                id=_uuid(rng),
+                company_id=company_id,
+                part_no=f"BENCH-{prefix}-{i:05d}",
+                name=f"Bench {prefix} {i}",
+                part_type=part_type,
+                procurement_strategy=Part.ProcurementStrategy.MAKE,
+                is_saleable=level == 0,
+            )
+            for i in range(width)
+        ]
+        company.layers.append(layer)
+        rows.extend(layer)
+
+    company.raw_parts = [
+        Part(
+            id=_uuid(rng),
+            company_id=company_id,
+            part_no=f"BENCH-RM-{i:05d}",
+            name=f"Bench RM {i}",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+        for i in range(raw)
+    ]
+    rows.extend(company.raw_parts)
+
+    Part.objects.bulk_create(rows)
+    return company
+
+
+def _create_boms(company: BenchCompany, spec: BenchDataSpec, rng: random.Random) -> None:
+    """
+    One active BOM per made part; components come from the next layer down
+    (raw materials below the last layer), so the graph depth equals bom_depth.
+    """
+    from apps.inventory.models import BOM, BOMItem
+
+    for level, layer in enumerate(company.layers):
+        below = company.layers[level + 1] if level + 1 < len(company.layers) else company.raw_parts
+        for parent in layer:
+            bom = BOM(id=_uuid(rng), company_id=company.company_id, parent_part=parent, revision_index=1)
+            bom.save()
+            for component in rng.sample(below, min(spec.bom_fanout, len(below))):
+                BOMItem(
+                    id=_uuid(rng),
+                    company_id=company.company_id,
+                    bom=bom,
+                    component_part=component,
+                    qty_per=Decimal(rng.randint(1, 5)),
+                ).save()
+            company.boms.append(bom)
+
+
+def _create_history(company: BenchCompany, spec: BenchDataSpec, rng: random.Random) -> None:
+    """
+    Per part: an opening receipt, then a random IN/OUT walk that never goes negative.
+    Every row goes through StockLedgerEntry.save() so summaries/WAC stay consistent.
+    """
+    from apps.inventory.models import StockLedgerEntry
+
+    IN, OUT = StockLedgerEntry.MovementType.IN, StockLedgerEntry.MovementType.OUT
+
+    for part in company.parts:
+        on_hand = 0
+        for seq in range(spec.ledger_entries_per_part):
+            is_out = seq > 0 and on_hand > 0 and rng.random() < 0.4
+            qty = rng.randint(1, on_hand) if is_out else rng.randint(10, 100)
+            StockLedgerEntry(
+                id=_uuid(rng),
+                company_id=company.company_id,
+                part=part,
+                movement_type=OUT if is_out else IN,
+                source_type=StockLedgerEntry.SourceType.PRODUCTION if is_out else StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal(qty),
+                unit_cost=Decimal(rng.randint(100, 10_000)) / Decimal(100),
+                source_ref={"bench": "history", "seq": seq},
+            ).save()
+            on_hand += -qty if is_out else qty
+            company.ledger_entries += 1
+
+
+def generate_bench_data(spec: BenchDataSpec) -> list[BenchCompany]:
+    """
+    Build the dataset described by `spec`. Deterministic: the same seed yields the
+    same ids, part numbers, BOM graphs and ledger histories.
+
+    Companies get fresh (seeded) ids, so the generator can run against a database
+    that already holds real tenants; run it inside a rolled-back transaction
+    (apps.inventory.benchmarks.rolled_back) or follow it with delete_bench_data()
+    to leave no trace.
+    """
+    from apps.tenancy.models import Company
+
+    rng = random.Random(spec.seed)
+    companies: list[BenchCompany] = []
+
+    with transaction.atomic():
+        for n in range(spec.companies):
+            company_id = _uuid(rng)
+            Company.objects.create(id=company_id, name=f"Bench Co {n:03d}")
+
+            company = _create_parts(company_id, spec, rng)
+            _create_boms(company, spec, rng)
+            _create_history(company, spec, rng)
+            companies.append(company)
+
+    return companies
+
+
+def delete_bench_data(company_ids: list[UUID]) -> None:
+    """
+    Remove everything generate_bench_data() and the bench scenarios wrote for
+    `company_ids`. Queryset deletes bypass the append-only model guards, so this
+    is for scratch databases only; PROTECT foreign keys fix the order (reversals
+    before their originals, ledger rows and BOMs before parts).
+    """
+    from apps.inventory.models import (
+        BOM,
+        EffectiveBOMEdge,
+        LedgerSequence,
+        Part,
+        PartSourceMovementTotal,
+        PartStockDelta,
+        PartStockSummary,
+        ProjectionCheckpoint,
+        StockLedgerEntry,
+    )
+    from apps.tenancy.models import Company
+
+    with transaction.atomic():
+        ledger = StockLedgerEntry.objects.filter(company_id__in=company_ids)
+        ledger.filter(reverse_of__isnull=False).delete()
+        ledger.delete()
+        for model in (
+            PartStockDelta,
+            PartStockSummary,
+            PartSourceMovementTotal,
+            EffectiveBOMEdge,
+            BOM,
+            Part,
+            LedgerSequence,
+            ProjectionCheckpoint,
+        ):
+            model.objects.filter(company_id__in=company_ids).delete()
+        Company.objects.filter(id__in=company_ids).delete()
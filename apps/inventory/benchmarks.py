@@ -0,0 +1,74 @@
+# apps/inventory/benchmarks.py
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from django.db import transaction
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile (pct in 0..100). Empty input => 0.0.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil((pct / 100.0) * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops: int = 0
+    elapsed_s: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ops_per_sec(self) -> float:
+        return (self.ops / self.elapsed_s) if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "name": self.name,
+            "ops": self.ops,
+            "elapsed_s": round(self.elapsed_s, 6),
+            "ops_per_sec": round(self.ops_per_sec, 2),
+        }
+        if self.latencies_ms:
+            data.update(
+                {
+                    "p50_ms": round(percentile(self.latencies_ms, 50), 3),
+                    "p95_ms": round(percentile(self.latencies_ms, 95), 3),
+                    "p99_ms": round(percentile(self.latencies_ms, 99), 3),
+                    "max_ms": round(max(self.latencies_ms), 3),
+                }
+            )
+        data.update(self.extra)
+        return data
+
+
+@contextmanager
+def timed(result: BenchResult) -> Iterator[BenchResult]:
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.elapsed_s += time.perf_counter() - started
+
+
+@contextmanager
+def rolled_back(using: str | None = None) -> Iterator[None]:
+    """
+    Run a benchmark body inside a transaction that is always rolled back.
+    """
+    with transaction.atomic(using=using):
+        try:
+            yield
+        finally:
+            transaction.set_rollback(True, using=using)
@@ -0,0 +1,114 @@
+# apps/inventory/bom_index.py
+from __future__ import annotations
+
+from typing import Iterable
+from uuid import UUID
+
+from django.db import transaction
+
+
+def _edge_for_item(item, *, parent_part_id: UUID):
+    from apps.inventory.models import EffectiveBOMEdge  # local import
+
+    return EffectiveBOMEdge(
+        company_id=item.company_id,
+        parent_part_id=parent_part_id,
+        component_part_id=item.component_part_id,
+        bom_id=item.bom_id,
+        bom_item_id=item.id,
+        qty_per=item.qty_per,
+        is_direct=item.is_direct,
+    )
+
+
+def sync_effective_bom(bom) -> None:
+    """
+    Effective BOM index maintenance for one BOM header.
+
+    - active revision: its items become the live edges of the parent part
+      (edges of any previously active revision are dropped)
+    - inactive revision: its edges (if any) are dropped
+
+    LOCKED: no model imports at module import time (models.py calls into here).
+    """
+    from apps.inventory.models import BOMItem, EffectiveBOMEdge  # local import
+
+    if not bom.is_active:
+        EffectiveBOMEdge.objects.filter(bom_id=bom.id).delete()
+        return
+
+    EffectiveBOMEdge.objects.filter(company_id=bom.company_id, parent_part_id=bom.parent_part_id).delete()
+    items = BOMItem.objects.filter(bom_id=bom.id).only(
+        "id", "company_id", "bom_id", "component_part_id", "qty_per", "is_direct"
+    )
+    EffectiveBOMEdge.objects.bulk_create([_edge_for_item(i, parent_part_id=bom.parent_part_id) for i in items])
+
+
+def upsert_effective_edge(item) -> None:
+    """
+    Keep the live edge of a single BOMItem in sync (only items of active revisions are live).
+    """
+    from apps.inventory.models import EffectiveBOMEdge  # local import
+
+    if not item.bom.is_active:
+        return
+
+    EffectiveBOMEdge.objects.update_or_create(
+        bom_item_id=item.id,
+        defaults={
+            "company_id": item.company_id,
+            "parent_part_id": item.bom.parent_part_id,
+            "component_part_id": item.component_part_id,
+            "bom_id": item.bom_id,
+            "qty_per": item.qty_per,
+            "is_direct": item.is_direct,
+        },
+    )
+
+
+def replace_effective_edges(company_id: UUID, parent_part_ids: Iterable[UUID], items: Iterable) -> None:
+    """
+    Bulk variant for loaders: drop live edges of the given parents and insert
+    edges for `items` (items of the newly active revisions, already saved).
+    """
+    from apps.inventory.models import EffectiveBOMEdge  # local import
+
+    parent_part_ids = list(parent_part_ids)
+    if parent_part_ids:
+        EffectiveBOMEdge.objects.filter(company_id=company_id, parent_part_id__in=parent_part_ids).delete()
+    EffectiveBOMEdge.objects.bulk_create(
+        [_edge_for_item(i, parent_part_id=i.bom.parent_part_id) for i in items],
+        batch_size=2000,
+    )
+
+
+@transaction.atomic
+def rebuild_effective_bom(company_id: UUID | None = None) -> int:
+    """
+    Full rebuild of the live edge index from active BOM revisions.
+    Returns the number of edges written.
+    """
+    from apps.inventory.models import BOMItem, EffectiveBOMEdge  # local import
+
+    edges_qs = EffectiveBOMEdge.objects.all()
+    items = BOMItem.objects.filter(bom__is_active=True).select_related("bom").only(
+        "id", "company_id", "bom_id", "component_part_id", "qty_per", "is_direct", "bom__parent_part_id"
+    )
+    if company_id:
+        edges_qs = edges_qs.filter(company_id=company_id)
+        items = items.filter(company_id=company_id)
+
+    edges_qs.delete()
+
+    written = 0
+    batch = []
+    for item in items.iterator(chunk_size=2000):
+        batch.append(_edge_for_item(item, parent_part_id=item.bom.parent_part_id))
+        if len(batch) >= 2000:
+            EffectiveBOMEdge.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        EffectiveBOMEdge.objects.bulk_create(batch)
+        written += len(batch)
+    return written
@@ -0,0 +1,209 @@
+# apps/inventory/cdc.py
+from __future__ import annotations
+
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+from uuid import UUID
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.module_loading import import_string
+
+from apps.inventory.ledger_sequence import ledger_rows_after, settles_in
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+# =========================
+# Publish (ledger write path)
+# =========================
+LEDGER_CHANNEL = "inventory_ledger"
+
+
+def notify_ledger_insert(entry) -> None:
+    """
+    NOTIFY `<company_id>:<sequence>` on LEDGER_CHANNEL inside the insert transaction.
+
+    PostgreSQL delivers notifications only on commit (a rolled-back insert publishes
+    nothing). Opt-in: other vendors / LEDGER_CDC_NOTIFY off (default) => no-op;
+    consumers still catch up from checkpoints, just not within milliseconds.
+    """
+    if not getattr(settings, "LEDGER_CDC_NOTIFY", False):
+        return
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s);", [LEDGER_CHANNEL, f"{entry.company_id}:{entry.sequence}"])
+
+
+@dataclass(frozen=True)
+class LedgerChange:
+    company_id: UUID
+    sequence: int
+
+
+def parse_notification(payload: str) -> LedgerChange | None:
+    try:
+        company_id, sequence = payload.split(":", 1)
+        return LedgerChange(company_id=UUID(company_id), sequence=int(sequence))
+    except ValueError:
+        return None
+
+
+# =========================
+# Handlers
+# =========================
+DEFAULT_CDC_FIELDS = (
+    "id",
+    "company_id",
+    "part_id",
+    "movement_type",
+    "source_type",
+    "qty",
+    "unit_cost",
+    "transaction_value",
+    "reverse_of_id",
+    "source_ref",
+    "created_at",
+)
+
+CDC_HANDLERS: dict[str, Callable[[list[dict[str, Any]]], None]] = {}
+
+
+def register_cdc_handler(name: str):
+    def decorator(fn: Callable[[list[dict[str, Any]]], None]):
+        if name in CDC_HANDLERS:
+            raise ValueError(f"CDC handler already registered: {name}")
+        CDC_HANDLERS[name] = fn
+        return fn
+
+    return decorator
+
+
+def resolve_handler(name_or_path: str) -> Callable[[list[dict[str, Any]]], None]:
+    """
+    Registered handler name, or a dotted path to a callable(rows).
+    """
+    if name_or_path in CDC_HANDLERS:
+        return CDC_HANDLERS[name_or_path]
+    try:
+        return import_string(name_or_path)
+    except ImportError as exc:
+        raise ValueError(f"Unknown CDC handler '{name_or_path}' (registered: {', '.join(sorted(CDC_HANDLERS))})") from exc
+
+
+@register_cdc_handler("jsonl")
+def jsonl_handler(rows: list[dict[str, Any]]) -> None:
+    for row in rows:
+        sys.stdout.write(json.dumps(row, default=str, sort_keys=True) + "\n")
+    sys.stdout.flush()
+
+
+# =========================
+# Delivery (at-least-once)
+# =========================
+def checkpoint_name(consumer: str) -> str:
+    return f"cdc:{consumer}"
+
+
+def deliver(
+    consumer: str,
+    handler: Callable[[list[dict[str, Any]]], None],
+    company_id: UUID,
+    *,
+    batch_size: int = 500,
+    fields: Iterable[str] = DEFAULT_CDC_FIELDS,
+) -> int:
+    """
+    Hand every row after the consumer's checkpoint to `handler`, batch by batch.
+
+    Each batch runs under the checkpoint row lock (as apply_next_batch()), so
+    two deliverers of the same consumer never hand out the same batch. The
+    checkpoint advances only after the handler returns: a crash in between
+    rolls back and re-delivers that batch (at-least-once; handlers should be
+    idempotent on row id). Rows still in the holdback window end the run
+    early; held_back_for() says when to try again.
+    """
+    from apps.inventory.models import ProjectionCheckpoint  # local import
+
+    name = checkpoint_name(consumer)
+    delivered = 0
+    while True:
+        with transaction.atomic():
+            checkpoint, _ = ProjectionCheckpoint.objects.select_for_update().get_or_create(
+                name=name, company_id=company_id
+            )
+            rows = ledger_rows_after(company_id, checkpoint.last_sequence, batch_size=batch_size, fields=fields)
+            if not rows:
+                return delivered
+
+            handler(rows)
+
+            checkpoint.last_sequence = rows[-1]["sequence"]
+            checkpoint.rows_applied += len(rows)
+            checkpoint.save(update_fields=["last_sequence", "rows_applied", "updated_at"])
+        delivered += len(rows)
+
+
+def held_back_for(consumer: str, company_id: UUID) -> float | None:
+    """
+    Seconds until the consumer's next undelivered row of `company_id` leaves
+    the holdback window (None: nothing is held back).
+    """
+    from apps.inventory.models import ProjectionCheckpoint  # local import
+
+    after = (
+        ProjectionCheckpoint.objects.filter(name=checkpoint_name(consumer), company_id=company_id)
+        .values_list("last_sequence", flat=True)
+        .first()
+    )
+    return settles_in(company_id, after or 0)
+
+
+# =========================
+# LISTEN side
+# =========================
+class LedgerListener:
+    """
+    Dedicated autocommit psycopg connection LISTENing on LEDGER_CHANNEL
+    (never a pooled Django connection: LISTEN is per session).
+    """
+
+    def __init__(self, *, alias: str = DEFAULT_DB_ALIAS, channel: str = LEDGER_CHANNEL):
+        self.alias = alias
+        self.channel = channel
+        self.conn = None
+
+    def __enter__(self) -> "LedgerListener":
+        import psycopg  # local import: PostgreSQL only
+
+        params = connections[self.alias].get_connection_params()
+        self.conn = psycopg.connect(**params, autocommit=True)
+        self.conn.execute(f"LISTEN {self.channel}")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def poll(self, *, timeout: float, window: float, max_notifications: int = 10_000) -> list[LedgerChange]:
+        """
+        Block up to `timeout` for the first notification, then keep collecting
+        for `window` seconds so bursts become one batch per company.
+        """
+        changes: list[LedgerChange] = []
+        for notify in self.conn.notifies(timeout=timeout, stop_after=1):
+            changes.append(parse_notification(notify.payload))
+        if changes:
+            deadline = time.monotonic() + window
+            while len(changes) < max_notifications and (remaining := deadline - time.monotonic()) > 0:
+                before = len(changes)
+                for notify in self.conn.notifies(timeout=remaining, stop_after=max_notifications - len(changes)):
+                    changes.append(parse_notification(notify.payload))
+                if len(changes) == before:
+                    break
+        return [c for c in changes if c is not None]
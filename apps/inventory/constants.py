@@ -10,3 +10,16 @@ class StockMovementType:
 class StockSourceType:
     PURCHASE = "purchase"
     PRODUCTION = "production"
+
+
+class QueryBudgets:
+    """
+    Max queries per critical write/read path (factory_manager.query_budget).
+    Each path is constant in row / edge counts; growth means an N+1 regression.
+    """
+
+    LEDGER_SAVE = 16
+    LEDGER_SUMMARY_HOOK = 10  # first insert: get_or_create savepoints + INSERT + UPDATE; striped: + fold SELECT/DELETE
+    BOM_SAVE = 16
+    BOMITEM_SAVE = 16
+    ADMIN_CHANGELIST = 20
@@ -1,12 +1,14 @@
 # apps/inventory/guards.py
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import defaultdict
 from dataclasses import dataclass
+from typing import Iterable
 from uuid import UUID
 
 from django.core.exceptions import ValidationError
-from django.db import connection
+
+from factory_manager.instrumentation import instrumented
 
 
 @dataclass(frozen=True)
@@ -20,71 +22,173 @@ MAX_BOM_DEPTH = 10  # LOCKED (spec)
 
 def _load_edges(company_id: UUID) -> list[BomEdge]:
     """
-    Read BOM graph without importing models (prevents circular imports).
-    Uses locked table names:
-      inventory_boms, inventory_bom_items
-    """
-    sql = """
-        SELECT b.parent_part_id, i.component_part_id
-        FROM inventory_boms b
-        JOIN inventory_bom_items i ON i.bom_id = b.id
-        WHERE b.company_id = %s
+    Read the live BOM graph: edges of active revisions only.
+
+    Source is the denormalised effective edge table (inventory_effective_bom_edges),
+    maintained by BOM.save() / BOMItem.save(); one index range scan per company.
+    Model import is local (prevents circular imports).
     """
-    with connection.cursor() as cur:
-        cur.execute(sql, [str(company_id)])
-        rows = cur.fetchall()
+    from apps.inventory.models import EffectiveBOMEdge  # local import
 
-    edges: list[BomEdge] = []
-    for parent_id, comp_id in rows:
-        edges.append(BomEdge(parent_part_id=parent_id, component_part_id=comp_id))
-    return edges
+    rows = EffectiveBOMEdge.objects.filter(company_id=company_id).values_list("parent_part_id", "component_part_id")
+    return [BomEdge(parent_part_id=parent_id, component_part_id=comp_id) for parent_id, comp_id in rows]
 
 
-def assert_no_circular_bom(company_id: UUID, root_parent_part_id: UUID) -> None:
-    """
-    Fail-fast if any cycle is reachable from root parent.
-    """
-    edges = _load_edges(company_id)
+def build_graph(edges: Iterable[BomEdge]) -> dict[UUID, list[UUID]]:
     graph: dict[UUID, list[UUID]] = defaultdict(list)
     for e in edges:
         graph[e.parent_part_id].append(e.component_part_id)
+    return graph
+
 
-    # DFS with colors
-    WHITE, GRAY, BLACK = 0, 1, 2
-    color: dict[UUID, int] = defaultdict(int)
+@dataclass(frozen=True)
+class BomGraphReport:
+    """
+    Result of one traversal over a BOM graph.
 
-    def dfs(node: UUID):
-        color[node] = GRAY
-        for nxt in graph.get(node, []):
-            if color[nxt] == GRAY:
-                raise ValidationError("Circular BOM detected")
-            if color[nxt] == WHITE:
-                dfs(nxt)
-        color[node] = BLACK
+    - max_depth: longest path (in edges) from any root; only exact when valid
+    - depth_path: nodes of that longest path (or of the offending path)
+    - cycle_path: closed node path (first == last) if a cycle is reachable
+    """
 
-    dfs(root_parent_part_id)
+    max_depth: int
+    depth_path: tuple[UUID, ...]
+    cycle_path: tuple[UUID, ...] | None = None
+    depth_exceeded: bool = False
 
+    @property
+    def is_valid(self) -> bool:
+        return self.cycle_path is None and not self.depth_exceeded
 
-def assert_max_depth(company_id: UUID, root_parent_part_id: UUID) -> None:
+
+def analyze_bom_graph(
+    graph: dict[UUID, list[UUID]],
+    root_parent_part_ids: Iterable[UUID],
+    *,
+    max_depth: int = MAX_BOM_DEPTH,
+) -> BomGraphReport:
     """
-    Fail-fast if BOM depth exceeds MAX_BOM_DEPTH from root.
+    Single iterative DFS that detects cycles and computes longest-path depth together.
+
+    - explicit stack (no recursion limit on deep/wide graphs)
+    - heights (longest path to a leaf) memoised per node, shared across roots
+    - stops at the first violation and returns the offending path
     """
-    edges = _load_edges(company_id)
-    graph: dict[UUID, list[UUID]] = defaultdict(list)
-    for e in edges:
-        graph[e.parent_part_id].append(e.component_part_id)
+    # GRAY = on the current path (position), BLACK = finished (height known)
+    height: dict[UUID, int] = {}
+    next_hop: dict[UUID, UUID] = {}
+    empty: tuple[UUID, ...] = ()
+
+    def _longest_from(node: UUID) -> list[UUID]:
+        path = [node]
+        while path[-1] in next_hop:
+            path.append(next_hop[path[-1]])
+        return path
+
+    best_depth = -1
+    best_root: UUID | None = None
+
+    for root in root_parent_part_ids:
+        if root not in height:
+            path: list[UUID] = [root]
+            position: dict[UUID, int] = {root: 0}
+            stack = [iter(graph.get(root, empty))]
+            best = [0]  # running height of each node on the path
+
+            while stack:
+                nxt = next(stack[-1], None)
+
+                if nxt is None:
+                    # post-order: node finished, propagate height to parent
+                    stack.pop()
+                    node = path.pop()
+                    del position[node]
+                    h = best.pop()
+                    height[node] = h
+                    if best and h + 1 > best[-1]:
+                        best[-1] = h + 1
+                        next_hop[path[-1]] = node
+                    continue
+
+                if nxt in position:
+                    cycle = tuple(path[position[nxt]:]) + (nxt,)
+                    return BomGraphReport(max_depth=len(path), depth_path=tuple(path), cycle_path=cycle)
+
+                depth = len(path)
+                h = height.get(nxt)
+                if h is not None:
+                    if depth + h > max_depth:
+                        offending = tuple(path) + tuple(_longest_from(nxt))
+                        return BomGraphReport(
+                            max_depth=len(offending) - 1, depth_path=offending, depth_exceeded=True
+                        )
+                    if h + 1 > best[-1]:
+                        best[-1] = h + 1
+                        next_hop[path[-1]] = nxt
+                    continue
+
+                # unvisited: descend
+                if depth > max_depth:
+                    offending = tuple(path) + (nxt,)
+                    return BomGraphReport(max_depth=depth, depth_path=offending, depth_exceeded=True)
+
+                position[nxt] = depth
+                path.append(nxt)
+                best.append(0)
+                stack.append(iter(graph.get(nxt, empty)))
+
+        if height[root] > best_depth:
+            best_depth = height[root]
+            best_root = root
+
+    if best_root is None:
+        return BomGraphReport(max_depth=0, depth_path=())
+    return BomGraphReport(max_depth=best_depth, depth_path=tuple(_longest_from(best_root)))
+
+
+def _format_path(path: Iterable[UUID]) -> str:
+    return " -> ".join(str(p) for p in path)
+
+
+def assert_bom_graph_valid(graph: dict[UUID, list[UUID]], root_parent_part_ids: Iterable[UUID]) -> BomGraphReport:
+    """
+    Fail-fast cycle + depth check over an already built (possibly merged) graph.
+    Used by bulk loaders to validate staged edges once per batch.
+    """
+    report = analyze_bom_graph(graph, root_parent_part_ids)
+    if report.cycle_path is not None:
+        raise ValidationError(
+            "Circular BOM detected: %(path)s",
+            code="bom_cycle",
+            params={"path": _format_path(report.cycle_path)},
+        )
+    if report.depth_exceeded:
+        raise ValidationError(
+            "BOM max depth exceeded (>%(max)s): %(path)s",
+            code="bom_max_depth",
+            params={"max": MAX_BOM_DEPTH, "path": _format_path(report.depth_path)},
+        )
+    return report
+
+
+@instrumented("bom.guard.assert_valid")
+def assert_bom_valid(company_id: UUID, root_parent_part_ids: Iterable[UUID]) -> BomGraphReport:
+    """
+    Load the company edge list once and run the combined cycle + depth check.
+    """
+    return assert_bom_graph_valid(build_graph(_load_edges(company_id)), root_parent_part_ids)
 
-    q = deque([(root_parent_part_id, 0)])
-    visited_depth: dict[UUID, int] = {root_parent_part_id: 0}
 
-    while q:
-        node, depth = q.popleft()
-        if depth > MAX_BOM_DEPTH:
-            raise ValidationError(f"BOM max depth exceeded (>{MAX_BOM_DEPTH})")
+# Compatibility entry points: both run the combined single-pass check.
+def assert_no_circular_bom(company_id: UUID, root_parent_part_id: UUID) -> None:
+    """
+    Fail-fast if any cycle is reachable from root parent.
+    """
+    assert_bom_valid(company_id, [root_parent_part_id])
 
-        for nxt in graph.get(node, []):
-            nd = depth + 1
-            # Keep minimal depth; still safe for exceeding check.
-            if nxt not in visited_depth or nd < visited_depth[nxt]:
-                visited_depth[nxt] = nd
-                q.append((nxt, nd))
+
+def assert_max_depth(company_id: UUID, root_parent_part_id: UUID) -> None:
+    """
+    Fail-fast if BOM depth exceeds MAX_BOM_DEPTH from root.
+    """
+    assert_bom_valid(company_id, [root_parent_part_id])
@@ -0,0 +1,184 @@
+# apps/inventory/history.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.db import connections, router
+from django.db.models import Q, Sum
+
+from apps.tenancy.admin_changelist import decode_cursor, encode_cursor
+from factory_manager.instrumentation import instrumented
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_QTY_Q = Decimal("0.000001")
+
+# Columns read by the history query: all covered by ix_inventory_ledger_history
+# (key: company_id, part_id, created_at, id; INCLUDE: the rest), so PostgreSQL
+# answers a page with an index-only scan. Keep source_ref (jsonb) out of here.
+HISTORY_COLUMNS = ("id", "created_at", "sequence", "movement_type", "source_type", "qty", "unit_cost", "reverse_of_id")
+
+
+@dataclass(frozen=True)
+class HistoryRow:
+    id: UUID
+    created_at: datetime
+    sequence: int
+    movement_type: str
+    source_type: str
+    qty: Decimal
+    unit_cost: Decimal
+    reverse_of_id: UUID | None
+    running_balance: Decimal
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "id": str(self.id),
+            "created_at": self.created_at.isoformat(),
+            "sequence": self.sequence,
+            "movement_type": self.movement_type,
+            "source_type": self.source_type,
+            "qty": str(self.qty),
+            "unit_cost": str(self.unit_cost),
+            "reverse_of_id": str(self.reverse_of_id) if self.reverse_of_id else None,
+            "running_balance": str(self.running_balance),
+        }
+
+
+@dataclass(frozen=True)
+class HistoryPage:
+    rows: list[HistoryRow]
+    next_cursor: str | None
+
+
+def _decimal(value) -> Decimal:
+    # PostgreSQL returns numeric; SQLite sums NUMERIC columns as int/float
+    return value if isinstance(value, Decimal) else Decimal(str(value)).quantize(_QTY_Q)
+
+
+def parse_cursor(token: str) -> tuple[datetime, UUID]:
+    """
+    Opaque (created_at, id) cursor (same encoding as the admin keyset
+    changelist). Raises ValueError on malformed tokens.
+    """
+    try:
+        created_at, pk = decode_cursor(token)
+        return created_at, UUID(pk)
+    except (IncorrectLookupParameters, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+@instrumented("inventory.movement_history")
+def movement_history(
+    company_id: UUID,
+    part_id: UUID,
+    *,
+    after: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    movement_type: str | None = None,
+    source_type: str | None = None,
+) -> HistoryPage:
+    """
+    One page of a part's ledger in (created_at, id) order, with the on-hand
+    balance after each row.
+
+    Cost is bounded by the page, not by the history before the cursor:
+    - opening balance: one SUM of signed qty up to the cursor (index-only scan
+      on ix_inventory_ledger_history)
+    - page: cursor + LIMIT in the innermost query, then a SQL window (SUM,
+      ROWS UNBOUNDED PRECEDING) over the page only, seeded with the opening
+    With type filters the window runs over every row up to the last matching
+    row of the page and the filter is applied outside it, so the balance stays
+    real. Reads route through the router (replica_reads() applies).
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be in 1..{MAX_PAGE_SIZE}")
+
+    db = router.db_for_read(StockLedgerEntry)
+    connection = connections[db]
+    opts = StockLedgerEntry._meta
+    ledger = StockLedgerEntry.objects.using(db).filter(company_id=company_id, part_id=part_id)
+
+    cursor = parse_cursor(after) if after else None
+    opening = Decimal("0")
+    if cursor is not None:
+        created_at, pk = cursor
+        total = (
+            ledger.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=pk))
+            .aggregate(total=Sum(StockLedgerEntry.signed_qty()))["total"]
+        )
+        opening = _decimal(total) if total is not None else opening
+        ledger = ledger.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+
+    filters = {}
+    if movement_type:
+        filters["movement_type"] = movement_type
+    if source_type:
+        filters["source_type"] = source_type
+
+    table = connection.ops.quote_name(opts.db_table)
+    columns = ", ".join(HISTORY_COLUMNS)
+    where = ["company_id = %s", "part_id = %s"]
+    params: list[Any] = [
+        opts.get_field("company_id").get_db_prep_value(company_id, connection),
+        opts.get_field("part").target_field.get_db_prep_value(part_id, connection),
+    ]
+    if cursor is not None:
+        created_at = opts.get_field("created_at").get_db_prep_value(cursor[0], connection)
+        pk = opts.get_field("id").get_db_prep_value(cursor[1], connection)
+        where.append("(created_at > %s OR (created_at = %s AND id > %s))")
+        params += [created_at, created_at, pk]
+
+    if filters:
+        # last matching row of the page bounds the window range
+        keys = list(ledger.filter(**filters).order_by("created_at", "id").values_list("created_at", "id")[: limit + 1])
+        if not keys:
+            return HistoryPage(rows=[], next_cursor=None)
+        last_at = opts.get_field("created_at").get_db_prep_value(keys[-1][0], connection)
+        last_pk = opts.get_field("id").get_db_prep_value(keys[-1][1], connection)
+        where.append("(created_at < %s OR (created_at = %s AND id <= %s))")
+        params += [last_at, last_at, last_pk]
+        page = f"SELECT {columns} FROM {table} WHERE {' AND '.join(where)}"
+    else:
+        page = f"SELECT {columns} FROM {table} WHERE {' AND '.join(where)} ORDER BY created_at, id LIMIT %s"
+        params.append(limit + 1)
+
+    sql = (
+        f"SELECT {columns}, SUM(CASE WHEN movement_type = %s THEN -qty ELSE qty END) "
+        f"OVER (ORDER BY created_at, id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS running_delta "
+        f"FROM ({page}) page"
+    )
+    params.insert(0, str(StockLedgerEntry.MovementType.OUT))
+    if filters:
+        sql = f"SELECT * FROM ({sql}) history WHERE " + " AND ".join(f"{name} = %s" for name in filters)
+        params += list(filters.values())
+    sql += " ORDER BY created_at, id"
+
+    # raw(): model field converters handle UUID / datetime per backend
+    entries = list(StockLedgerEntry.objects.db_manager(db).raw(sql, params))
+    rows = [
+        HistoryRow(
+            id=e.id,
+            created_at=e.created_at,
+            sequence=e.sequence,
+            movement_type=e.movement_type,
+            source_type=e.source_type,
+            qty=e.qty,
+            unit_cost=e.unit_cost,
+            reverse_of_id=e.reverse_of_id,
+            running_balance=opening + _decimal(e.running_delta),
+        )
+        for e in entries[:limit]
+    ]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if len(entries) > limit else None
+    return HistoryPage(rows=rows, next_cursor=next_cursor)
@@ -6,8 +6,15 @@ from uuid import UUID
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.utils import timezone
 
+from apps.inventory.constants import QueryBudgets
+from factory_manager.instrumentation import instrumented
+from factory_manager.query_budget import query_budget
 
+
+@instrumented("ledger.on_ledger_insert")
+@query_budget(QueryBudgets.LEDGER_SUMMARY_HOOK, name="ledger.on_ledger_insert")
 def on_ledger_insert(*, entry) -> None:
     """
     Update PartStockSummary after StockLedgerEntry insert.
@@ -22,8 +29,13 @@ def on_ledger_insert(*, entry) -> None:
       * apply ONLY stock delta (qty impact)
       * DO NOT update weighted_avg_cost (WAC)
       * DO NOT update last_purchase_cost / last_production_cost
+
+    STOCK_SUMMARY_STRIPES > 0 (apps.inventory.stock_deltas):
+    - qty-only entries go to a striped delta row (no summary lock)
+    - WAC-moving INs fold the part's stripes into the locked summary first
     """
     from apps.inventory.models import PartStockSummary, StockLedgerEntry  # local import
+    from apps.inventory.stock_deltas import add_delta, fold_part, stripe_count  # local import
 
     if not isinstance(entry, StockLedgerEntry):
         raise ValidationError("on_ledger_insert: invalid entry type")
@@ -47,6 +59,14 @@ def on_ledger_insert(*, entry) -> None:
             return qty
         raise ValidationError(f"Unknown movement_type: {entry.movement_type}")
 
+    moves_wac = entry.movement_type == "in" and qty > 0 and not entry.reverse_of_id
+    stripes = stripe_count()
+    if stripes and not moves_wac:
+        # Striped lane: the ledger-time guard already holds the part lock and
+        # checked the ledger aggregate, so no summary read is needed here.
+        add_delta(company_id, part_id, _delta_qty(), stripes=stripes)
+        return
+
     with transaction.atomic():
         summary, _ = PartStockSummary.objects.select_for_update().get_or_create(
             company_id=company_id,
@@ -58,6 +78,8 @@ def on_ledger_insert(*, entry) -> None:
         )
 
         old_qty = Decimal(summary.available_qty)
+        if stripes:
+            old_qty += fold_part(company_id, part_id)
         old_wac = Decimal(summary.weighted_avg_cost)
 
         delta = _delta_qty()
@@ -88,3 +110,57 @@ def on_ledger_insert(*, entry) -> None:
                 summary.last_production_cost = unit_cost
 
         summary.save()
+
+
+@instrumented("ledger.on_reverse_batch")
+def on_reverse_batch(*, company_id: UUID, deltas: dict[UUID, Decimal]) -> None:
+    """
+    Batch twin of on_ledger_insert() for reverse entries (apps.inventory.reversals):
+    one locked read and one bulk update for all parts instead of one round per row.
+
+    Same D-3.30 reverse lane: stock delta only, costing fields untouched.
+    """
+    from apps.inventory.models import PartStockSummary  # local import
+    from apps.inventory.stock_deltas import add_delta, stripe_count  # local import
+
+    if not deltas:
+        return
+
+    stripes = stripe_count()
+    if stripes:
+        for part_id in sorted(deltas):
+            add_delta(company_id, part_id, deltas[part_id], stripes=stripes)
+        return
+
+    with transaction.atomic():
+        summaries = {
+            s.part_id: s
+            for s in PartStockSummary.objects.select_for_update()
+            .filter(company_id=company_id, part_id__in=sorted(deltas))
+            .order_by("part_id")
+        }
+        missing = sorted(part_id for part_id in deltas if part_id not in summaries)
+        if missing:
+            # a concurrent get_or_create may insert the same rows: skip those, then lock them all
+            PartStockSummary.objects.bulk_create(
+                [PartStockSummary(company_id=company_id, part_id=part_id) for part_id in missing],
+                ignore_conflicts=True,
+            )
+            summaries.update(
+                (s.part_id, s)
+                for s in PartStockSummary.objects.select_for_update()
+                .filter(company_id=company_id, part_id__in=missing)
+                .order_by("part_id")
+            )
+
+        now = timezone.now()
+        for part_id, delta in deltas.items():
+            summary = summaries[part_id]
+            new_qty = Decimal(summary.available_qty) + delta
+            # Read-model must not go negative (ledger-time guard should already prevent this)
+            if new_qty < 0:
+                raise ValidationError("Stock summary cannot go negative")
+            summary.available_qty = new_qty
+            summary.updated_at = now
+
+        PartStockSummary.objects.bulk_update(list(summaries.values()), ["available_qty", "updated_at"])
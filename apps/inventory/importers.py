@@ -0,0 +1,469 @@
+# apps/inventory/importers.py
+from __future__ import annotations
+
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from apps.inventory.bom_index import replace_effective_edges
+from apps.inventory.guards import BomEdge, _load_edges, assert_bom_graph_valid, build_graph
+from apps.inventory.models import BOM, BOMItem, Part
+
+
+DEFAULT_BATCH_SIZE = 2000
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+BOM_IMPORT_FIELDS = (
+    "parent_part_no",
+    "revision_index",
+    "is_active",
+    "component_part_no",
+    "qty_per",
+    "is_direct",
+)
+
+PART_IMPORT_FIELDS = (
+    "part_no",
+    "name",
+    "part_type",
+    "procurement_strategy",
+    "is_saleable",
+    "standard_cost",
+)
+
+_TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+_FALSE_VALUES = {"0", "false", "f", "no", "n", ""}
+
+
+# =========================
+# Result / error report
+# =========================
+@dataclass(frozen=True)
+class ImportRowError:
+    line_no: int
+    key: str
+    message: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"line_no": self.line_no, "key": self.key, "message": self.message}
+
+
+@dataclass
+class ImportResult:
+    dry_run: bool
+    total_rows: int = 0
+    valid_rows: int = 0
+    created: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return (self.total_rows / self.elapsed_s) if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "total_rows": self.total_rows,
+            "valid_rows": self.valid_rows,
+            "created": self.created,
+            "error_count": len(self.errors),
+            "elapsed_s": round(self.elapsed_s, 6),
+            "rows_per_sec": round(self.rows_per_sec, 2),
+        }
+
+
+@dataclass
+class BomImportResult(ImportResult):
+    boms_created: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = super().as_dict()
+        data["boms_created"] = self.boms_created
+        return data
+
+
+# =========================
+# Record readers
+# =========================
+class InvalidRecord:
+    """
+    A line the reader could not turn into a dict; reported as a row error.
+    """
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def iter_csv_records(stream: IO[str]) -> Iterator[tuple[int, dict[str, Any] | InvalidRecord]]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_jsonl_records(stream: IO[str]) -> Iterator[tuple[int, dict[str, Any] | InvalidRecord]]:
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield line_no, InvalidRecord(f"invalid JSON: {exc}")
+            continue
+        if not isinstance(data, dict):
+            yield line_no, InvalidRecord("JSON line must be an object")
+            continue
+        yield line_no, data
+
+
+def iter_records(stream: IO[str], fmt: str):
+    if fmt == "csv":
+        return iter_csv_records(stream)
+    if fmt == "jsonl":
+        return iter_jsonl_records(stream)
+    raise ValueError(f"Unknown import format: {fmt}")
+
+
+def detect_format(path: str | Path, explicit: str | None = None) -> str:
+    if explicit:
+        return explicit
+    if Path(path).suffix.lower() in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    return "csv"
+
+
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch: list[Any] = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    s = _text(value).lower()
+    if s in _TRUE_VALUES:
+        return True
+    if s in _FALSE_VALUES:
+        return False
+    raise ValidationError(f"invalid boolean: {value!r}")
+
+
+def _parse_decimal(value: Any) -> Decimal | None:
+    s = _text(value)
+    if not s:
+        return None
+    try:
+        return Decimal(s)
+    except InvalidOperation as exc:
+        raise ValidationError(f"invalid decimal: {value!r}") from exc
+
+
+def _error_message(exc: ValidationError) -> str:
+    if hasattr(exc, "error_dict"):
+        return "; ".join(f"{k}: {' '.join(v)}" for k, v in sorted(exc.message_dict.items()))
+    return "; ".join(exc.messages)
+
+
+# =========================
+# Part import
+# =========================
+def _build_part(company_id: UUID, data: dict[str, Any]) -> Part:
+    """
+    Build an unsaved Part and run model validation in memory.
+
+    full_clean(validate_unique=False, validate_constraints=False) runs field
+    validation + Part.clean() (type/strategy rules) without touching the DB;
+    uniqueness is checked against the preloaded part_no set instead.
+    """
+    part = Part(
+        company_id=company_id,
+        part_no=_text(data.get("part_no")),
+        name=_text(data.get("name")),
+        part_type=_text(data.get("part_type")),
+        procurement_strategy=_text(data.get("procurement_strategy")),
+        is_saleable=_parse_bool(data.get("is_saleable", False)),
+        standard_cost=_parse_decimal(data.get("standard_cost")),
+    )
+    part.full_clean(validate_unique=False, validate_constraints=False)
+    return part
+
+
+def load_existing_part_nos(company_id: UUID) -> set[str]:
+    return set(
+        Part.objects.filter(company_id=company_id)
+        .values_list("part_no", flat=True)
+        .iterator(chunk_size=10_000)
+    )
+
+
+def import_parts(
+    company_id: UUID,
+    records: Iterable[tuple[int, dict[str, Any] | InvalidRecord]],
+    *,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    Bulk Part import pipeline.
+
+    - one query to preload existing part_no for the company
+    - all row validation in memory (no per-row uniqueness query)
+    - valid rows written with bulk_create in chunks, inside one transaction
+    - invalid rows reported per line; they never block valid rows
+    """
+    result = ImportResult(dry_run=dry_run)
+    started = time.perf_counter()
+
+    seen = load_existing_part_nos(company_id)
+
+    with transaction.atomic():
+        for batch in _batched(records, batch_size):
+            valid: list[Part] = []
+
+            for line_no, data in batch:
+                result.total_rows += 1
+
+                if isinstance(data, InvalidRecord):
+                    result.errors.append(ImportRowError(line_no, "", data.message))
+                    continue
+
+                key = _text(data.get("part_no"))
+                try:
+                    part = _build_part(company_id, data)
+                except ValidationError as exc:
+                    result.errors.append(ImportRowError(line_no, key, _error_message(exc)))
+                    continue
+
+                if part.part_no in seen:
+                    result.errors.append(ImportRowError(line_no, key, "part_no already exists for company"))
+                    continue
+
+                seen.add(part.part_no)
+                valid.append(part)
+
+            result.valid_rows += len(valid)
+            if valid and not dry_run:
+                Part.objects.bulk_create(valid, batch_size=batch_size)
+                result.created += len(valid)
+
+    result.elapsed_s = time.perf_counter() - started
+    return result
+
+
+# =========================
+# BOM import
+# =========================
+@dataclass
+class _StagedBom:
+    header: BOM
+    line_no: int
+    items: list[tuple[int, BOMItem]] = field(default_factory=list)
+    components: set[UUID] = field(default_factory=set)
+    errors: list[ImportRowError] = field(default_factory=list)
+
+
+def _parse_int(value: Any, default: int) -> int:
+    s = _text(value)
+    if not s:
+        return default
+    try:
+        return int(s)
+    except ValueError as exc:
+        raise ValidationError(f"invalid integer: {value!r}") from exc
+
+
+def _prefetch_parts(company_id: UUID, part_nos: set[str]) -> dict[str, Part]:
+    """
+    One query for every Part referenced by the batch (parents + components).
+    """
+    if not part_nos:
+        return {}
+    qs = Part.objects.filter(company_id=company_id, part_no__in=part_nos).only(
+        "id", "company_id", "part_no", "part_type", "procurement_strategy"
+    )
+    return {p.part_no: p for p in qs}
+
+
+def import_boms(
+    company_id: UUID,
+    records: Iterable[tuple[int, dict[str, Any] | InvalidRecord]],
+    *,
+    dry_run: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> BomImportResult:
+    """
+    Bulk BOM loader (one row per BOM item; headers derived from parent+revision).
+
+    - stages all headers and items in memory
+    - one query prefetches every referenced Part, one query loads existing headers
+    - BOM.clean() / BOMItem.clean() run in memory against the prefetched parts
+    - one cycle + depth check on the live graph after the batch (active staged
+      revisions replace the live edges of their parents)
+    - headers and items written with bulk_create; effective edge index updated
+
+    A BOM is written only if all of its rows are valid. Graph violations fail
+    the whole batch (nothing is written).
+    """
+    result = BomImportResult(dry_run=dry_run)
+    started = time.perf_counter()
+
+    rows: list[tuple[int, dict[str, Any]]] = []
+    part_nos: set[str] = set()
+    for line_no, data in records:
+        result.total_rows += 1
+        if isinstance(data, InvalidRecord):
+            result.errors.append(ImportRowError(line_no, "", data.message))
+            continue
+        rows.append((line_no, data))
+        part_nos.add(_text(data.get("parent_part_no")))
+        part_nos.add(_text(data.get("component_part_no")))
+    part_nos.discard("")
+
+    parts = _prefetch_parts(company_id, part_nos)
+    parent_ids = {parts[n].id for n in part_nos if n in parts}
+    existing_headers = set(
+        BOM.objects.filter(company_id=company_id, parent_part_id__in=parent_ids).values_list(
+            "parent_part_id", "revision_index"
+        )
+    )
+
+    staged: dict[tuple[UUID, int], _StagedBom] = {}
+    active_in_batch: set[UUID] = set()
+
+    for line_no, data in rows:
+        parent_no = _text(data.get("parent_part_no"))
+        component_no = _text(data.get("component_part_no"))
+        key = f"{parent_no}>{component_no}"
+
+        parent = parts.get(parent_no)
+        if parent is None:
+            result.errors.append(ImportRowError(line_no, key, f"parent part not found: {parent_no!r}"))
+            continue
+
+        try:
+            revision_index = _parse_int(data.get("revision_index"), 1)
+        except ValidationError as exc:
+            result.errors.append(ImportRowError(line_no, key, _error_message(exc)))
+            continue
+
+        bom_key = (parent.id, revision_index)
+        entry = staged.get(bom_key)
+        if entry is None:
+            header = BOM(company_id=company_id, parent_part=parent, revision_index=revision_index)
+            entry = _StagedBom(header=header, line_no=line_no)
+            staged[bom_key] = entry
+            try:
+                header.is_active = _parse_bool(data.get("is_active", True))
+                if bom_key in existing_headers:
+                    raise ValidationError("BOM revision already exists for parent_part")
+                if header.is_active:
+                    if parent.id in active_in_batch:
+                        raise ValidationError("more than one active revision for parent_part in batch")
+                    active_in_batch.add(parent.id)
+                header.clean_fields(exclude=["parent_part"])
+                header.clean()
+            except ValidationError as exc:
+                entry.errors.append(ImportRowError(line_no, key, f"BOM header invalid: {_error_message(exc)}"))
+                continue
+
+        component = parts.get(component_no)
+        if component is None:
+            entry.errors.append(ImportRowError(line_no, key, f"component part not found: {component_no!r}"))
+            continue
+        if component.id in entry.components:
+            entry.errors.append(ImportRowError(line_no, key, "duplicate component in BOM"))
+            continue
+
+        try:
+            item = BOMItem(
+                company_id=company_id,
+                bom=entry.header,
+                component_part=component,
+                qty_per=_parse_decimal(data.get("qty_per")),
+                is_direct=_parse_bool(data.get("is_direct", True)),
+            )
+            item.clean_fields(exclude=["bom", "component_part"])
+            item.clean()
+        except ValidationError as exc:
+            entry.errors.append(ImportRowError(line_no, key, _error_message(exc)))
+            continue
+
+        entry.components.add(component.id)
+        entry.items.append((line_no, item))
+
+    accepted: list[_StagedBom] = []
+    for entry in staged.values():
+        if entry.errors:
+            result.errors.extend(entry.errors)
+            # valid rows of a rejected BOM are reported too (BOMs are all-or-nothing)
+            parent_no = entry.header.parent_part.part_no
+            for line_no, item in entry.items:
+                key = f"{parent_no}>{item.component_part.part_no}"
+                result.errors.append(ImportRowError(line_no, key, "BOM rejected (other rows invalid)"))
+            continue
+        accepted.append(entry)
+
+    # Active staged revisions replace the live edges of their parents
+    activated = [entry for entry in accepted if entry.header.is_active]
+    replaced_parents = {entry.header.parent_part_id for entry in activated}
+
+    # One combined graph validation (live graph after the batch) for the whole batch
+    staged_edges = [
+        BomEdge(parent_part_id=entry.header.parent_part_id, component_part_id=item.component_part_id)
+        for entry in activated
+        for _, item in entry.items
+    ]
+    if staged_edges:
+        live_edges = [e for e in _load_edges(company_id) if e.parent_part_id not in replaced_parents]
+        graph = build_graph([*live_edges, *staged_edges])
+        try:
+            assert_bom_graph_valid(graph, replaced_parents)
+        except ValidationError as exc:
+            result.errors.append(ImportRowError(0, "graph", _error_message(exc)))
+            result.elapsed_s = time.perf_counter() - started
+            return result
+
+    headers = [entry.header for entry in accepted]
+    items = [item for entry in accepted for _, item in entry.items]
+    result.valid_rows = len(items)
+
+    if not dry_run and headers:
+        with transaction.atomic():
+            if replaced_parents:
+                BOM.objects.filter(
+                    company_id=company_id, parent_part_id__in=replaced_parents, is_active=True
+                ).update(is_active=False)
+            BOM.objects.bulk_create(headers, batch_size=batch_size)
+            BOMItem.objects.bulk_create(items, batch_size=batch_size)
+            replace_effective_edges(
+                company_id,
+                replaced_parents,
+                [item for entry in activated for _, item in entry.items],
+            )
+        result.boms_created = len(headers)
+        result.created = len(items)
+
+    result.elapsed_s = time.perf_counter() - started
+    return result
@@ -0,0 +1,676 @@
+# apps/inventory/ledger_export.py
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+from uuid import UUID
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.inventory.ledger_sequence import LEDGER_SEQUENCE_NAME, ledger_heads, uses_database_sequence
+from factory_manager.instrumentation import instrumented
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+# =========================
+# Layout
+# =========================
+# One export = a directory with
+# - manifest.json: columns (+ decimal scales), filters, row groups, file checksums
+# - ledger.csv.gz (header + rows) or ledger.parquet (one Parquet row group per group)
+# - parts.csv.gz: the exported companies' parts (keeps the export loadable)
+#
+# Row groups are sequence windows per company holding DEFAULT_ROW_GROUP_ROWS
+# rows (sequences may have gaps, so each window's upper bound is looked up on
+# the (company_id, sequence) index). Each group is one COPY on PostgreSQL (index
+# range scan on (company_id, sequence)); bytes go from the server to the file
+# without per-row Python work.
+#
+# Decimals are exported as exact scaled integers (<name>_e<scale>), so no
+# float ever touches a quantity or a cost.
+FORMAT_CSV_GZ = "csv.gz"
+FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = (FORMAT_CSV_GZ, FORMAT_PARQUET)
+MANIFEST_NAME = "manifest.json"
+PARTS_FILE = "parts.csv.gz"
+MANIFEST_VERSION = 1
+DEFAULT_ROW_GROUP_ROWS = 1_000_000
+IMPORT_BATCH_SIZE = 5000
+_COPY_BLOCK = 1 << 20
+# created_at as UTC ISO 8601 with microseconds, identical on every path
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+_PG_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    name: str
+    field: str  # StockLedgerEntry field name
+    kind: str  # uuid | int64 | timestamp | string | json
+    scale: int | None = None  # decimals: value * 10**scale as int64
+
+
+LEDGER_COLUMNS = (
+    ExportColumn("id", "id", "uuid"),
+    ExportColumn("company_id", "company_id", "uuid"),
+    ExportColumn("part_id", "part", "uuid"),
+    ExportColumn("sequence", "sequence", "int64"),
+    ExportColumn("created_at", "created_at", "timestamp"),
+    ExportColumn("movement_type", "movement_type", "string"),
+    ExportColumn("source_type", "source_type", "string"),
+    ExportColumn("qty_e6", "qty", "int64", 6),
+    ExportColumn("unit_cost_e4", "unit_cost", "int64", 4),
+    ExportColumn("transaction_value_e4", "transaction_value", "int64", 4),
+    ExportColumn("reference_price_e4", "reference_price", "int64", 4),
+    ExportColumn("reverse_of_id", "reverse_of", "uuid"),
+    ExportColumn("idempotency_key", "idempotency_key", "string"),
+    ExportColumn("idempotency_scope", "idempotency_scope", "string"),
+    ExportColumn("source_ref", "source_ref", "json"),
+)
+
+PART_COLUMNS = ("id", "company_id", "part_no", "name", "part_type", "procurement_strategy", "is_saleable")
+
+
+@dataclass(frozen=True)
+class RowGroup:
+    company_id: UUID
+    first_sequence: int
+    last_sequence: int
+    rows: int
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+# =========================
+# Checksummed file I/O
+# =========================
+class _HashingWriter:
+    def __init__(self, fh: BinaryIO):
+        self._fh = fh
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self._fh.write(data)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self.bytes
+
+    def close(self) -> None:
+        self._fh.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._fh.closed
+
+
+class _HashingReader:
+    def __init__(self, fh: BinaryIO):
+        self._fh = fh
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fh.read(size)
+        self.sha256.update(data)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def _file_entry(name: str, writer: _HashingWriter) -> dict[str, Any]:
+    return {"name": name, "bytes": writer.bytes, "sha256": writer.sha256.hexdigest()}
+
+
+# =========================
+# Row group sources (CSV bytes)
+# =========================
+def _sql_select(connection) -> str:
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    opts = StockLedgerEntry._meta
+    exprs = []
+    for col in LEDGER_COLUMNS:
+        column = connection.ops.quote_name(opts.get_field(col.field).column)
+        if col.scale is not None:
+            exprs.append(f"({column} * {10**col.scale})::bigint AS {col.name}")
+        elif col.kind == "timestamp":
+            exprs.append(f"to_char({column} AT TIME ZONE 'UTC', '{_PG_TIMESTAMP_FORMAT}') AS {col.name}")
+        else:
+            exprs.append(f"{column} AS {col.name}")
+    return f"SELECT {', '.join(exprs)} FROM {connection.ops.quote_name(opts.db_table)}"
+
+
+class _CopyGroup:
+    """
+    PostgreSQL: COPY (SELECT ..) TO STDOUT for one sequence window; yields raw
+    CSV blocks as the server sends them. `rows` comes from the COPY tag.
+    """
+
+    def __init__(self, connection, company_id: UUID, lo: int, hi: int, since, until):
+        sql = f"{_sql_select(connection)} WHERE company_id = %s AND sequence BETWEEN %s AND %s"
+        params: list[Any] = [company_id, lo, hi]
+        if since is not None:
+            sql += " AND created_at >= %s"
+            params.append(since)
+        if until is not None:
+            sql += " AND created_at < %s"
+            params.append(until)
+        self._connection = connection
+        self._sql = f"COPY ({sql} ORDER BY sequence) TO STDOUT WITH (FORMAT csv)"
+        self._params = params
+        self.rows = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        with self._connection.cursor() as cursor:
+            with cursor.copy(self._sql, self._params) as copy:
+                for block in copy:
+                    yield bytes(block)
+            self.rows = cursor.rowcount
+
+
+class _OrmGroup:
+    """
+    Other vendors (local runs, tests): the same CSV built through the ORM.
+    """
+
+    def __init__(self, queryset, lo: int, hi: int):
+        fields = [f"{col.field}_id" if col.field in ("part", "reverse_of") else col.field for col in LEDGER_COLUMNS]
+        self._rows = queryset.filter(sequence__gte=lo, sequence__lte=hi).order_by("sequence").values_list(*fields)
+        self.rows = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in self._rows.iterator(chunk_size=IMPORT_BATCH_SIZE):
+            writer.writerow([_csv_value(col, value) for col, value in zip(LEDGER_COLUMNS, row)])
+            self.rows += 1
+            if buffer.tell() >= _COPY_BLOCK:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+
+def _csv_value(col: ExportColumn, value) -> Any:
+    if value is None:
+        return ""
+    if col.scale is not None:
+        return int(Decimal(value).scaleb(col.scale))
+    if col.kind == "timestamp":
+        return value.astimezone(dt_timezone.utc).strftime(_TIMESTAMP_FORMAT)
+    if col.kind == "json":
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return str(value)
+
+
+# =========================
+# Sinks
+# =========================
+class _CsvGzSink:
+    name = "ledger.csv.gz"
+
+    def __init__(self, directory: Path):
+        self._raw = _HashingWriter(open(directory / self.name, "wb"))
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        self._gz.write((",".join(col.name for col in LEDGER_COLUMNS) + "\n").encode())
+
+    def write_group(self, blocks: Iterable[bytes]) -> None:
+        for block in blocks:
+            self._gz.write(block)
+
+    def close(self) -> dict[str, Any]:
+        self._gz.close()
+        self._raw.close()
+        return _file_entry(self.name, self._raw)
+
+
+class _ParquetSink:
+    name = "ledger.parquet"
+
+    def __init__(self, directory: Path):
+        import pyarrow.parquet as pq  # optional dependency
+
+        self._schema = _arrow_schema()
+        self._raw = _HashingWriter(open(directory / self.name, "wb"))
+        self._writer = pq.ParquetWriter(self._raw, self._schema, compression="zstd")
+
+    def write_group(self, blocks: Iterable[bytes]) -> None:
+        import pyarrow.csv as pacsv
+
+        data = b"".join(blocks)
+        if not data:
+            return
+        table = pacsv.read_csv(
+            io.BytesIO(data),
+            read_options=pacsv.ReadOptions(column_names=[col.name for col in LEDGER_COLUMNS]),
+            convert_options=pacsv.ConvertOptions(
+                column_types=self._schema, strings_can_be_null=True, quoted_strings_can_be_null=False
+            ),
+        )
+        # one COPY window => one Parquet row group
+        self._writer.write_table(table, row_group_size=max(1, table.num_rows))
+
+    def close(self) -> dict[str, Any]:
+        self._writer.close()
+        self._raw.close()
+        return _file_entry(self.name, self._raw)
+
+
+def _arrow_schema():
+    import pyarrow as pa  # optional dependency
+
+    types = {
+        "uuid": pa.string(),
+        "int64": pa.int64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "string": pa.string(),
+        "json": pa.string(),
+    }
+    return pa.schema([pa.field(col.name, types[col.kind]) for col in LEDGER_COLUMNS])
+
+
+# =========================
+# Export
+# =========================
+@dataclass(frozen=True)
+class ExportResult:
+    directory: Path
+    rows: int
+    row_groups: list[RowGroup]
+
+
+@instrumented("inventory.ledger_export")
+def export_ledger(
+    directory: Path | str,
+    *,
+    fmt: str = FORMAT_CSV_GZ,
+    company_ids: Iterable[UUID] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    row_group_rows: int = DEFAULT_ROW_GROUP_ROWS,
+    database: str = DEFAULT_DB_ALIAS,
+) -> ExportResult:
+    """
+    Export StockLedgerEntry rows (created_at in [since, until)) of the given
+    companies (default: all) into `directory`, which must be empty or new.
+    """
+    from apps.inventory.models import Part, StockLedgerEntry  # local import
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    if fmt == FORMAT_PARQUET and not parquet_available():
+        raise ValueError("parquet export requires pyarrow (pip install pyarrow)")
+    if row_group_rows <= 0:
+        raise ValueError("row_group_rows must be > 0")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if any(directory.iterdir()):
+        raise ValueError(f"{directory} is not empty")
+
+    connection = connections[database]
+    use_copy = connection.vendor == "postgresql"
+    companies = sorted(set(company_ids) if company_ids is not None else set(ledger_heads()))
+
+    sink = _ParquetSink(directory) if fmt == FORMAT_PARQUET else _CsvGzSink(directory)
+    groups: list[RowGroup] = []
+    try:
+        # one snapshot for the whole export (consistent across row groups)
+        snapshot = use_copy and not connection.in_atomic_block
+        with transaction.atomic(using=database):
+            if snapshot:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            for company_id in companies:
+                qs = StockLedgerEntry.objects.using(database).filter(company_id=company_id)
+                if since is not None:
+                    qs = qs.filter(created_at__gte=since)
+                if until is not None:
+                    qs = qs.filter(created_at__lt=until)
+                bounds = qs.aggregate(lo=Min("sequence"), hi=Max("sequence"))
+                if bounds["lo"] is None:
+                    continue
+                lo = bounds["lo"]
+                while lo <= bounds["hi"]:
+                    hi = (
+                        qs.filter(sequence__gte=lo)
+                        .order_by("sequence")
+                        .values_list("sequence", flat=True)[row_group_rows - 1 : row_group_rows]
+                        .first()
+                    ) or bounds["hi"]
+                    group = (
+                        _CopyGroup(connection, company_id, lo, hi, since, until) if use_copy else _OrmGroup(qs, lo, hi)
+                    )
+                    sink.write_group(group)
+                    if group.rows:
+                        groups.append(RowGroup(company_id, lo, hi, group.rows))
+                    lo = hi + 1
+
+            parts_file = _export_parts(
+                directory, Part.objects.using(database).filter(company_id__in=companies).order_by("company_id", "part_no")
+            )
+    finally:
+        ledger_file = sink.close()
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "table": StockLedgerEntry._meta.db_table,
+        "format": fmt,
+        "exported_at": timezone.now().isoformat(),
+        "columns": [
+            {"name": col.name, "kind": col.kind, **({"scale": col.scale} if col.scale is not None else {})}
+            for col in LEDGER_COLUMNS
+        ],
+        "filters": {
+            "company_ids": [str(c) for c in companies] if company_ids is not None else None,
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None,
+        },
+        "row_group_rows": row_group_rows,
+        "row_groups": [
+            {
+                "company_id": str(g.company_id),
+                "first_sequence": g.first_sequence,
+                "last_sequence": g.last_sequence,
+                "rows": g.rows,
+            }
+            for g in groups
+        ],
+        "rows": sum(g.rows for g in groups),
+        "files": {"ledger": ledger_file, "parts": parts_file},
+    }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return ExportResult(directory=directory, rows=manifest["rows"], row_groups=groups)
+
+
+def _export_parts(directory: Path, parts) -> dict[str, Any]:
+    raw = _HashingWriter(open(directory / PARTS_FILE, "wb"))
+    with gzip.GzipFile(fileobj=raw, mode="wb") as gz, io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+        writer = csv.writer(text, lineterminator="\n")
+        writer.writerow(PART_COLUMNS)
+        for row in parts.values_list(*PART_COLUMNS).iterator(chunk_size=IMPORT_BATCH_SIZE):
+            writer.writerow(row)
+    raw.close()
+    return _file_entry(PARTS_FILE, raw)
+
+
+# =========================
+# Import (scratch databases)
+# =========================
+@dataclass(frozen=True)
+class ImportResult:
+    rows: int
+    parts: int
+    companies: list[UUID]
+
+
+def read_manifest(directory: Path | str) -> dict[str, Any]:
+    path = Path(directory) / MANIFEST_NAME
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Unreadable manifest {path}: {exc}") from exc
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('version')!r}")
+    if [c["name"] for c in manifest["columns"]] != [col.name for col in LEDGER_COLUMNS]:
+        raise ValueError("Export columns do not match this schema version")
+    return manifest
+
+
+@instrumented("inventory.ledger_import")
+def import_ledger_export(directory: Path | str, *, database: str = DEFAULT_DB_ALIAS) -> ImportResult:
+    """
+    Load an export into `database` (a scratch DB for benchmarks): parts, then
+    ledger rows as exported (ids, sequences, created_at kept), then the
+    per-company sequence heads. Fail-closed: the exported companies must have
+    no ledger rows there; any checksum mismatch rolls everything back.
+    Stock summaries are not touched (run rebuild_stock_summary afterwards).
+    """
+    from apps.inventory.models import LedgerSequence, StockLedgerEntry  # local import
+
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    companies = sorted({UUID(g["company_id"]) for g in manifest["row_groups"]})
+    if StockLedgerEntry.objects.using(database).filter(company_id__in=companies).exists():
+        raise ValueError("Target database already has ledger rows for the exported companies")
+
+    connection = connections[database]
+    with transaction.atomic(using=database):
+        parts = _import_parts(directory, manifest["files"]["parts"], database)
+
+        ledger_file = manifest["files"]["ledger"]
+        reader = _HashingReader(open(directory / ledger_file["name"], "rb"))
+        try:
+            if manifest["format"] == FORMAT_PARQUET:
+                blocks = _parquet_csv_blocks(directory / ledger_file["name"])
+            else:
+                blocks = _gzip_blocks(reader)
+            if connection.vendor == "postgresql":
+                rows = _copy_in(connection, blocks)
+            else:
+                rows = _insert_rows(connection, blocks)
+            _drain(reader)
+        finally:
+            reader.close()
+        if reader.sha256.hexdigest() != ledger_file["sha256"]:
+            raise ValueError(f"Checksum mismatch: {ledger_file['name']}")
+        if rows != manifest["rows"]:
+            raise ValueError(f"Row count mismatch: manifest={manifest['rows']} loaded={rows}")
+
+        heads = {
+            company_id: head
+            for company_id, head in StockLedgerEntry.objects.using(database)
+            .filter(company_id__in=companies)
+            .values("company_id")
+            .annotate(head=Max("sequence"))
+            .values_list("company_id", "head")
+        }
+        for company_id, head in heads.items():
+            counter, _ = LedgerSequence.objects.using(database).select_for_update().get_or_create(company_id=company_id)
+            if counter.last_value < head:
+                counter.last_value = head
+                counter.save(using=database, update_fields=["last_value"])
+        if heads and uses_database_sequence(connection):
+            # keep nextval() above every imported sequence
+            seq = connection.ops.quote_name(LEDGER_SEQUENCE_NAME)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT setval(%s, GREATEST(%s, (SELECT last_value FROM {seq})))",
+                    [LEDGER_SEQUENCE_NAME, max(heads.values())],
+                )
+
+    return ImportResult(rows=rows, parts=parts, companies=companies)
+
+
+def _drain(reader: _HashingReader) -> None:
+    # checksum covers the whole file, also bytes the decoder did not need
+    while reader.read(_COPY_BLOCK):
+        pass
+
+
+def _gzip_blocks(reader: _HashingReader) -> Iterator[bytes]:
+    with gzip.GzipFile(fileobj=reader, mode="rb") as gz:
+        gz.readline()  # header (columns are in the manifest)
+        while block := gz.read(_COPY_BLOCK):
+            yield block
+
+
+def _parquet_csv_blocks(path: Path) -> Iterator[bytes]:
+    """
+    One headerless CSV block per Parquet row group (the checksum reader drains
+    the same file separately: ParquetFile needs to seek).
+    """
+    import pyarrow.csv as pacsv  # optional dependency
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    for i in range(parquet.num_row_groups):
+        out = io.BytesIO()
+        pacsv.write_csv(parquet.read_row_group(i), out, write_options=pacsv.WriteOptions(include_header=False))
+        yield out.getvalue()
+
+
+def _copy_in(connection, blocks: Iterable[bytes]) -> int:
+    """
+    PostgreSQL: COPY the CSV into a temp staging table, then one INSERT .. SELECT
+    scales the integers back to numeric (exact) and casts the rest.
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    opts = StockLedgerEntry._meta
+    staging_types = {"uuid": "uuid", "int64": "bigint", "timestamp": "timestamptz", "string": "text", "json": "jsonb"}
+    staging = "inventory_ledger_import_staging"
+    columns = ", ".join(f"{col.name} {staging_types[col.kind]}" for col in LEDGER_COLUMNS)
+    targets, exprs = [], []
+    for col in LEDGER_COLUMNS:
+        field = opts.get_field(col.field)
+        targets.append(connection.ops.quote_name(field.column))
+        if col.scale is not None:
+            exprs.append(f"{col.name}::numeric / {10**col.scale}")
+        else:
+            exprs.append(col.name)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMP TABLE {staging} ({columns}) ON COMMIT DROP")
+        with cursor.copy(f"COPY {staging} FROM STDIN WITH (FORMAT csv)") as copy:
+            for block in blocks:
+                copy.write(block)
+        cursor.execute(
+            f"INSERT INTO {connection.ops.quote_name(opts.db_table)} ({', '.join(targets)}) "
+            f"SELECT {', '.join(exprs)} FROM {staging} ORDER BY company_id, sequence"
+        )
+        return cursor.rowcount
+
+
+def _insert_rows(connection, blocks: Iterable[bytes]) -> int:
+    """
+    Other vendors: parse the CSV and executemany() in batches. Raw INSERTs on
+    purpose: bulk_create() would overwrite created_at (auto_now_add).
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    opts = StockLedgerEntry._meta
+    fields = [opts.get_field(col.field) for col in LEDGER_COLUMNS]
+    sql = (
+        f"INSERT INTO {connection.ops.quote_name(opts.db_table)} "
+        f"({', '.join(connection.ops.quote_name(f.column) for f in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+
+    text = io.TextIOWrapper(_BlockStream(blocks), encoding="utf-8", newline="")
+    count = 0
+    batch: list[list[Any]] = []
+    with connection.cursor() as cursor:
+        for record in csv.reader(text):
+            batch.append(
+                [
+                    field.get_db_prep_save(_python_value(col, raw), connection)
+                    for col, field, raw in zip(LEDGER_COLUMNS, fields, record)
+                ]
+            )
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            count += len(batch)
+    return count
+
+
+def _python_value(col: ExportColumn, raw: str) -> Any:
+    if raw == "":
+        return None
+    if col.scale is not None:
+        return Decimal(int(raw)).scaleb(-col.scale)
+    if col.kind == "uuid":
+        return UUID(raw)
+    if col.kind == "int64":
+        return int(raw)
+    if col.kind == "timestamp":
+        return parse_datetime(raw)
+    if col.kind == "json":
+        return json.loads(raw)
+    return raw
+
+
+class _BlockStream(io.RawIOBase):
+    """
+    Iterable of byte blocks as a readable binary stream (for TextIOWrapper).
+    """
+
+    def __init__(self, blocks: Iterable[bytes]):
+        self._blocks = iter(blocks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._blocks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _import_parts(directory: Path, entry: dict[str, Any], database: str) -> int:
+    from apps.inventory.models import Part  # local import
+
+    reader = _HashingReader(open(directory / entry["name"], "rb"))
+    try:
+        with gzip.GzipFile(fileobj=reader, mode="rb") as gz, io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+            records = csv.DictReader(text)
+            parts = [
+                Part(
+                    id=UUID(r["id"]),
+                    company_id=UUID(r["company_id"]),
+                    part_no=r["part_no"],
+                    name=r["name"],
+                    part_type=r["part_type"],
+                    procurement_strategy=r["procurement_strategy"],
+                    is_saleable=r["is_saleable"] == "True",
+                )
+                for r in records
+            ]
+        _drain(reader)
+    finally:
+        reader.close()
+    if reader.sha256.hexdigest() != entry["sha256"]:
+        raise ValueError(f"Checksum mismatch: {entry['name']}")
+    Part.objects.using(database).bulk_create(parts, batch_size=IMPORT_BATCH_SIZE, ignore_conflicts=True)
+    return len(parts)
@@ -0,0 +1,264 @@
+# apps/inventory/ledger_sequence.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Iterable, Iterator
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+DEFAULT_BATCH_SIZE = 1000
+
+# PostgreSQL: one database sequence feeds every company (migration 0013).
+# nextval() is non-transactional and takes no lock that lives until commit.
+LEDGER_SEQUENCE_NAME = "inventory_ledger_sequence_seq"
+
+DEFAULT_HOLDBACK_SECONDS = 10.0
+DEFAULT_CLOCK_SKEW_SECONDS = 0.1
+
+# Lock order on the ledger write path (every writer takes them in this order):
+# 1. company counter row (non-PostgreSQL only; taken first, before any part lock)
+# 2. part locks (pg_advisory_xact_lock / Part row), several parts => sorted by part id;
+#    PostgreSQL draws nextval() after them (no lock of its own), so per part the
+#    sequence order is the lock order, i.e. the order on_ledger_insert folds rows
+# 3. PartStockSummary / PartStockDelta rows of those parts
+
+
+# =========================
+# Assignment (write path)
+# =========================
+def uses_database_sequence(connection) -> bool:
+    return connection.vendor == "postgresql"
+
+
+def sequence_follows_part_lock() -> bool:
+    """
+    True when the write path draws sequences after the part locks (database
+    sequence), False when before them (counter row); see lock order above.
+    Either way, per part the sequence order is the order rows are folded.
+    """
+    from apps.inventory.models import LedgerSequence  # local import
+
+    return uses_database_sequence(connections[router.db_for_write(LedgerSequence)])
+
+
+def next_ledger_sequence(company_id: UUID) -> int:
+    """
+    Allocate the next StockLedgerEntry.sequence for `company_id`.
+
+    Call it where sequence_follows_part_lock() says (see lock order above).
+    - PostgreSQL: nextval() on LEDGER_SEQUENCE_NAME, after the part lock.
+      Per company the numbers are increasing but NOT dense (other companies
+      and rolled-back inserts leave gaps), and across parts a higher number
+      may commit before a lower one; readers use ledger_rows_after(), which
+      holds back in-flight rows.
+    - other vendors: upsert on the company's counter row inside the insert
+      transaction, before any part lock (dense, commit-ordered; SQLite
+      serialises writers anyway).
+    """
+    return reserve_ledger_sequences(company_id, 1)[0]
+
+
+def reserve_ledger_sequences(company_id: UUID, count: int) -> list[int]:
+    """
+    Allocate `count` increasing sequences in one round-trip (batch inserts).
+    Same rules as next_ledger_sequence().
+    """
+    from apps.inventory.models import LedgerSequence  # local import
+
+    if count < 1:
+        raise ValueError("count must be >= 1")
+
+    db = router.db_for_write(LedgerSequence)
+    connection = connections[db]
+
+    if uses_database_sequence(connection):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [LEDGER_SEQUENCE_NAME, count])
+            values = sorted(int(row[0]) for row in cursor.fetchall())
+        # head moves after commit, in its own short statement (no lock held by the insert)
+        transaction.on_commit(partial(_advance_head, db, company_id, values[-1]), using=db)
+        return values
+
+    table = connection.ops.quote_name(LedgerSequence._meta.db_table)
+    key = LedgerSequence._meta.get_field("company_id").get_db_prep_value(company_id, connection)
+
+    # INSERT .. ON CONFLICT .. RETURNING: PostgreSQL and SQLite >= 3.35
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (company_id, last_value) VALUES (%s, %s) "
+            f"ON CONFLICT (company_id) DO UPDATE SET last_value = {table}.last_value + %s "
+            f"RETURNING last_value",
+            [key, count, count],
+        )
+        last = int(cursor.fetchone()[0])
+    return list(range(last - count + 1, last + 1))
+
+
+def _advance_head(db: str, company_id: UUID, value: int) -> None:
+    from apps.inventory.models import LedgerSequence  # local import
+
+    connection = connections[db]
+    table = connection.ops.quote_name(LedgerSequence._meta.db_table)
+    key = LedgerSequence._meta.get_field("company_id").get_db_prep_value(company_id, connection)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (company_id, last_value) VALUES (%s, %s) "
+            f"ON CONFLICT (company_id) DO UPDATE SET last_value = GREATEST({table}.last_value, EXCLUDED.last_value)",
+            [key, value],
+        )
+
+
+# =========================
+# Incremental reads (consumers)
+# =========================
+def ledger_head(company_id: UUID) -> int:
+    """
+    Highest committed sequence of `company_id` (0 when the company has no rows).
+    On PostgreSQL it is advanced after commit: a hint for "anything new?", not
+    a row count.
+    """
+    from apps.inventory.models import LedgerSequence  # local import
+
+    return LedgerSequence.objects.filter(company_id=company_id).values_list("last_value", flat=True).first() or 0
+
+
+def ledger_heads(*, using: str | None = None) -> dict[UUID, int]:
+    """
+    {company_id: head} for every company with ledger rows (one small table scan).
+    """
+    from apps.inventory.models import LedgerSequence  # local import
+
+    return dict(LedgerSequence.objects.using(using).values_list("company_id", "last_value"))
+
+
+def settled_horizon() -> datetime | None:
+    """
+    Newest created_at a sequence-ordered consumer may read past.
+
+    None where sequences commit in order (counter row). With the database
+    sequence, row N+1 can commit before N. A transaction holding N started
+    before N+1 was created, so rows created before the oldest open transaction
+    on the primary are settled (pg_stat_activity, read before the rows are).
+    created_at comes from the writers' clocks: LEDGER_CONSUMER_CLOCK_SKEW_SECONDS
+    covers the skew between app servers. LEDGER_CONSUMER_HOLDBACK_SECONDS is
+    the wall-clock floor, used alone when other sessions are not visible to
+    this role; it must exceed the longest time from drawing a sequence to
+    committing (lock waits included).
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    if not uses_database_sequence(connections[router.db_for_read(StockLedgerEntry)]):
+        return None
+    now = timezone.now()
+    holdback = getattr(settings, "LEDGER_CONSUMER_HOLDBACK_SECONDS", DEFAULT_HOLDBACK_SECONDS)
+    horizon = now - timedelta(seconds=holdback)
+    oldest_age = _oldest_open_transaction_age(connections[router.db_for_write(StockLedgerEntry)])
+    if oldest_age is not None:
+        skew = getattr(settings, "LEDGER_CONSUMER_CLOCK_SKEW_SECONDS", DEFAULT_CLOCK_SKEW_SECONDS)
+        # `now` was taken before the query: the mapped start errs on the early (safe) side
+        horizon = max(horizon, now - oldest_age - timedelta(seconds=skew))
+    return horizon
+
+
+def _oldest_open_transaction_age(connection) -> timedelta | None:
+    """
+    Age of the oldest open transaction of another client session (zero when
+    none is open), or None when some sessions are hidden from this role
+    (no pg_read_all_stats): the caller then falls back to the wall clock.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT clock_timestamp() - min(xact_start), coalesce(bool_or(state IS NULL), false) "
+            "FROM pg_stat_activity "
+            "WHERE backend_type = 'client backend' AND datname = current_database() AND pid <> pg_backend_pid()"
+        )
+        age, hidden = cursor.fetchone()
+    if hidden:
+        return None
+    return age or timedelta(0)
+
+
+def settles_in(company_id: UUID, after: int, *, settled_before: datetime | None = None) -> float | None:
+    """
+    Seconds until the first row of `company_id` after `after` leaves the
+    holdback window (None: that row is settled or there is none). Bounded by
+    the wall-clock floor; an in-flight transaction can release it earlier.
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    if settled_before is None:
+        settled_before = settled_horizon()
+    if settled_before is None:
+        return None
+    created_at = (
+        StockLedgerEntry.objects.filter(company_id=company_id, sequence__gt=after)
+        .order_by("sequence")
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    if created_at is None or created_at <= settled_before:
+        return None
+    return (created_at - settled_before).total_seconds()
+
+
+def ledger_rows_after(
+    company_id: UUID,
+    after: int,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fields: Iterable[str] | None = None,
+    settled_before: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Next batch of ledger rows of `company_id` with sequence > `after`, in sequence
+    order (index range scan on (company_id, sequence)). `fields` => values() dicts;
+    "sequence" and "created_at" are always included so callers can advance their cursor.
+
+    Sequences may have gaps. The batch stops at the first row created after
+    `settled_before` (default: settled_horizon()): nothing past a held-back
+    row is returned, so a cursor never jumps over it.
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    if settled_before is None:
+        settled_before = settled_horizon()
+    columns = list(dict.fromkeys(("sequence", "created_at", *(fields or ("id",)))))
+    rows = list(
+        StockLedgerEntry.objects.filter(company_id=company_id, sequence__gt=after)
+        .order_by("sequence")
+        .values(*columns)[:batch_size]
+    )
+    if settled_before is not None:
+        for i, row in enumerate(rows):
+            if row["created_at"] > settled_before:
+                return rows[:i]
+    return rows
+
+
+def iter_ledger_batches(
+    company_id: UUID,
+    after: int = 0,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fields: Iterable[str] | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Yield successive ledger_rows_after() batches until the company's head
+    (one settled horizon for the whole walk).
+    """
+    fields = tuple(fields) if fields is not None else None
+    settled_before = settled_horizon()
+    while True:
+        rows = ledger_rows_after(
+            company_id, after, batch_size=batch_size, fields=fields, settled_before=settled_before
+        )
+        if not rows:
+            return
+        yield rows
+        after = rows[-1]["sequence"]
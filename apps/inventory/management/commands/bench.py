@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import json
+import platform
+import random
+import subprocess
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import StringIO
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from apps.inventory.bench_data import BenchCompany, BenchDataSpec, delete_bench_data, generate_bench_data
+from apps.inventory.benchmarks import BenchResult, timed
+from apps.inventory.guards import MAX_BOM_DEPTH
+from apps.inventory.models import BOM, BOMItem, StockLedgerEntry
+
+
+SCENARIOS = ("ledger_in", "ledger_out", "ledger_reverse", "summary_rebuild", "bom_save", "admin_list")
+
+ADMIN_CHANGELISTS = (
+    "admin:inventory_part_changelist",
+    "admin:inventory_bom_changelist",
+    "admin:inventory_bomitem_changelist",
+    "admin:inventory_stockledgerentry_changelist",
+    "admin:inventory_partstocksummary_changelist",
+    "admin:audit_auditevent_changelist",
+)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _post(result: BenchResult, **fields) -> StockLedgerEntry | None:
+    started = time.perf_counter()
+    try:
+        with timed(result):
+            entry = StockLedgerEntry(**fields)
+            entry.save()
+    except (ValidationError, IntegrityError):
+        # rejected posts (e.g. negative stock) are counted; anything else is a bug
+        result.extra["errors"] = result.extra.get("errors", 0) + 1
+        entry = None
+    result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+    result.ops += 1
+    return entry
+
+
+class Command(BaseCommand):
+    help = (
+        "Write-path benchmark suite: generates a deterministic multi-tenant dataset (companies, parts, "
+        "layered BOMs, ledger history), then measures ledger IN/OUT/reverse posts, summary rebuild, "
+        "BOM saves and admin list pages. Every operation commits on its own, so measured latencies "
+        "include COMMIT and locks are released as in production: run against a scratch database. "
+        "The generated companies are deleted afterwards unless --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=2)
+        parser.add_argument("--parts", type=int, default=50, help="Parts per company.")
+        parser.add_argument("--bom-depth", type=int, default=3, help=f"Made-part layers (max {MAX_BOM_DEPTH}).")
+        parser.add_argument("--bom-fanout", type=int, default=3, help="Components per BOM.")
+        parser.add_argument("--history", type=int, default=10, help="Generated ledger entries per part.")
+        parser.add_argument("--posts", type=int, default=200, help="Measured ledger posts per IN/OUT/reverse scenario.")
+        parser.add_argument("--bom-saves", type=int, default=20)
+        parser.add_argument("--admin-requests", type=int, default=3, help="GETs per admin changelist.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            help="Run only the given scenario (repeatable). Default: all.",
+        )
+        parser.add_argument("--output", type=str, default="bench-results.json", help="Results JSON path.")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Leave the generated companies in place (rerun with another --seed).",
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options["bom_depth"] <= MAX_BOM_DEPTH:
+            raise CommandError(f"--bom-depth must be between 1 and {MAX_BOM_DEPTH}")
+        if options["companies"] < 1 or options["parts"] < options["bom_depth"] + 1:
+            raise CommandError("--companies must be >= 1 and --parts must exceed --bom-depth")
+
+        spec = BenchDataSpec(
+            companies=options["companies"],
+            parts_per_company=options["parts"],
+            bom_depth=options["bom_depth"],
+            bom_fanout=options["bom_fanout"],
+            ledger_entries_per_part=options["history"],
+            seed=options["seed"],
+        )
+        scenarios = options["scenario"] or list(SCENARIOS)
+        rng = random.Random(options["seed"])
+        results: list[BenchResult] = []
+
+        companies: list[BenchCompany] = []
+        try:
+            generate = BenchResult(name="generate")
+            with timed(generate):
+                companies = generate_bench_data(spec)
+            generate.ops = sum(c.ledger_entries for c in companies)
+            generate.extra["parts"] = sum(len(c.parts) for c in companies)
+            generate.extra["boms"] = sum(len(c.boms) for c in companies)
+            results.append(generate)
+
+            ins: list[StockLedgerEntry] = []
+            outs: list[StockLedgerEntry] = []
+            if "ledger_in" in scenarios or "ledger_out" in scenarios or "ledger_reverse" in scenarios:
+                results.append(self._ledger_in(companies, options["posts"], rng, ins))
+            if "ledger_out" in scenarios or "ledger_reverse" in scenarios:
+                results.append(self._ledger_out(ins, rng, outs))
+            if "ledger_reverse" in scenarios:
+                results.append(self._ledger_reverse(outs))
+            if "summary_rebuild" in scenarios:
+                results.append(self._summary_rebuild(companies))
+            if "bom_save" in scenarios:
+                results.append(self._bom_save(companies, options["bom_saves"], rng))
+            if "admin_list" in scenarios:
+                results.extend(self._admin_list(options["admin_requests"], keep=options["keep"]))
+        finally:
+            if not options["keep"]:
+                delete_bench_data([c.company_id for c in companies])
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "db_vendor": connection.vendor,
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "spec": asdict(spec),
+                "scenarios": scenarios,
+                "posts": options["posts"],
+                "kept": options["keep"],
+            },
+            "results": [r.as_dict() for r in results],
+        }
+
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True, default=str)
+
+        for r in results:
+            self.stdout.write(json.dumps(r.as_dict(), sort_keys=True, default=str))
+        self.stderr.write(self.style.SUCCESS(f"OK: bench results written to {options['output']}"))
+
+    # =========================
+    # Scenarios
+    # =========================
+    def _ledger_in(self, companies: list[BenchCompany], posts: int, rng: random.Random, ins: list) -> BenchResult:
+        result = BenchResult(name="ledger.post.in", extra={"errors": 0})
+        for seq in range(posts):
+            company = companies[seq % len(companies)]
+            part = rng.choice(company.parts)
+            entry = _post(
+                result,
+                company_id=company.company_id,
+                part=part,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal(rng.randint(1, 50)),
+                unit_cost=Decimal(rng.randint(100, 10_000)) / Decimal(100),
+                source_ref={"bench": "ledger_in", "seq": seq},
+            )
+            if entry is not None:
+                ins.append(entry)
+        return result
+
+    def _ledger_out(self, ins: list[StockLedgerEntry], rng: random.Random, outs: list) -> BenchResult:
+        """
+        One OUT per measured IN, never more than that IN received (negative-stock guard path).
+        """
+        result = BenchResult(name="ledger.post.out", extra={"errors": 0})
+        for seq, src in enumerate(ins):
+            entry = _post(
+                result,
+                company_id=src.company_id,
+                part=src.part,
+                movement_type=StockLedgerEntry.MovementType.OUT,
+                source_type=StockLedgerEntry.SourceType.PRODUCTION,
+                qty=Decimal(rng.randint(1, int(src.qty))),
+                unit_cost=src.unit_cost,
+                source_ref={"bench": "ledger_out", "seq": seq},
+            )
+            if entry is not None:
+                outs.append(entry)
+        return result
+
+    def _ledger_reverse(self, outs: list[StockLedgerEntry]) -> BenchResult:
+        """
+        Reverse the measured OUTs (reverse of an OUT is an IN: cannot trip the negative-stock guard).
+        """
+        result = BenchResult(name="ledger.post.reverse", extra={"errors": 0})
+        for seq, orig in enumerate(outs):
+            _post(
+                result,
+                company_id=orig.company_id,
+                part=orig.part,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.ADJUSTMENT,
+                qty=orig.qty,
+                unit_cost=orig.unit_cost,
+                reverse_of=orig,
+                source_ref={"bench": "ledger_reverse", "seq": seq},
+            )
+        return result
+
+    def _summary_rebuild(self, companies: list[BenchCompany]) -> BenchResult:
+        result = BenchResult(name="summary.rebuild")
+        for company in companies:
+            started = time.perf_counter()
+            with timed(result):
+                call_command("rebuild_stock_summary", company_id=str(company.company_id), stdout=StringIO())
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            result.ops += 1
+        result.extra["parts_per_company"] = len(companies[0].parts)
+        return result
+
+    def _bom_save(self, companies: list[BenchCompany], saves: int, rng: random.Random) -> BenchResult:
+        """
+        New active revision of an existing BOM (retire old revision, edge sync, graph validation),
+        with the same components re-attached.
+        """
+        result = BenchResult(name="bom.save.revision", extra={"errors": 0})
+        boms = [bom for c in companies for bom in c.boms]
+        if not boms:
+            return result
+
+        for seq in range(saves):
+            current = boms[seq % len(boms)]
+            items = list(current.items.all())
+            started = time.perf_counter()
+            try:
+                with timed(result):
+                    bom = BOM(
+                        company_id=current.company_id,
+                        parent_part=current.parent_part,
+                        revision_index=current.revision_index + 1,
+                    )
+                    bom.save()
+                    for item in items:
+                        BOMItem(
+                            company_id=item.company_id,
+                            bom=bom,
+                            component_part=item.component_part,
+                            qty_per=Decimal(rng.randint(1, 5)),
+                        ).save()
+                boms[seq % len(boms)] = bom
+            except (ValidationError, IntegrityError):
+                # same contract as _post: rejected saves are counted, anything else is a bug
+                result.extra["errors"] += 1
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            result.ops += 1
+        return result
+
+    def _admin_list(self, requests_per_page: int, *, keep: bool) -> list[BenchResult]:
+        """
+        Full request cycle (middleware + changelist) through the test client as a superuser;
+        the superuser is deleted afterwards unless `keep`.
+        """
+        user = get_user_model().objects.create_superuser(
+            username=f"bench-{int(time.time() * 1000)}",
+            email="bench@example.invalid",
+            password=None,
+        )
+        client = Client()
+        client.force_login(user)
+
+        results = []
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for url_name in ADMIN_CHANGELISTS:
+                    url = reverse(url_name)
+                    result = BenchResult(name=f"admin.list.{url_name.split(':')[1].removesuffix('_changelist')}", extra={"errors": 0})
+                    for _ in range(requests_per_page):
+                        started = time.perf_counter()
+                        with timed(result):
+                            response = client.get(url)
+                        result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+                        result.ops += 1
+                        if response.status_code != 200:
+                            result.extra["errors"] += 1
+                            result.extra["status"] = response.status_code
+                    results.append(result)
+        finally:
+            if not keep:
+                user.delete()
+        return results
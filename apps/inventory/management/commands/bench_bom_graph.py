@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+from collections import defaultdict, deque
+from uuid import UUID
+
+from django.core.management.base import BaseCommand
+
+from apps.inventory.benchmarks import BenchResult, timed
+from apps.inventory.guards import MAX_BOM_DEPTH, analyze_bom_graph
+
+
+# =========================
+# Synthetic graphs (in memory, deterministic)
+# =========================
+def _node(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128))
+
+
+def _layered(edges: int, fanout: int, rng: random.Random):
+    """
+    One root + MAX_BOM_DEPTH layers; each node links to `fanout` nodes of the next layer.
+    """
+    width = max(1, edges // (MAX_BOM_DEPTH * fanout))
+    root = _node(rng)
+    layers = [[root]] + [[_node(rng) for _ in range(width)] for _ in range(MAX_BOM_DEPTH)]
+    graph: dict[UUID, list[UUID]] = defaultdict(list)
+    graph[root] = list(layers[1])
+    for upper, lower in zip(layers[1:], layers[2:]):
+        for node in upper:
+            graph[node].extend(rng.sample(lower, min(fanout, len(lower))))
+    return graph, layers
+
+
+def _wide(edges: int, rng: random.Random):
+    root = _node(rng)
+    return {root: [_node(rng) for _ in range(edges)]}, [root]
+
+
+def _chain(edges: int, rng: random.Random):
+    nodes = [_node(rng) for _ in range(edges + 1)]
+    return {a: [b] for a, b in zip(nodes, nodes[1:])}, [nodes[0]]
+
+
+# =========================
+# Previous implementation (reference for comparison)
+# =========================
+def _legacy_check(graph: dict[UUID, list[UUID]], root: UUID) -> None:
+    WHITE, GRAY, BLACK = 0, 1, 2
+    color: dict[UUID, int] = defaultdict(int)
+
+    def dfs(node: UUID):
+        color[node] = GRAY
+        for nxt in graph.get(node, []):
+            if color[nxt] == GRAY:
+                raise ValueError("cycle")
+            if color[nxt] == WHITE:
+                dfs(nxt)
+        color[node] = BLACK
+
+    dfs(root)
+
+    q = deque([(root, 0)])
+    visited_depth: dict[UUID, int] = {root: 0}
+    while q:
+        node, depth = q.popleft()
+        for nxt in graph.get(node, []):
+            nd = depth + 1
+            if nxt not in visited_depth or nd < visited_depth[nxt]:
+                visited_depth[nxt] = nd
+                q.append((nxt, nd))
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark: combined iterative BOM graph validator vs recursive DFS + BFS (in memory)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--edges", type=int, default=100_000)
+        parser.add_argument("--fanout", type=int, default=4)
+        parser.add_argument("--roots", type=int, default=50, help="Root count for the multi_root shape.")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        edges = options["edges"]
+        rng = random.Random(options["seed"])
+        graph, layers = _layered(edges, options["fanout"], rng)
+        shapes = {
+            "layered": (graph, layers[0]),
+            # many roots at once: legacy re-traverses per root, combined shares memoised heights
+            "multi_root": (graph, layers[1][: options["roots"]]),
+            "wide": _wide(edges, rng),
+            "chain": _chain(edges, rng),
+        }
+
+        for shape, (graph, roots) in shapes.items():
+            edge_count = sum(len(v) for v in graph.values())
+
+            legacy = BenchResult(name=f"bom_graph.{shape}.legacy", extra={"edges": edge_count})
+            try:
+                for _ in range(options["repeat"]):
+                    with timed(legacy):
+                        for root in roots:
+                            _legacy_check(graph, root)
+                    legacy.ops += 1
+            except RecursionError:
+                legacy.extra["error"] = f"RecursionError (limit={sys.getrecursionlimit()})"
+
+            combined = BenchResult(name=f"bom_graph.{shape}.combined", extra={"edges": edge_count})
+            for _ in range(options["repeat"]):
+                with timed(combined):
+                    # unbounded depth so every shape is fully traversed
+                    report = analyze_bom_graph(graph, roots, max_depth=sys.maxsize)
+                combined.ops += 1
+            combined.extra["max_depth"] = report.max_depth
+
+            if legacy.ops and combined.elapsed_s > 0:
+                combined.extra["speedup"] = round(
+                    (legacy.elapsed_s / legacy.ops) / (combined.elapsed_s / combined.ops), 2
+                )
+
+            for r in (legacy, combined):
+                self.stdout.write(json.dumps(r.as_dict(), sort_keys=True))
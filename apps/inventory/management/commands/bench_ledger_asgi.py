@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from apps.inventory import views
+from apps.inventory.benchmarks import BenchResult
+from apps.inventory.models import Part, StockLedgerEntry
+from apps.tenancy.context import clear_active_scope, set_active_scope
+
+
+MODES = ("wsgi", "asgi", "asgi_thread_sensitive")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test: ledger posts through the sync view (WSGI threads) vs the async view (one event loop, "
+        "ledger worker pool; asgi_thread_sensitive = Django's default executor). Handler-level, in-process: "
+        "middleware and HTTP parsing are excluded. Writes synthetic rows under a fresh company id: "
+        "run against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=8, help="WSGI threads / in-flight async requests.")
+        parser.add_argument("--requests", type=int, default=400, help="Requests per mode.")
+        parser.add_argument("--parts", type=int, default=20)
+        parser.add_argument("--out-ratio", type=float, default=0.3)
+        parser.add_argument("--mode", action="append", choices=MODES, help="Repeatable. Default: all modes.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        company_id = uuid4()
+        parts = self._setup(company_id, options["parts"])
+        rng = random.Random(options["seed"])
+        payloads = []
+        for i in range(options["requests"]):
+            is_out = rng.random() < options["out_ratio"]
+            payloads.append(
+                {
+                    "part_id": str(rng.choice(parts).id),
+                    "movement_type": "out" if is_out else "in",
+                    "source_type": "production" if is_out else "purchase",
+                    "qty": "1",
+                    "unit_cost": "10",
+                    "source_ref": {"bench": "ledger_asgi", "seq": i},
+                }
+            )
+
+        results = []
+        for mode in options["mode"] or MODES:
+            # unique source_ref per mode: v1 idempotency must not collapse rows across runs
+            batch = [dict(p, source_ref={**p["source_ref"], "mode": mode}) for p in payloads]
+            if mode == "wsgi":
+                result = self._run_wsgi(company_id, batch, options["concurrency"])
+            else:
+                workers = 0 if mode == "asgi_thread_sensitive" else None
+                result = self._run_asgi(company_id, batch, options["concurrency"], workers)
+            result.name = f"ledger.post.{mode}"
+            results.append(result.as_dict())
+
+        self.stdout.write(json.dumps({"company_id": str(company_id), "results": results}, sort_keys=True, default=str))
+
+    # =========================
+    # WSGI: one thread (and DB connection) per in-flight request
+    # =========================
+    def _run_wsgi(self, company_id, payloads: list[dict], concurrency: int) -> BenchResult:
+        factory = RequestFactory()
+        result = BenchResult(name="", extra={"concurrency": concurrency, "errors": 0})
+        lock = threading.Lock()
+        chunks = [payloads[n::concurrency] for n in range(concurrency)]
+
+        def worker(chunk: list[dict]) -> None:
+            set_active_scope(company_id=company_id)
+            latencies, errors = [], 0
+            try:
+                for payload in chunk:
+                    request = factory.post("/inventory/ledger/entries/", payload, content_type="application/json")
+                    started = time.perf_counter()
+                    response = views.ledger_entry_create(request)
+                    latencies.append((time.perf_counter() - started) * 1000.0)
+                    errors += response.status_code >= 400
+            finally:
+                clear_active_scope()
+                connections.close_all()
+            with lock:
+                result.latencies_ms.extend(latencies)
+                result.ops += len(latencies)
+                result.extra["errors"] += errors
+
+        threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    # =========================
+    # ASGI: one event loop, `concurrency` requests in flight
+    # =========================
+    def _run_asgi(self, company_id, payloads: list[dict], concurrency: int, workers: int | None) -> BenchResult:
+        factory = AsyncRequestFactory()
+        result = BenchResult(name="", extra={"concurrency": concurrency, "errors": 0})
+
+        async def one(payload: dict, gate: asyncio.Semaphore) -> None:
+            async with gate:
+                request = factory.post("/inventory/ledger/entries/async/", payload, content_type="application/json")
+                started = time.perf_counter()
+                response = await views.aledger_entry_create(request)
+                result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+                result.ops += 1
+                result.extra["errors"] += response.status_code >= 400
+
+        async def run() -> None:
+            set_active_scope(company_id=company_id)
+            gate = asyncio.Semaphore(concurrency)
+            await asyncio.gather(*(one(p, gate) for p in payloads))
+
+        overrides = {} if workers is None else {"LEDGER_ASYNC_WORKERS": workers}
+        with override_settings(**overrides):
+            started = time.perf_counter()
+            asyncio.run(run())
+            result.elapsed_s = time.perf_counter() - started
+        return result
+
+    def _setup(self, company_id, count: int) -> list[Part]:
+        parts = []
+        for i in range(count):
+            part = Part.objects.create(
+                company_id=company_id,
+                part_no=f"BENCH-{i:04d}",
+                name=f"Bench part {i}",
+                part_type=Part.PartType.RAW_MATERIAL,
+                procurement_strategy=Part.ProcurementStrategy.BUY,
+            )
+            # opening stock so OUT posts pass the negative-stock guard
+            StockLedgerEntry.objects.create(
+                company_id=company_id,
+                part=part,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal("100000"),
+                unit_cost=Decimal("10"),
+                source_ref={"bench": "ledger_asgi", "opening": True},
+            )
+            parts.append(part)
+        return parts
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.inventory.benchmarks import BenchResult
+from apps.inventory.models import Part, StockLedgerEntry
+from factory_manager.db_pool import pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrency benchmark: N threads posting ledger entries (IN/OUT mix), reporting p50/p95/p99 "
+        "post latency and pool metrics. Writes synthetic rows under a fresh company id: "
+        "run against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--posts", type=int, default=200, help="Ledger posts per thread.")
+        parser.add_argument("--parts", type=int, default=20)
+        parser.add_argument("--out-ratio", type=float, default=0.3, help="Share of OUT posts (negative-stock guard path).")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        company_id = uuid4()
+        parts = self._setup(company_id, options["parts"])
+
+        result = BenchResult(
+            name="ledger.post.concurrent",
+            extra={"threads": options["threads"], "company_id": str(company_id), "errors": 0},
+        )
+        lock = threading.Lock()
+
+        def worker(n: int) -> None:
+            rng = random.Random(options["seed"] + n)
+            latencies: list[float] = []
+            errors = 0
+            try:
+                for i in range(options["posts"]):
+                    is_out = rng.random() < options["out_ratio"]
+                    started = time.perf_counter()
+                    try:
+                        StockLedgerEntry.objects.create(
+                            company_id=company_id,
+                            part=rng.choice(parts),
+                            movement_type=StockLedgerEntry.MovementType.OUT if is_out else StockLedgerEntry.MovementType.IN,
+                            source_type=StockLedgerEntry.SourceType.PRODUCTION if is_out else StockLedgerEntry.SourceType.PURCHASE,
+                            qty=Decimal("1"),
+                            unit_cost=Decimal("10"),
+                            source_ref={"bench": "ledger_concurrency", "thread": n, "seq": i},
+                        )
+                    except Exception:
+                        errors += 1
+                    latencies.append((time.perf_counter() - started) * 1000.0)
+            finally:
+                connections.close_all()
+            with lock:
+                result.latencies_ms.extend(latencies)
+                result.ops += len(latencies)
+                result.extra["errors"] += errors
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(options["threads"])]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        result.elapsed_s = time.perf_counter() - started
+
+        result.extra["pool"] = pool_stats()
+        self.stdout.write(json.dumps(result.as_dict(), sort_keys=True, default=str))
+
+    def _setup(self, company_id, count: int) -> list[Part]:
+        parts = []
+        for i in range(count):
+            part = Part.objects.create(
+                company_id=company_id,
+                part_no=f"BENCH-{i:04d}",
+                name=f"Bench part {i}",
+                part_type=Part.PartType.RAW_MATERIAL,
+                procurement_strategy=Part.ProcurementStrategy.BUY,
+            )
+            # opening stock so OUT posts pass the negative-stock guard
+            StockLedgerEntry.objects.create(
+                company_id=company_id,
+                part=part,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal("100000"),
+                unit_cost=Decimal("10"),
+                source_ref={"bench": "ledger_concurrency", "opening": True},
+            )
+            parts.append(part)
+        return parts
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+
+from apps.inventory.benchmarks import BenchResult, rolled_back, timed
+from apps.inventory.importers import DEFAULT_BATCH_SIZE, import_parts
+from apps.inventory.models import Part
+
+
+_TYPES = (
+    (Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY),
+    (Part.PartType.CONSUMABLE, Part.ProcurementStrategy.BUY),
+    (Part.PartType.SEMI_FINISHED, Part.ProcurementStrategy.MAKE),
+    (Part.PartType.FINISHED_GOOD, Part.ProcurementStrategy.MAKE),
+)
+
+
+def _synthetic_records(n: int):
+    for i in range(n):
+        part_type, strategy = _TYPES[i % len(_TYPES)]
+        yield i + 2, {
+            "part_no": f"BENCH-{i:07d}",
+            "name": f"Bench part {i}",
+            "part_type": part_type,
+            "procurement_strategy": strategy,
+            "is_saleable": "1" if part_type == Part.PartType.FINISHED_GOOD else "0",
+            "standard_cost": "1.2500",
+        }
+
+
+class Command(BaseCommand):
+    help = "Throughput benchmark: bulk Part import pipeline vs per-row Part.save() (always rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=80_000)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--baseline-rows",
+            type=int,
+            default=1_000,
+            help="Rows for the per-row save() baseline (0 to skip).",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        results: list[BenchResult] = []
+
+        bulk = BenchResult(name="part_import.bulk", ops=rows)
+        with rolled_back(), timed(bulk):
+            outcome = import_parts(uuid4(), _synthetic_records(rows), batch_size=options["batch_size"])
+        bulk.extra["created"] = outcome.created
+        bulk.extra["errors"] = len(outcome.errors)
+        results.append(bulk)
+
+        baseline_rows = options["baseline_rows"]
+        if baseline_rows > 0:
+            baseline = BenchResult(name="part_import.per_row_save", ops=baseline_rows)
+            company_id = uuid4()
+            with rolled_back(), timed(baseline):
+                for _, data in _synthetic_records(baseline_rows):
+                    Part(company_id=company_id, **{**data, "is_saleable": data["is_saleable"] == "1"}).save()
+            results.append(baseline)
+
+        for r in results:
+            self.stdout.write(json.dumps(r.as_dict(), sort_keys=True))
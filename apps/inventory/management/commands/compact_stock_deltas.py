@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.stock_deltas import DEFAULT_COMPACT_BATCH_PARTS, compact
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold striped stock deltas (STOCK_SUMMARY_STRIPES > 0) into PartStockSummary, one transaction per batch "
+        "of parts. Run until drained, or keep running with --follow."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-parts", type=int, default=DEFAULT_COMPACT_BATCH_PARTS)
+        parser.add_argument("--company-id", type=str, help="Only this company.")
+        parser.add_argument("--follow", action="store_true", help="Keep compacting every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        if options["batch_parts"] <= 0:
+            raise CommandError("--batch-parts must be > 0")
+        company_id = UUID(options["company_id"]) if options["company_id"] else None
+
+        while True:
+            started = time.perf_counter()
+            parts = rows = 0
+            while True:
+                run = compact(batch_parts=options["batch_parts"], company_id=company_id)
+                parts += run.parts
+                rows += run.rows
+                if run.parts < options["batch_parts"]:
+                    break
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"OK: compacted parts={parts} delta_rows={rows} ms={(time.perf_counter() - started) * 1000.0:.1f}"
+                )
+            )
+            if not options["follow"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.importers import DEFAULT_BATCH_SIZE, IMPORT_FORMATS, detect_format, import_boms, iter_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import BOM trees (one row per BOM item: parent_part_no, revision_index, is_active, "
+        "component_part_no, qty_per, is_direct) with a single graph validation per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company-id", type=str, required=True, help="Company UUID.")
+        parser.add_argument("--file", type=str, required=True, help="Input file path.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, required=False)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; do not write.")
+        parser.add_argument(
+            "--errors-out",
+            type=str,
+            required=False,
+            help="Optional path for the per-row error report (JSON lines).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            company_id = UUID(options["company_id"])
+        except ValueError as exc:
+            raise CommandError(f"Invalid --company-id: {options['company_id']}") from exc
+
+        path = Path(options["file"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        fmt = detect_format(path, options.get("format"))
+
+        with path.open("r", encoding="utf-8", newline="") as fh:
+            result = import_boms(
+                company_id,
+                iter_records(fh, fmt),
+                dry_run=options["dry_run"],
+                batch_size=options["batch_size"],
+            )
+
+        errors_out = options.get("errors_out")
+        if errors_out:
+            with open(errors_out, "w", encoding="utf-8") as fh:
+                for err in result.errors:
+                    fh.write(json.dumps(err.as_dict(), ensure_ascii=False) + "\n")
+        else:
+            for err in result.errors[:50]:
+                self.stderr.write(f"line {err.line_no} [{err.key}]: {err.message}")
+            if len(result.errors) > 50:
+                self.stderr.write(f"... {len(result.errors) - 50} more errors (use --errors-out)")
+
+        summary = json.dumps(result.as_dict(), sort_keys=True)
+        if result.errors:
+            self.stdout.write(self.style.WARNING(f"DONE (with errors): {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"OK: {summary}"))
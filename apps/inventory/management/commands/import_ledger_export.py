@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.inventory.ledger_export import import_ledger_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Load an export_ledger directory into a scratch database (COPY FROM STDIN on PostgreSQL): parts, "
+        "ledger rows with their ids/sequences/timestamps, sequence heads. Checksums are verified; "
+        "all or nothing. Run rebuild_stock_summary afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", type=str, help="Export directory (with manifest.json).")
+        parser.add_argument("--database", type=str, default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            result = import_ledger_export(options["directory"], database=options["database"])
+        except (ValueError, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OK: imported rows={result.rows} parts={result.parts} companies={len(result.companies)} "
+                f"ms={(time.perf_counter() - started) * 1000.0:.1f}"
+            )
+        )
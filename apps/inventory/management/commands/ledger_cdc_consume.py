@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.inventory.cdc import LedgerListener, checkpoint_name, deliver, held_back_for, resolve_handler
+from apps.inventory.projections import pending_companies
+
+
+class Command(BaseCommand):
+    help = (
+        "Consume the ledger change feed: LISTEN for commit notifications, fetch new rows by sequence range "
+        "per company and pass them to a handler, advancing a per-consumer checkpoint (at-least-once). "
+        "Notifications need LEDGER_CDC_NOTIFY=1; without them the consumer falls back to --resync-seconds polling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--consumer", type=str, required=True, help="Consumer name (checkpoint key).")
+        parser.add_argument(
+            "--handler",
+            type=str,
+            default="jsonl",
+            help="Registered handler name or dotted path to callable(rows). Default: jsonl (stdout).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--window-ms", type=int, default=50, help="Collect notifications this long before fetching.")
+        parser.add_argument(
+            "--resync-seconds",
+            type=float,
+            default=30.0,
+            help=(
+                "Without notifications, re-check checkpoints this often (covers missed NOTIFYs). "
+                "Rows held back by the consumer horizon are re-polled as soon as they settle."
+            ),
+        )
+        parser.add_argument("--once", action="store_true", help="Catch up from checkpoints and exit (no LISTEN).")
+
+    def handle(self, *args, **options):
+        consumer = options["consumer"]
+        if len(checkpoint_name(consumer)) > 64:
+            raise CommandError("--consumer is too long (max 60 characters)")
+        try:
+            handler = resolve_handler(options["handler"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        def catch_up(company_ids) -> int:
+            return sum(deliver(consumer, handler, cid, batch_size=options["batch_size"]) for cid in company_ids)
+
+        # NOTIFY is not durable: always start from the checkpoints
+        delivered = catch_up(pending_companies(checkpoint_name(consumer)))
+        self.stderr.write(f"CDC {consumer}: caught up rows={delivered}")
+        if options["once"]:
+            return
+
+        if connections[DEFAULT_DB_ALIAS].vendor != "postgresql":
+            raise CommandError("LISTEN requires PostgreSQL (use --once to catch up on other backends)")
+
+        window = options["window_ms"] / 1000.0
+        # companies whose next row is still in the holdback window => seconds until it settles
+        held: dict = {}
+
+        def hold(company_ids) -> None:
+            for cid in company_ids:
+                delay = held_back_for(consumer, cid)
+                if delay is None:
+                    held.pop(cid, None)
+                else:
+                    held[cid] = max(delay, window)
+
+        hold(pending_companies(checkpoint_name(consumer)))
+        with LedgerListener() as listener:
+            self.stderr.write(f"CDC {consumer}: listening on {listener.channel}")
+            while True:
+                timeout = min([options["resync_seconds"], *held.values()])
+                changes = listener.poll(timeout=timeout, window=window)
+                started = time.perf_counter()
+                if changes:
+                    company_ids = sorted({c.company_id for c in changes} | held.keys())
+                else:
+                    company_ids = sorted(set(pending_companies(checkpoint_name(consumer))) | held.keys())
+                delivered = catch_up(company_ids)
+                # a notified row younger than the holdback: re-poll when it settles, not at --resync-seconds
+                hold(company_ids)
+                if delivered:
+                    self.stderr.write(
+                        f"CDC {consumer}: rows={delivered} companies={len(company_ids)} "
+                        f"notifications={len(changes)} ms={(time.perf_counter() - started) * 1000.0:.1f}"
+                    )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.bom_index import rebuild_effective_bom
+
+
+class Command(BaseCommand):
+    help = "Rebuild the effective BOM edge index (live edges of active BOM revisions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company-id",
+            type=str,
+            required=False,
+            help="Optional company UUID to rebuild only one company.",
+        )
+
+    def handle(self, *args, **options):
+        company_id = options.get("company_id")
+        if company_id:
+            try:
+                company_id = UUID(company_id)
+            except ValueError as exc:
+                raise CommandError(f"Invalid --company-id: {company_id}") from exc
+
+        written = rebuild_effective_bom(company_id)
+        self.stdout.write(self.style.SUCCESS(f"OK: effective BOM index rebuilt ({written} edges)"))
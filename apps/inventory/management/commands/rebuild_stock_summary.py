@@ -1,23 +1,122 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
 from decimal import Decimal, ROUND_HALF_UP
+from itertools import islice
+from uuid import UUID
 
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from apps.inventory.constants import StockMovementType, StockSourceType
 from apps.inventory.models import PartStockSummary, StockLedgerEntry
+from apps.inventory.stock_deltas import delete_deltas, lock_deltas
+from factory_manager.db_routing import replica_reads
+from factory_manager.query_budget import query_budget
 
 
 Q = Decimal("0.0001")
 
+# Summary rows written per round-trip (lock summaries + lock stripes + ledger
+# aggregate + one bulk UPDATE + one bulk INSERT + one DELETE of the locked stripes)
+WRITE_CHUNK_SIZE = 500
+CHUNK_QUERY_BUDGET = 6
+
+SUMMARY_FIELDS = ("available_qty", "weighted_avg_cost", "last_purchase_cost", "last_production_cost", "updated_at")
+
 
 def _q(d: Decimal) -> Decimal:
     return d.quantize(Q, rounding=ROUND_HALF_UP)
 
 
+def _last_in_cost(source_type: str) -> Subquery:
+    """
+    unit_cost of the latest IN of `source_type` for the grouped (company, part) row.
+    Correlated subquery: no per-part round-trip (was N+1 x 2).
+    """
+    return Subquery(
+        StockLedgerEntry.objects.filter(
+            company_id=OuterRef("company_id"),
+            part_id=OuterRef("part_id"),
+            movement_type=StockMovementType.IN,
+            source_type=source_type,
+        )
+        .order_by("-created_at")
+        .values("unit_cost")[:1]
+    )
+
+
+def _ledger_figures(qs):
+    """
+    Per-part ledger aggregate: IN / OUT / adjustment qty, IN value, last IN costs.
+    """
+    return (
+        qs.values("company_id", "part_id")
+        .annotate(
+            in_qty=Coalesce(
+                Sum(
+                    Case(
+                        When(movement_type=StockMovementType.IN, then=F("qty")),
+                        default=Value(Decimal("0")),
+                        output_field=DecimalField(),
+                    )
+                ),
+                Value(Decimal("0")),
+            ),
+            out_qty=Coalesce(
+                Sum(
+                    Case(
+                        When(movement_type=StockMovementType.OUT, then=F("qty")),
+                        default=Value(Decimal("0")),
+                        output_field=DecimalField(),
+                    )
+                ),
+                Value(Decimal("0")),
+            ),
+            adj_qty=Coalesce(
+                Sum(
+                    Case(
+                        When(movement_type=StockMovementType.ADJUSTMENT, then=F("qty")),
+                        default=Value(Decimal("0")),
+                        output_field=DecimalField(),
+                    )
+                ),
+                Value(Decimal("0")),
+            ),
+            in_value=Coalesce(
+                Sum(
+                    Case(
+                        When(movement_type=StockMovementType.IN, then=F("transaction_value")),
+                        default=Value(Decimal("0")),
+                        output_field=DecimalField(),
+                    )
+                ),
+                Value(Decimal("0")),
+            ),
+            last_purchase=_last_in_cost(StockSourceType.PURCHASE),
+            last_production=_last_in_cost(StockSourceType.PRODUCTION),
+        )
+    )
+
+
+def _parse_part_ids(raw: str | None) -> list[UUID] | None:
+    if not raw:
+        return None
+    try:
+        return [UUID(v.strip()) for v in raw.split(",") if v.strip()]
+    except ValueError as exc:
+        raise CommandError(f"Invalid --part-ids: {raw}") from exc
+
+
+def _chunks(iterable, size: int):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
 class Command(BaseCommand):
     help = "Rebuild PartStockSummary from append-only StockLedgerEntry (deterministic, WAC-only)."
 
@@ -28,115 +127,91 @@ class Command(BaseCommand):
             required=False,
             help="Optional company UUID to rebuild only one company.",
         )
+        parser.add_argument(
+            "--part-ids",
+            type=str,
+            required=False,
+            help="Optional comma-separated part UUIDs to rebuild only those parts.",
+        )
+        parser.add_argument(
+            "--read-replica",
+            action="store_true",
+            help=(
+                "List the parts to rebuild from the read replica (if configured and fresh). The ledger figures "
+                "written are always aggregated on the primary, under the summary locks."
+            ),
+        )
 
     @transaction.atomic
     def handle(self, *args, **options):
         self.stdout.write("CANARY: rebuild_stock_summary started")
 
         company_id = options.get("company_id")
+        part_ids = _parse_part_ids(options.get("part_ids"))
 
         qs = StockLedgerEntry.objects.all()
         if company_id:
             qs = qs.filter(company_id=company_id)
-
-        base = (
-            qs.values("company_id", "part_id")
-            .annotate(
-                in_qty=Coalesce(
-                    Sum(
-                        Case(
-                            When(movement_type=StockMovementType.IN, then=F("qty")),
-                            default=Value(Decimal("0")),
-                            output_field=DecimalField(),
-                        )
-                    ),
-                    Value(Decimal("0")),
-                ),
-                out_qty=Coalesce(
-                    Sum(
-                        Case(
-                            When(movement_type=StockMovementType.OUT, then=F("qty")),
-                            default=Value(Decimal("0")),
-                            output_field=DecimalField(),
-                        )
-                    ),
-                    Value(Decimal("0")),
-                ),
-                adj_qty=Coalesce(
-                    Sum(
-                        Case(
-                            When(movement_type=StockMovementType.ADJUSTMENT, then=F("qty")),
-                            default=Value(Decimal("0")),
-                            output_field=DecimalField(),
-                        )
-                    ),
-                    Value(Decimal("0")),
-                ),
-                in_value=Coalesce(
-                    Sum(
-                        Case(
-                            When(movement_type=StockMovementType.IN, then=F("transaction_value")),
-                            default=Value(Decimal("0")),
-                            output_field=DecimalField(),
-                        )
-                    ),
-                    Value(Decimal("0")),
-                ),
-            )
-        )
+        if part_ids is not None:
+            qs = qs.filter(part_id__in=part_ids)
+        keys = qs.order_by("company_id", "part_id").values_list("company_id", "part_id").distinct()
 
         total = 0
         updated = 0
 
-        for row in base.iterator():
-            total += 1
-            c_id = row["company_id"]
-            p_id = row["part_id"]
+        # replica: part enumeration only (a lagging aggregate must never be written)
+        reads = replica_reads() if options.get("read_replica") else nullcontext()
+        with reads:
+            for chunk in _chunks(keys.iterator(chunk_size=WRITE_CHUNK_SIZE), WRITE_CHUNK_SIZE):
+                total += len(chunk)
+                with query_budget(CHUNK_QUERY_BUDGET, name="rebuild_stock_summary.chunk"):
+                    updated += self._write_chunk(chunk)
 
-            available_qty = (row["in_qty"] - row["out_qty"]) + row["adj_qty"]
+        self.stdout.write(self.style.SUCCESS(f"OK: rebuilt PartStockSummary. total_parts={total} updated={updated}"))
 
+    def _write_chunk(self, keys: list[tuple]) -> int:
+        """
+        Rebuild one chunk of parts on the primary: lock the summaries and the
+        striped deltas, aggregate the ledger after locking, bulk update / insert,
+        then delete exactly the locked stripe rows (now folded into the result).
+        """
+        db = router.db_for_write(PartStockSummary)
+        now = timezone.now()
+        part_ids = [part_id for _, part_id in keys]
+
+        existing = {
+            (s.company_id, s.part_id): s
+            for s in PartStockSummary.objects.using(db)
+            .select_for_update()
+            .filter(company_id__in={company_id for company_id, _ in keys}, part_id__in=part_ids)
+            .order_by("part_id")
+        }
+        delta_ids = lock_deltas(part_ids, using=db)
+        rows = list(_ledger_figures(StockLedgerEntry.objects.using(db).filter(part_id__in=part_ids)))
+
+        to_update: list[PartStockSummary] = []
+        to_create: list[PartStockSummary] = []
+        for row in rows:
             in_qty = row["in_qty"]
-            in_value = row["in_value"]
-
-            if in_qty and in_qty != Decimal("0"):
-                wac = _q(in_value / in_qty)
-            else:
-                wac = Decimal("0")
-
-            last_purchase = (
-                qs.filter(
-                    company_id=c_id,
-                    part_id=p_id,
-                    movement_type=StockMovementType.IN,
-                    source_type=StockSourceType.PURCHASE,
-                )
-                .order_by("-created_at")
-                .values_list("unit_cost", flat=True)
-                .first()
-            )
-
-            last_production = (
-                qs.filter(
-                    company_id=c_id,
-                    part_id=p_id,
-                    movement_type=StockMovementType.IN,
-                    source_type=StockSourceType.PRODUCTION,
-                )
-                .order_by("-created_at")
-                .values_list("unit_cost", flat=True)
-                .first()
-            )
-
-            PartStockSummary.objects.update_or_create(
-                company_id=c_id,
-                part_id=p_id,
-                defaults={
-                    "available_qty": available_qty,
-                    "weighted_avg_cost": wac,
-                    "last_purchase_cost": last_purchase or None,
-                    "last_production_cost": last_production or None,
-                },
-            )
-            updated += 1
-
-        self.stdout.write(self.style.SUCCESS(f"OK: rebuilt PartStockSummary. total_parts={total} updated={updated}"))
+            values = {
+                "available_qty": (in_qty - row["out_qty"]) + row["adj_qty"],
+                "weighted_avg_cost": _q(row["in_value"] / in_qty) if in_qty and in_qty != Decimal("0") else Decimal("0"),
+                "last_purchase_cost": row["last_purchase"] or None,
+                "last_production_cost": row["last_production"] or None,
+                "updated_at": now,
+            }
+
+            summary = existing.get((row["company_id"], row["part_id"]))
+            if summary is None:
+                to_create.append(PartStockSummary(company_id=row["company_id"], part_id=row["part_id"], **values))
+                continue
+            for name, value in values.items():
+                setattr(summary, name, value)
+            to_update.append(summary)
+
+        if to_update:
+            PartStockSummary.objects.using(db).bulk_update(to_update, SUMMARY_FIELDS, batch_size=WRITE_CHUNK_SIZE)
+        if to_create:
+            PartStockSummary.objects.using(db).bulk_create(to_create, batch_size=WRITE_CHUNK_SIZE)
+        delete_deltas(delta_ids, using=db)
+        return len(rows)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal, InvalidOperation
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.inventory.ledger_sequence import settled_horizon
+from apps.inventory.models import PartStockSummary, StockLedgerEntry
+from apps.inventory.stock_deltas import delete_deltas, lock_deltas
+from apps.inventory.wac_replay import REPLAYED_FIELDS, find_divergences, replay_wac
+
+APPLY_CHUNK_PARTS = 500
+
+
+def _parse_overrides(values: list[str] | None) -> dict[UUID, Decimal]:
+    overrides: dict[UUID, Decimal] = {}
+    for raw in values or []:
+        try:
+            entry_id, cost = raw.split("=", 1)
+            overrides[UUID(entry_id.strip())] = Decimal(cost.strip())
+        except (ValueError, InvalidOperation) as exc:
+            raise CommandError(f"Invalid --cost-override '{raw}' (expected ENTRY_ID=UNIT_COST)") from exc
+    return overrides
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the ledger with on_ledger_insert() semantics (true moving-average WAC, exact scaled integers) "
+        "and report parts whose PartStockSummary diverges. --apply writes the replayed values; "
+        "--cost-override / --exclude-entry run a what-if replay (report only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company-id", type=str)
+        parser.add_argument("--part-ids", type=str, help="Comma-separated part UUIDs.")
+        parser.add_argument("--cost-override", action="append", help="What-if: ENTRY_ID=UNIT_COST (repeatable).")
+        parser.add_argument("--exclude-entry", action="append", help="What-if: ignore this ledger entry id (repeatable).")
+        parser.add_argument("--format", choices=("text", "jsonl"), default="text")
+        parser.add_argument("--apply", action="store_true", help="Overwrite diverging summaries with replayed values.")
+        parser.add_argument("--fail-on-divergence", action="store_true", help="Exit non-zero if anything diverges.")
+
+    def handle(self, *args, **options):
+        try:
+            company_id = UUID(options["company_id"]) if options["company_id"] else None
+            part_ids = [UUID(v.strip()) for v in options["part_ids"].split(",") if v.strip()] if options["part_ids"] else None
+            excluded = [UUID(v) for v in options["exclude_entry"] or []]
+        except ValueError as exc:
+            raise CommandError(f"Invalid UUID: {exc}") from exc
+        overrides = _parse_overrides(options["cost_override"])
+        what_if = bool(overrides or excluded)
+        if what_if and options["apply"]:
+            raise CommandError("--apply cannot be combined with what-if options")
+
+        replays = replay_wac(
+            company_id=company_id,
+            part_ids=part_ids,
+            cost_overrides=overrides,
+            exclude_entry_ids=excluded,
+        )
+
+        diverged = 0
+        negative = 0
+        to_apply = []
+        for replay, diffs in find_divergences(replays):
+            diverged += 1
+            negative += replay.negative_at_sequence is not None
+            to_apply.append(replay)
+            self._report(replay, diffs, options["format"])
+
+        applied, held = self._apply(to_apply) if options["apply"] and to_apply else (0, 0)
+
+        label = "WHAT-IF" if what_if else "OK"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: diverged_parts={diverged} negative_history={negative} applied={applied} held={held}"
+            )
+        )
+        if diverged and options["fail_on_divergence"] and not options["apply"]:
+            raise CommandError(f"{diverged} part(s) diverge from the ledger replay")
+
+    def _report(self, replay, diffs, fmt: str) -> None:
+        if fmt == "jsonl":
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "company_id": str(replay.company_id),
+                        "part_id": str(replay.part_id),
+                        "entries": replay.entries,
+                        "negative_at_sequence": replay.negative_at_sequence,
+                        "diffs": {d.field: {"summary": d.summary, "replayed": d.replayed} for d in diffs},
+                    },
+                    default=str,
+                    sort_keys=True,
+                )
+            )
+            return
+        fields = " ".join(f"{d.field}={d.summary}->{d.replayed}" for d in diffs)
+        self.stdout.write(f"DIVERGED part={replay.part_id} entries={replay.entries} {fields}")
+
+    def _apply(self, replays) -> tuple[int, int]:
+        """
+        Re-replay and write the diverging parts in chunks, each under its locks:
+        the report scan above ran without locks, so anything posted since is
+        picked up here instead of being overwritten. Parts with rows inside the
+        consumer holdback window are skipped (held); run again later.
+        """
+        keys = sorted({(r.company_id, r.part_id) for r in replays}, key=lambda k: k[1])
+        applied = held = 0
+        for i in range(0, len(keys), APPLY_CHUNK_PARTS):
+            chunk_applied, chunk_held = self._apply_chunk(keys[i : i + APPLY_CHUNK_PARTS])
+            applied += chunk_applied
+            held += chunk_held
+        return applied, held
+
+    @transaction.atomic
+    def _apply_chunk(self, keys: list[tuple[UUID, UUID]]) -> tuple[int, int]:
+        # same order as the write path: part locks, summaries, stripes
+        for company_id, part_id in keys:
+            StockLedgerEntry(company_id=company_id, part_id=part_id)._acquire_part_xact_lock()
+        part_ids = [part_id for _, part_id in keys]
+
+        horizon = settled_horizon()
+        if horizon is not None:
+            unsettled = set(
+                StockLedgerEntry.objects.filter(
+                    company_id__in={company_id for company_id, _ in keys}, part_id__in=part_ids, created_at__gt=horizon
+                )
+                .values_list("part_id", flat=True)
+                .distinct()
+            )
+            part_ids = [part_id for part_id in part_ids if part_id not in unsettled]
+        held = len(keys) - len(part_ids)
+        if not part_ids:
+            return 0, held
+
+        existing = {
+            s.part_id: s for s in PartStockSummary.objects.select_for_update().filter(part_id__in=part_ids).order_by("part_id")
+        }
+        delta_ids = lock_deltas(part_ids)
+
+        now = timezone.now()
+        to_update, to_create = [], []
+        for replay in replay_wac(part_ids=part_ids):
+            values = {name: getattr(replay, name) for name in REPLAYED_FIELDS}
+            summary = existing.get(replay.part_id)
+            if summary is None:
+                to_create.append(PartStockSummary(company_id=replay.company_id, part_id=replay.part_id, **values))
+                continue
+            for name, value in values.items():
+                setattr(summary, name, value)
+            summary.updated_at = now
+            to_update.append(summary)
+        PartStockSummary.objects.bulk_update(to_update, [*REPLAYED_FIELDS, "updated_at"], batch_size=APPLY_CHUNK_PARTS)
+        PartStockSummary.objects.bulk_create(to_create, batch_size=APPLY_CHUNK_PARTS)
+        # replayed available_qty is absolute: the locked stripes are now included
+        delete_deltas(delta_ids)
+        return len(to_update) + len(to_create), held
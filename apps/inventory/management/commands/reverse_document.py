@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.reversals import reverse_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Reverse all ledger rows of a document in one batch (D-3.28 rules). Select by exact --source-ref "
+        "JSON match or by --ids / --ids-file. All or nothing; --dry-run validates without writing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company", type=str, required=True, help="Company UUID.")
+        parser.add_argument("--source-ref", type=str, help='Exact source_ref JSON, e.g. \'{"doc": "GR-1001"}\'.')
+        parser.add_argument("--ids", type=str, help="Comma-separated ledger entry ids.")
+        parser.add_argument("--ids-file", type=str, help="File with one ledger entry id per line.")
+        parser.add_argument("--reason", type=str, required=True, help="Stored on every reverse row and in the audit event.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            company_id = UUID(options["company"])
+        except ValueError as exc:
+            raise CommandError("--company must be a UUID") from exc
+
+        selectors = [k for k in ("source_ref", "ids", "ids_file") if options[k]]
+        if len(selectors) != 1:
+            raise CommandError("Pass exactly one of --source-ref, --ids, --ids-file")
+
+        source_ref = entry_ids = None
+        try:
+            if options["source_ref"]:
+                source_ref = json.loads(options["source_ref"])
+                if not isinstance(source_ref, dict):
+                    raise CommandError("--source-ref must be a JSON object")
+            elif options["ids"]:
+                entry_ids = [UUID(i.strip()) for i in options["ids"].split(",") if i.strip()]
+            else:
+                lines = Path(options["ids_file"]).read_text(encoding="utf-8").splitlines()
+                entry_ids = [UUID(line.strip()) for line in lines if line.strip()]
+        except (json.JSONDecodeError, ValueError, OSError) as exc:
+            raise CommandError(f"Invalid selector: {exc}") from exc
+
+        try:
+            result = reverse_document(
+                company_id,
+                source_ref=source_ref,
+                entry_ids=entry_ids,
+                reason=options["reason"],
+                dry_run=options["dry_run"],
+            )
+        except ValidationError as exc:
+            raise CommandError("; ".join(exc.messages)) from exc
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"DRY-RUN OK: entries={len(result.entries)} parts={len(result.deltas)}")
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OK: reversed entries={len(result.entries)} parts={len(result.deltas)} "
+                f"sequences={result.sequences[0]}..{result.sequences[-1]}"
+            )
+        )
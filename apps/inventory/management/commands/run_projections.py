@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.projections import DEFAULT_BATCH_SIZE, PROJECTIONS, catch_up, replay
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply new StockLedgerEntry rows to registered projections in batches (per-company sequence checkpoints). "
+        "--replay rebuilds from an empty read model; --follow keeps catching up live."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--projection",
+            action="append",
+            help="Projection name (repeatable). Default: all registered projections.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--replay", action="store_true", help="Reset the read model(s) and replay the full ledger.")
+        parser.add_argument("--follow", action="store_true", help="Keep polling for new ledger rows.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls with --follow.")
+
+    def handle(self, *args, **options):
+        names = options["projection"] or sorted(PROJECTIONS)
+        unknown = [n for n in names if n not in PROJECTIONS]
+        if unknown:
+            raise CommandError(f"Unknown projection(s): {', '.join(unknown)}. Registered: {', '.join(sorted(PROJECTIONS))}")
+        if options["replay"] and options["follow"]:
+            raise CommandError("--replay and --follow are mutually exclusive")
+
+        batch_size = options["batch_size"]
+        if options["replay"]:
+            for name in names:
+                run = replay(name, batch_size=batch_size)
+                self.stdout.write(self.style.SUCCESS(f"OK: replayed {name} rows={run.rows} batches={run.batches}"))
+            return
+
+        while True:
+            for name in names:
+                run = catch_up(name, batch_size=batch_size)
+                if run.rows or not options["follow"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"OK: {name} rows={run.rows} batches={run.batches} companies={run.companies}"
+                        )
+                    )
+            if not options["follow"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.reports import DEFAULT_CHUNK_SIZE, VALUATION_FORMATS, VALUATION_GROUPS, render_valuation
+
+
+class Command(BaseCommand):
+    help = "Stream the inventory valuation report (PartStockSummary x Part) as CSV or JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--company-id", type=str, required=True, help="Company UUID.")
+        parser.add_argument("--format", choices=VALUATION_FORMATS, default="csv")
+        parser.add_argument("--group-by", choices=VALUATION_GROUPS, default="part")
+        parser.add_argument(
+            "--output",
+            type=str,
+            required=False,
+            help="Optional output file path (default: stdout).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            company_id = UUID(options["company_id"])
+        except ValueError as exc:
+            raise CommandError(f"Invalid --company-id: {options['company_id']}") from exc
+
+        chunks = render_valuation(
+            company_id,
+            fmt=options["format"],
+            group_by=options["group_by"],
+            chunk_size=options["chunk_size"],
+        )
+
+        output = options.get("output")
+        if output:
+            with open(output, "w", encoding="utf-8", newline="") as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f"OK: valuation report written to {output}"))
+            return
+
+        for chunk in chunks:
+            self.stdout.write(chunk, ending="")
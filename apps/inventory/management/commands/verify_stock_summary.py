@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.stock_audit import (
+    company_shard,
+    compare_parts,
+    compare_wac,
+    confirmed,
+    emit_mismatch_events,
+    known_companies,
+    sample_summary_parts,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Check PartStockSummary against the ledger with set-based queries. sampled (default): a random "
+        "~N percent of summary rows, cheap enough for every few minutes. full: every part, company by company "
+        "(--shard/--shards to split runs). One audit event per confirmed mismatch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=("sampled", "full"), default="sampled")
+        parser.add_argument("--sample-percent", type=float, default=1.0, help="sampled: share of summary rows.")
+        parser.add_argument("--company-id", type=str, help="full: only this company.")
+        parser.add_argument("--shard", type=int, default=0)
+        parser.add_argument("--shards", type=int, default=1)
+        parser.add_argument(
+            "--check-wac",
+            action="store_true",
+            help="full: also compare weighted_avg_cost with an exact ledger replay (streams the ledger).",
+        )
+        parser.add_argument("--no-audit", action="store_true", help="Report only; do not emit audit events.")
+        parser.add_argument("--fail-on-mismatch", action="store_true", help="Exit non-zero on any mismatch.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        mode = options["mode"]
+        if mode == "sampled" and (options["company_id"] or options["check_wac"] or options["shards"] != 1):
+            raise CommandError("--company-id / --shard(s) / --check-wac apply to --mode full")
+
+        mismatches = []
+        parts_checked = 0
+        try:
+            if mode == "sampled":
+                for company_id, part_ids in sample_summary_parts(options["sample_percent"]).items():
+                    parts_checked += len(part_ids)
+                    mismatches += compare_parts(company_id, part_ids)
+                companies = None
+            else:
+                companies = (
+                    [UUID(options["company_id"])]
+                    if options["company_id"]
+                    else company_shard(known_companies(), options["shard"], options["shards"])
+                )
+                for company_id in companies:
+                    mismatches += compare_parts(company_id)
+                    if options["check_wac"]:
+                        mismatches += compare_wac(company_id)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        mismatches = confirmed(mismatches)
+        for m in mismatches:
+            self.stdout.write(
+                f"MISMATCH company={m.company_id} part={m.part_id} {m.field} "
+                f"summary={m.summary_value} ledger={m.ledger_value}"
+            )
+        emitted = 0 if options["no_audit"] else emit_mismatch_events(mismatches, mode=mode)
+
+        scope = f"parts={parts_checked}" if companies is None else f"companies={len(companies)}"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OK: mode={mode} {scope} mismatches={len(mismatches)} audit_events={emitted} "
+                f"ms={(time.perf_counter() - started) * 1000.0:.1f}"
+            )
+        )
+        if mismatches and options["fail_on_mismatch"]:
+            raise CommandError(f"{len(mismatches)} stock summary mismatch(es)")
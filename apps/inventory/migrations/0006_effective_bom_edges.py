@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:25
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Effective BOM index.
+
+    - At most one active revision per parent part (partial unique index on is_active).
+      Existing duplicates are resolved first: the highest revision_index stays active.
+    - Denormalised live edge table populated from active revisions.
+    """
+
+    dependencies = [
+        ('inventory', '0005_stockledgerentry_reverse_of_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EffectiveBOMEdge',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('company_id', models.UUIDField()),
+                ('qty_per', models.DecimalField(decimal_places=6, max_digits=18)),
+                ('is_direct', models.BooleanField(default=True)),
+            ],
+            options={
+                'db_table': 'inventory_effective_bom_edges',
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+            WITH ranked AS (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY company_id, parent_part_id
+                        ORDER BY revision_index DESC, created_at DESC, id DESC
+                    ) AS rn
+                FROM inventory_boms
+                WHERE is_active
+            )
+            UPDATE inventory_boms b
+            SET is_active = FALSE
+            FROM ranked r
+            WHERE b.id = r.id AND r.rn > 1;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='bom',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('company_id', 'parent_part'), name='uq_inventory_bom_one_active_per_parent'),
+        ),
+        migrations.AddField(
+            model_name='effectivebomedge',
+            name='bom',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_edges', to='inventory.bom'),
+        ),
+        migrations.AddField(
+            model_name='effectivebomedge',
+            name='bom_item',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='effective_edge', to='inventory.bomitem'),
+        ),
+        migrations.AddField(
+            model_name='effectivebomedge',
+            name='component_part',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='inventory.part'),
+        ),
+        migrations.AddField(
+            model_name='effectivebomedge',
+            name='parent_part',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='inventory.part'),
+        ),
+        migrations.AddIndex(
+            model_name='effectivebomedge',
+            index=models.Index(fields=['company_id', 'parent_part', 'component_part'], name='ix_inv_effbom_company_edge'),
+        ),
+        migrations.AddIndex(
+            model_name='effectivebomedge',
+            index=models.Index(fields=['company_id', 'component_part'], name='ix_inv_effbom_company_comp'),
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO inventory_effective_bom_edges
+                (id, company_id, parent_part_id, component_part_id, bom_id, bom_item_id, qty_per, is_direct)
+            SELECT
+                gen_random_uuid(), i.company_id, b.parent_part_id, i.component_part_id, b.id, i.id, i.qty_per, i.is_direct
+            FROM inventory_bom_items i
+            JOIN inventory_boms b ON b.id = i.bom_id
+            WHERE b.is_active;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_effective_bom_edges'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockledgerentry',
+            index=models.Index(fields=['created_at', 'id'], name='inventory_s_created_fc56a5_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:43
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0007_ledger_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectionCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('last_created_at', models.DateTimeField(blank=True, null=True)),
+                ('last_entry_id', models.UUIDField(blank=True, null=True)),
+                ('rows_applied', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'inventory_projection_checkpoints',
+            },
+        ),
+        migrations.CreateModel(
+            name='PartSourceMovementTotal',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('company_id', models.UUIDField()),
+                ('source_type', models.CharField(choices=[('purchase', 'purchase'), ('production', 'production'), ('sales', 'sales'), ('adjustment', 'adjustment'), ('subcontracting_send', 'subcontracting_send'), ('subcontracting_receive', 'subcontracting_receive')], max_length=32)),
+                ('movement_type', models.CharField(choices=[('in', 'in'), ('out', 'out'), ('adjustment', 'adjustment')], max_length=16)),
+                ('qty_total', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=24)),
+                ('value_total', models.DecimalField(decimal_places=4, default=Decimal('0'), max_digits=24)),
+                ('entry_count', models.BigIntegerField(default=0)),
+                ('last_entry_at', models.DateTimeField(blank=True, null=True)),
+                ('part', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='inventory.part')),
+            ],
+            options={
+                'db_table': 'inventory_part_source_movement_totals',
+                'indexes': [models.Index(fields=['company_id', 'source_type'], name='inventory_p_company_3b9cb1_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company_id', 'part', 'source_type', 'movement_type'), name='uq_inventory_srcmove_company_part_src_mv')],
+            },
+        ),
+    ]
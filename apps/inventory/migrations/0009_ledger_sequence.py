@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_projections'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerSequence',
+            fields=[
+                ('company_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'inventory_ledger_sequences',
+            },
+        ),
+        migrations.AddField(
+            model_name='stockledgerentry',
+            name='sequence',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        # Backfill: historical order = (created_at, id) per company; new rows get the counter.
+        migrations.RunSQL(
+            sql="""
+            UPDATE inventory_stock_ledger
+            SET sequence = ranked.seq
+            FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (PARTITION BY company_id ORDER BY created_at, id) AS seq
+                FROM inventory_stock_ledger
+            ) AS ranked
+            WHERE inventory_stock_ledger.id = ranked.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql="""
+            INSERT INTO inventory_ledger_sequences (company_id, last_value)
+            SELECT company_id, MAX(sequence)
+            FROM inventory_stock_ledger
+            GROUP BY company_id;
+            """,
+            reverse_sql="DELETE FROM inventory_ledger_sequences;",
+        ),
+        # Projection checkpoints move from (created_at, id) to per-company sequence:
+        # drop derived state; the next run_projections replays from sequence 0.
+        migrations.RunSQL(
+            sql="""
+            DELETE FROM inventory_projection_checkpoints;
+            DELETE FROM inventory_part_source_movement_totals;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RemoveField(
+            model_name='projectioncheckpoint',
+            name='last_created_at',
+        ),
+        migrations.RemoveField(
+            model_name='projectioncheckpoint',
+            name='last_entry_id',
+        ),
+        migrations.AlterField(
+            model_name='projectioncheckpoint',
+            name='name',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddField(
+            model_name='projectioncheckpoint',
+            name='company_id',
+            field=models.UUIDField(default=uuid.uuid4),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='projectioncheckpoint',
+            name='last_sequence',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='projectioncheckpoint',
+            constraint=models.UniqueConstraint(fields=('name', 'company_id'), name='uq_inventory_projcp_name_company'),
+        ),
+    ]
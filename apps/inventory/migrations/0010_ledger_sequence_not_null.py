@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Separate from 0009 so the backfill UPDATE commits before the ALTER TABLE
+    (PostgreSQL rejects ALTER with pending deferred trigger events on the table).
+    """
+
+    dependencies = [
+        ('inventory', '0009_ledger_sequence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockledgerentry',
+            name='sequence',
+            field=models.BigIntegerField(blank=True, editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name='stockledgerentry',
+            constraint=models.UniqueConstraint(fields=('company_id', 'sequence'), name='uq_inventory_ledger_company_sequence'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_ledger_sequence_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartStockDelta',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('company_id', models.UUIDField()),
+                ('stripe', models.PositiveSmallIntegerField()),
+                ('qty_delta', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=18)),
+                ('part', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='inventory.part')),
+            ],
+            options={
+                'db_table': 'inventory_part_stock_deltas',
+                'constraints': [models.UniqueConstraint(fields=('company_id', 'part', 'stripe'), name='uq_inventory_stockdelta_part_stripe')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_part_stock_deltas'),
+    ]
+
+    operations = [
+        # covering index first: (company_id, part, created_at) lookups keep an index throughout
+        migrations.AddIndex(
+            model_name='stockledgerentry',
+            index=models.Index(fields=['company_id', 'part', 'created_at', 'id'], include=('movement_type', 'source_type', 'qty', 'unit_cost', 'sequence', 'reverse_of'), name='ix_inventory_ledger_history'),
+        ),
+        migrations.RemoveIndex(
+            model_name='stockledgerentry',
+            name='inventory_s_company_74d290_idx',
+        ),
+    ]
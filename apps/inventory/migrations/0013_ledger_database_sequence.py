@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+def create_sequence(apps, schema_editor):
+    # PostgreSQL only: other vendors keep allocating from the counter rows.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE SEQUENCE IF NOT EXISTS inventory_ledger_sequence_seq AS bigint;")
+    # start above every per-company head: new numbers stay increasing per company
+    schema_editor.execute(
+        """
+        SELECT setval(
+            'inventory_ledger_sequence_seq',
+            COALESCE((SELECT MAX(sequence) FROM inventory_stock_ledger), 0) + 1,
+            false
+        );
+        """
+    )
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP SEQUENCE IF EXISTS inventory_ledger_sequence_seq;")
+
+
+class Migration(migrations.Migration):
+    """
+    Gap-aware StockLedgerEntry.sequence (apps.inventory.ledger_sequence): numbers
+    come from one database sequence instead of the per-company counter row,
+    whose lock serialised a company's inserts until commit.
+    """
+
+    dependencies = [
+        ('inventory', '0012_ledger_history_covering_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
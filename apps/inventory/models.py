@@ -10,7 +10,14 @@ from django.db.models import Case, DecimalField, Sum, Value, When
 from django.db.models.functions import Coalesce
 
 from apps.audit.hooks import emit_audit_event
-from apps.inventory.guards import assert_max_depth, assert_no_circular_bom
+from apps.inventory.cdc import notify_ledger_insert
+from apps.inventory.constants import QueryBudgets
+from apps.inventory.guards import assert_bom_valid
+from apps.inventory.ledger_sequence import next_ledger_sequence, sequence_follows_part_lock
+from apps.inventory.part_cache import invalidate_part, part_attrs
+from factory_manager.db_routing import pin_to_primary
+from factory_manager.instrumentation import instrumented, span
+from factory_manager.query_budget import query_budget
 
 
 class Part(models.Model):
@@ -58,9 +65,27 @@ class Part(models.Model):
             models.Index(fields=["company_id", "part_type"]),
         ]
 
+    # Write-once (LOCKED): part_cache serves them without re-reading the row
+    IMMUTABLE_FIELDS = ("company_id", "part_type")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded()
+        return instance
+
+    def _remember_loaded(self) -> None:
+        # deferred fields are not in __dict__ and are not compared
+        self._loaded_values = {name: self.__dict__[name] for name in self.IMMUTABLE_FIELDS if name in self.__dict__}
+
     def clean(self):
         super().clean()
 
+        loaded = getattr(self, "_loaded_values", {})
+        changed = [name for name, value in loaded.items() if getattr(self, name) != value]
+        if changed:
+            raise ValidationError(f"{', '.join(changed)} cannot change once the part exists")
+
         # Part type + procurement strategy constraints (LOCKED)
         if self.part_type == self.PartType.FINISHED_GOOD and self.procurement_strategy != self.ProcurementStrategy.MAKE:
             raise ValidationError("finished_good MUST make")
@@ -75,7 +100,14 @@ class Part(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        invalidate_part(self)
+        self._remember_loaded()
+        return result
+
+    def delete(self, *args, **kwargs):
+        invalidate_part(self)
+        return super().delete(*args, **kwargs)
 
 
 class BOM(models.Model):
@@ -95,6 +127,12 @@ class BOM(models.Model):
                 fields=["company_id", "parent_part", "revision_index"],
                 name="uq_inventory_bom_company_parent_rev",
             ),
+            # Effective BOM: at most one active revision per parent part (partial unique index)
+            models.UniqueConstraint(
+                fields=["company_id", "parent_part"],
+                condition=models.Q(is_active=True),
+                name="uq_inventory_bom_one_active_per_parent",
+            ),
         ]
         indexes = [
             models.Index(fields=["company_id", "parent_part"]),
@@ -103,20 +141,38 @@ class BOM(models.Model):
     def clean(self):
         super().clean()
 
-        if self.parent_part.part_type not in {Part.PartType.FINISHED_GOOD, Part.PartType.SEMI_FINISHED}:
+        parent = part_attrs(self, "parent_part")
+        if parent is None:
+            return  # missing/unknown parent_part: reported by clean_fields()
+
+        if parent.part_type not in {Part.PartType.FINISHED_GOOD, Part.PartType.SEMI_FINISHED}:
             raise ValidationError("BOM parent must be finished_good or semi_finished")
 
         # Company boundary safety (fail-fast)
-        if self.parent_part.company_id != self.company_id:
+        if parent.company_id != self.company_id:
             raise ValidationError("company_id mismatch between BOM and parent_part")
 
+    @query_budget(QueryBudgets.BOM_SAVE, name="bom.save")
     def save(self, *args, **kwargs):
-        self.full_clean()
-        result = super().save(*args, **kwargs)
+        from apps.inventory.bom_index import sync_effective_bom
+
+        with transaction.atomic():
+            # Activating a revision retires the previously active one (one active per parent)
+            if self.is_active:
+                (
+                    BOM.objects.filter(company_id=self.company_id, parent_part_id=self.parent_part_id, is_active=True)
+                    .exclude(pk=self.pk)
+                    .update(is_active=False)
+                )
+
+            self.full_clean()
+            result = super().save(*args, **kwargs)
+
+            # Keep the live edge index in sync before validating the live graph
+            sync_effective_bom(self)
 
-        # Post-save graph validation (fail-fast)
-        assert_no_circular_bom(self.company_id, self.parent_part_id)
-        assert_max_depth(self.company_id, self.parent_part_id)
+            # Post-save graph validation (fail-fast): one edge load, one traversal
+            assert_bom_valid(self.company_id, [self.parent_part_id])
 
         return result
 
@@ -148,23 +204,61 @@ class BOMItem(models.Model):
     def clean(self):
         super().clean()
 
+        component = part_attrs(self, "component_part")
+        if component is None:
+            return  # missing/unknown component_part: reported by clean_fields()
+
         # Component eligibility (LOCKED)
-        if self.component_part.part_type in {Part.PartType.FINISHED_GOOD, Part.PartType.FIXED_ASSET}:
+        if component.part_type in {Part.PartType.FINISHED_GOOD, Part.PartType.FIXED_ASSET}:
             raise ValidationError("BOM component cannot be finished_good or fixed_asset")
 
-        if self.component_part.part_type == Part.PartType.CONSUMABLE and not self.is_direct:
+        if component.part_type == Part.PartType.CONSUMABLE and not self.is_direct:
             # Indirect consumables are explicitly out of BOM per spec
             raise ValidationError("Indirect consumables must not be BOM components (set is_direct=True)")
 
         # Company boundary safety (fail-fast)
         if self.bom.company_id != self.company_id:
             raise ValidationError("company_id mismatch between BOMItem and BOM")
-        if self.component_part.company_id != self.company_id:
+        if component.company_id != self.company_id:
             raise ValidationError("company_id mismatch between BOMItem and component_part")
 
+    @query_budget(QueryBudgets.BOMITEM_SAVE, name="bom_item.save")
     def save(self, *args, **kwargs):
+        from apps.inventory.bom_index import upsert_effective_edge
+
         self.full_clean()
-        return super().save(*args, **kwargs)
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            upsert_effective_edge(self)
+        return result
+
+
+class EffectiveBOMEdge(models.Model):
+    """
+    Denormalised live BOM graph: one row per item of the single active revision
+    of each parent part. Maintained by BOM.save() / BOMItem.save()
+    (apps.inventory.bom_index); graph guards read only this table.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    company_id = models.UUIDField()
+
+    parent_part = models.ForeignKey(Part, on_delete=models.CASCADE, related_name="+")
+    component_part = models.ForeignKey(Part, on_delete=models.CASCADE, related_name="+")
+
+    bom = models.ForeignKey(BOM, on_delete=models.CASCADE, related_name="effective_edges")
+    bom_item = models.OneToOneField(BOMItem, on_delete=models.CASCADE, related_name="effective_edge")
+
+    qty_per = models.DecimalField(max_digits=18, decimal_places=6)
+    is_direct = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "inventory_effective_bom_edges"
+        indexes = [
+            # graph load = one index range scan per company
+            models.Index(fields=["company_id", "parent_part", "component_part"], name="ix_inv_effbom_company_edge"),
+            models.Index(fields=["company_id", "component_part"], name="ix_inv_effbom_company_comp"),
+        ]
 
 
 class StockLedgerEntry(models.Model):
@@ -217,13 +311,35 @@ class StockLedgerEntry(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Per-company ledger position, set by save() (apps.inventory.ledger_sequence).
+    # Increasing, but on PostgreSQL it may have gaps (one shared sequence, rolled-back
+    # inserts) and is not commit-ordered across parts: a lower number can commit after
+    # a higher one. Per part it follows the part lock, i.e. the summary fold order.
+    # Consumers read through ledger_rows_after(), which holds back in-flight rows.
+    sequence = models.BigIntegerField(editable=False, blank=True)
+
+    # True once save() resolved this instance to an already stored idempotent duplicate
+    _was_duplicate = False
+
     class Meta:
         db_table = "inventory_stock_ledger"
+        constraints = [
+            # also the index behind "rows after sequence S" range scans
+            models.UniqueConstraint(fields=["company_id", "sequence"], name="uq_inventory_ledger_company_sequence"),
+        ]
         indexes = [
             models.Index(fields=["company_id", "created_at"]),
-            models.Index(fields=["company_id", "part", "created_at"]),
+            # movement history (apps.inventory.history): index-only scans for the
+            # window running balance on PostgreSQL (INCLUDE is skipped elsewhere)
+            models.Index(
+                fields=["company_id", "part", "created_at", "id"],
+                include=["movement_type", "source_type", "qty", "unit_cost", "sequence", "reverse_of"],
+                name="ix_inventory_ledger_history",
+            ),
             models.Index(fields=["company_id", "source_type", "created_at"]),
             models.Index(fields=["company_id", "idempotency_key"]),
+            # admin keyset pagination (SYSTEM scope, no tenant predicate)
+            models.Index(fields=["created_at", "id"]),
         ]
 
     def _find_idempotent_duplicate_v2(self) -> "StockLedgerEntry | None":
@@ -238,7 +354,7 @@ class StockLedgerEntry(models.Model):
                 idempotency_scope=self.idempotency_scope,
                 idempotency_key=self.idempotency_key,
             )
-            .only("id", "created_at")
+            .only("id", "created_at", "sequence")
             .first()
         )
 
@@ -262,10 +378,21 @@ class StockLedgerEntry(models.Model):
                 source_ref=self.source_ref,
                 reverse_of_id=self.reverse_of_id,
             )
-            .only("id", "created_at")
+            .only("id", "created_at", "sequence")
             .first()
         )
 
+    def _adopt_duplicate(self, dup: "StockLedgerEntry") -> None:
+        """
+        Turn this unsaved instance into the already stored duplicate `dup`
+        (id / created_at / sequence) and flag it for callers (_was_duplicate).
+        """
+        self.id = dup.id
+        self.created_at = dup.created_at
+        self.sequence = dup.sequence
+        self._state.adding = False
+        self._was_duplicate = True
+
     def _movement_delta_qty(self) -> Decimal:
         q = Decimal(self.qty)
         if self.movement_type == self.MovementType.IN:
@@ -283,17 +410,23 @@ class StockLedgerEntry(models.Model):
 
         Part.objects.select_for_update().only("id").get(id=self.part_id)
 
-    def _current_available_qty_locked(self) -> Decimal:
-        signed = Case(
-            When(movement_type=self.MovementType.IN, then=models.F("qty")),
-            When(movement_type=self.MovementType.OUT, then=models.F("qty") * Value(Decimal("-1"))),
-            When(movement_type=self.MovementType.ADJUSTMENT, then=models.F("qty")),
+    @classmethod
+    def signed_qty(cls) -> Case:
+        """
+        Stock delta of a row as an expression (IN +qty, OUT -qty, ADJUSTMENT signed qty).
+        """
+        return Case(
+            When(movement_type=cls.MovementType.IN, then=models.F("qty")),
+            When(movement_type=cls.MovementType.OUT, then=models.F("qty") * Value(Decimal("-1"))),
+            When(movement_type=cls.MovementType.ADJUSTMENT, then=models.F("qty")),
             default=Value(Decimal("0")),
             output_field=DecimalField(max_digits=18, decimal_places=6),
         )
+
+    def _current_available_qty_locked(self) -> Decimal:
         agg = (
             StockLedgerEntry.objects.filter(company_id=self.company_id, part_id=self.part_id)
-            .aggregate(total=Coalesce(Sum(signed), Value(Decimal("0"))))
+            .aggregate(total=Coalesce(Sum(self.signed_qty()), Value(Decimal("0"))))
         )
         return Decimal(agg["total"])
 
@@ -424,13 +557,18 @@ class StockLedgerEntry(models.Model):
                 if Decimal(self.qty) != (Decimal(orig.qty) * Decimal("-1")):
                     raise ValidationError("reverse qty must be -original.qty for ADJUSTMENT")
 
+    @instrumented("ledger.save")
+    @query_budget(QueryBudgets.LEDGER_SAVE, name="ledger.save")
     def save(self, *args, **kwargs):
         if self.pk and not self._state.adding:
             raise PermissionDenied("StockLedgerEntry is immutable (append-only)")
 
         if self.part_id is None:
             raise ValidationError("part is required")
-        if self.part.company_id != self.company_id:
+        part = part_attrs(self, "part")
+        if part is None:
+            raise ValidationError({"part": "part does not exist"})
+        if part.company_id != self.company_id:
             raise ValidationError("company_id mismatch between StockLedgerEntry and Part")
 
         if self.unit_cost is None:
@@ -443,7 +581,8 @@ class StockLedgerEntry(models.Model):
 
         # Full validation; emit audit on specific fail-closed blocks
         try:
-            self.full_clean()
+            with span("ledger.save.full_clean"):
+                self.full_clean()
         except ValidationError as exc:
             if "reverse_of already has a reverse entry" in str(exc):
                 existing_reverse_id = (
@@ -464,11 +603,10 @@ class StockLedgerEntry(models.Model):
             raise ValidationError("qty must be non-zero for movement_type adjustment")
 
         # App-level idempotency guard (fast-path): v2 first, then v1
-        dup = self._find_idempotent_duplicate_v2() or self._find_idempotent_duplicate_v1()
+        with span("ledger.save.idempotency_probe"):
+            dup = self._find_idempotent_duplicate_v2() or self._find_idempotent_duplicate_v1()
         if dup:
-            self.id = dup.id
-            self.created_at = dup.created_at
-            self._state.adding = False
+            self._adopt_duplicate(dup)
             return None
 
         is_new = self._state.adding
@@ -478,17 +616,35 @@ class StockLedgerEntry(models.Model):
             with transaction.atomic():
                 delta = self._movement_delta_qty()
 
+                # Lock order (apps.inventory.ledger_sequence): the counter row before any part
+                # lock; the database sequence after the part lock (per part: sequence == fold order)
+                after_lock = sequence_follows_part_lock()
+                if not after_lock:
+                    with span("ledger.save.sequence"):
+                        self.sequence = next_ledger_sequence(self.company_id)
+
+                if delta < 0 or after_lock:
+                    with span("ledger.save.lock_wait"):
+                        self._acquire_part_xact_lock()
+
+                if after_lock:
+                    with span("ledger.save.sequence"):
+                        self.sequence = next_ledger_sequence(self.company_id)
+
                 # D-3.25 — Negative stock guard (ledger-time, fail-closed)
                 # Applies to ANY entry that would reduce available stock (including reverse, if it ever reduces).
                 if delta < 0:
-                    self._acquire_part_xact_lock()
-                    current = self._current_available_qty_locked()
+                    with span("ledger.save.available_aggregate"):
+                        current = self._current_available_qty_locked()
                     projected = current + delta
                     if projected < 0:
                         neg_block_info = (current, Decimal(delta), projected)
                         raise ValidationError("negative stock not allowed (ledger-time guard)")
 
-                result = super().save(*args, **kwargs)
+                with span("ledger.save.insert"):
+                    result = super().save(*args, **kwargs)
+                    # CDC: delivered to LISTENers only if this transaction commits
+                    notify_ledger_insert(self)
 
         except ValidationError:
             if neg_block_info is not None:
@@ -500,9 +656,8 @@ class StockLedgerEntry(models.Model):
             # DB-level races: try to resolve deterministic duplicates
             dup2 = self._find_idempotent_duplicate_v2() or self._find_idempotent_duplicate_v1()
             if dup2:
-                self.id = dup2.id
-                self.created_at = dup2.created_at
-                self._state.adding = False
+                # the rolled-back attempt already drew self.sequence: take the stored row's
+                self._adopt_duplicate(dup2)
                 return None
             raise
 
@@ -511,6 +666,9 @@ class StockLedgerEntry(models.Model):
 
             on_ledger_insert(entry=self)
 
+            # Read-your-writes: later reads of this request go to the primary
+            pin_to_primary()
+
         return result
 
     def delete(self, *args, **kwargs):
@@ -539,3 +697,94 @@ class PartStockSummary(models.Model):
         indexes = [
             models.Index(fields=["company_id", "updated_at"]),
         ]
+
+
+class PartStockDelta(models.Model):
+    """
+    Striped available_qty counter (STOCK_SUMMARY_STRIPES > 0, apps.inventory.stock_deltas):
+    qty-only summary updates add into one of N rows per part instead of locking
+    the PartStockSummary row; compact_stock_deltas folds them into the summary.
+    Current qty = PartStockSummary.available_qty + SUM(qty_delta).
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    company_id = models.UUIDField()
+
+    part = models.ForeignKey(Part, on_delete=models.CASCADE, related_name="+")
+    stripe = models.PositiveSmallIntegerField()
+
+    qty_delta = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal("0"))
+
+    class Meta:
+        db_table = "inventory_part_stock_deltas"
+        constraints = [
+            models.UniqueConstraint(fields=["company_id", "part", "stripe"], name="uq_inventory_stockdelta_part_stripe"),
+        ]
+
+
+class LedgerSequence(models.Model):
+    """
+    Per-company sequence head (apps.inventory.ledger_sequence).
+    PostgreSQL: highest committed sequence, advanced after commit (numbers come
+    from the inventory_ledger_sequence_seq database sequence). Other vendors:
+    the allocation counter itself, incremented in the insert transaction.
+    """
+
+    company_id = models.UUIDField(primary_key=True)
+    last_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "inventory_ledger_sequences"
+
+
+class ProjectionCheckpoint(models.Model):
+    """
+    Per-projection, per-company position in the ledger (apps.inventory.projections):
+    the last folded StockLedgerEntry.sequence.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    name = models.CharField(max_length=64)
+    company_id = models.UUIDField()
+
+    last_sequence = models.BigIntegerField(default=0)
+    rows_applied = models.BigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "inventory_projection_checkpoints"
+        constraints = [
+            models.UniqueConstraint(fields=["name", "company_id"], name="uq_inventory_projcp_name_company"),
+        ]
+
+
+class PartSourceMovementTotal(models.Model):
+    """
+    Projection: running qty/value totals per part x source_type x movement_type.
+    Derived from the ledger only (rebuildable by replay); never written by save().
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    company_id = models.UUIDField()
+
+    part = models.ForeignKey(Part, on_delete=models.CASCADE, related_name="+")
+    source_type = models.CharField(max_length=32, choices=StockLedgerEntry.SourceType.choices)
+    movement_type = models.CharField(max_length=16, choices=StockLedgerEntry.MovementType.choices)
+
+    qty_total = models.DecimalField(max_digits=24, decimal_places=6, default=Decimal("0"))
+    value_total = models.DecimalField(max_digits=24, decimal_places=4, default=Decimal("0"))
+    entry_count = models.BigIntegerField(default=0)
+    last_entry_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "inventory_part_source_movement_totals"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company_id", "part", "source_type", "movement_type"],
+                name="uq_inventory_srcmove_company_part_src_mv",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["company_id", "source_type"]),
+        ]
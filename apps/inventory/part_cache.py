@@ -0,0 +1,140 @@
+# apps/inventory/part_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+
+class PartAttrs(NamedTuple):
+    """
+    Part attributes read by validation hot paths (ledger / BOM writes).
+
+    company_id and part_type are write-once (Part.clean() rejects changes);
+    procurement_strategy may change and is only as fresh as the TTL elsewhere.
+    """
+
+    company_id: UUID
+    part_type: str
+    procurement_strategy: str
+
+
+DEFAULT_MAX_SIZE = 10_000
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class PartAttributeCache:
+    """
+    Per-process LRU of PartAttrs keyed by (company_id, part_id).
+
+    Invalidated by Part.save()/delete() in this process. Other processes only
+    see a change once their entry expires (ttl_seconds): the TTL bounds the
+    staleness window for edits made elsewhere (admin, bulk updates).
+    Misses are not cached.
+    """
+
+    def __init__(self, *, max_size: int = DEFAULT_MAX_SIZE, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[tuple[UUID, UUID], tuple[float, PartAttrs]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, company_id: UUID, part_id: UUID) -> PartAttrs | None:
+        key = (company_id, part_id)
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+
+        attrs = self._load(part_id)
+        if attrs is not None and attrs.company_id == company_id:
+            self.put(part_id, attrs)
+        return attrs
+
+    def put(self, part_id: UUID, attrs: PartAttrs) -> None:
+        if self.max_size <= 0:
+            return
+        key = (attrs.company_id, part_id)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, attrs)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, company_id: UUID, part_id: UUID) -> None:
+        with self._lock:
+            self._data.pop((company_id, part_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def _load(part_id: UUID) -> PartAttrs | None:
+        from apps.inventory.models import Part  # local import
+
+        row = (
+            Part.objects.filter(id=part_id)
+            .values_list("company_id", "part_type", "procurement_strategy")
+            .first()
+        )
+        return PartAttrs(*row) if row else None
+
+
+part_cache = PartAttributeCache(
+    max_size=int(getattr(settings, "PART_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE)),
+    ttl_seconds=float(getattr(settings, "PART_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+)
+
+
+# =========================
+# Model-facing helpers
+# =========================
+def part_attrs(instance, field_name: str) -> PartAttrs | None:
+    """
+    PartAttrs for FK `field_name` of `instance` without loading the Part row:
+    an already-loaded related object wins, else the cache (one values_list on miss).
+    """
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        part = getattr(instance, field_name)
+        return PartAttrs(part.company_id, part.part_type, part.procurement_strategy)
+    part_id = getattr(instance, field.attname)
+    if part_id is None:
+        return None
+    return part_cache.get(instance.company_id, part_id)
+
+
+def invalidate_part(part) -> None:
+    """
+    Drop `part` now and again on commit (a concurrent miss may re-read the
+    pre-commit row in between). Entries are keyed by company, so the key of the
+    company_id the instance was loaded with goes too.
+    """
+    company_ids = {part.company_id, getattr(part, "_loaded_values", {}).get("company_id", part.company_id)}
+    keys = [(company_id, part.pk) for company_id in company_ids]
+
+    def _drop():
+        for company_id, part_id in keys:
+            part_cache.invalidate(company_id, part_id)
+
+    _drop()
+    transaction.on_commit(_drop)
@@ -0,0 +1,214 @@
+# apps/inventory/projections.py
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+from django.db import transaction
+
+from apps.inventory.ledger_sequence import ledger_heads, ledger_rows_after
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+# =========================
+# Registry
+# =========================
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    A ledger read model maintained outside StockLedgerEntry.save().
+
+    - fields: ledger columns the fold consumes (sequence / created_at are always included)
+    - fold(rows): apply one sequence-ordered batch of one company's ledger rows (dicts);
+      runs in the same transaction as the checkpoint advance => exactly-once per row
+    - reset(): drop all derived rows (full replay starts from an empty model)
+    """
+
+    name: str
+    fields: tuple[str, ...]
+    fold: Callable[[list[dict[str, Any]]], None]
+    reset: Callable[[], None]
+    description: str = ""
+
+
+PROJECTIONS: dict[str, Projection] = {}
+
+
+def register_projection(projection: Projection) -> Projection:
+    if projection.name in PROJECTIONS:
+        raise ValueError(f"Projection already registered: {projection.name}")
+    PROJECTIONS[projection.name] = projection
+    return projection
+
+
+def get_projection(name: str) -> Projection:
+    try:
+        return PROJECTIONS[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown projection '{name}'. Register it in apps.inventory.projections.") from exc
+
+
+# =========================
+# Runner
+# =========================
+@dataclass
+class ProjectionRun:
+    name: str
+    rows: int = 0
+    batches: int = 0
+    companies: int = 0
+
+
+def pending_companies(name: str) -> list[UUID]:
+    """
+    Companies whose ledger head is past the projection's checkpoint
+    (two small reads: head rows + checkpoints; no ledger scan).
+    """
+    from apps.inventory.models import ProjectionCheckpoint  # local import
+
+    done = dict(ProjectionCheckpoint.objects.filter(name=name).values_list("company_id", "last_sequence"))
+    return sorted(c for c, head in ledger_heads().items() if head > done.get(c, 0))
+
+
+def apply_next_batch(projection: Projection, company_id: UUID, *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Fold the company's next batch after the checkpoint and advance it, in one transaction.
+    The checkpoint row lock serialises concurrent runners of the same projection.
+    ledger_rows_after() holds back in-flight rows, so "sequence > checkpoint" never
+    skips a late commit (sequences may have gaps; the checkpoint is a position, not a count).
+    """
+    from apps.inventory.models import ProjectionCheckpoint  # local import
+
+    with transaction.atomic():
+        checkpoint, _ = ProjectionCheckpoint.objects.select_for_update().get_or_create(
+            name=projection.name, company_id=company_id
+        )
+        rows = ledger_rows_after(
+            company_id,
+            checkpoint.last_sequence,
+            batch_size=batch_size,
+            fields=("created_at", "company_id", *projection.fields),
+        )
+        if not rows:
+            return 0
+
+        projection.fold(rows)
+
+        checkpoint.last_sequence = rows[-1]["sequence"]
+        checkpoint.rows_applied += len(rows)
+        checkpoint.save()
+        return len(rows)
+
+
+def catch_up(
+    name: str,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int | None = None,
+    company_id: UUID | None = None,
+) -> ProjectionRun:
+    """
+    Apply batches until every pending company reaches its ledger head (or max_batches).
+    """
+    projection = get_projection(name)
+    run = ProjectionRun(name=name)
+    companies = [company_id] if company_id is not None else pending_companies(name)
+
+    for cid in companies:
+        touched = False
+        while max_batches is None or run.batches < max_batches:
+            applied = apply_next_batch(projection, cid, batch_size=batch_size)
+            if not applied:
+                break
+            touched = True
+            run.rows += applied
+            run.batches += 1
+        run.companies += int(touched)
+    return run
+
+
+def replay(name: str, *, batch_size: int = DEFAULT_BATCH_SIZE) -> ProjectionRun:
+    """
+    Full replay: empty the read model, drop the checkpoints, fold the whole ledger.
+    Readers see a partially rebuilt model until the replay finishes.
+    """
+    from apps.inventory.models import ProjectionCheckpoint  # local import
+
+    projection = get_projection(name)
+    with transaction.atomic():
+        list(ProjectionCheckpoint.objects.select_for_update().filter(name=name))
+        projection.reset()
+        ProjectionCheckpoint.objects.filter(name=name).delete()
+    return catch_up(name, batch_size=batch_size)
+
+
+# =========================
+# Built-in projections
+# =========================
+def _fold_source_movement_totals(rows: list[dict[str, Any]]) -> None:
+    from apps.inventory.models import PartSourceMovementTotal  # local import
+
+    deltas: dict[tuple, dict[str, Any]] = defaultdict(
+        lambda: {"qty": Decimal("0"), "value": Decimal("0"), "count": 0, "last": None}
+    )
+    for row in rows:
+        d = deltas[(row["company_id"], row["part_id"], row["source_type"], row["movement_type"])]
+        d["qty"] += row["qty"]
+        d["value"] += row["transaction_value"]
+        d["count"] += 1
+        d["last"] = row["created_at"]
+
+    existing = {
+        (t.company_id, t.part_id, t.source_type, t.movement_type): t
+        for t in PartSourceMovementTotal.objects.select_for_update().filter(
+            company_id__in={k[0] for k in deltas},
+            part_id__in={k[1] for k in deltas},
+        )
+    }
+
+    to_update: list[PartSourceMovementTotal] = []
+    to_create: list[PartSourceMovementTotal] = []
+    for key, d in deltas.items():
+        total = existing.get(key)
+        if total is None:
+            company_id, part_id, source_type, movement_type = key
+            total = PartSourceMovementTotal(
+                company_id=company_id, part_id=part_id, source_type=source_type, movement_type=movement_type
+            )
+            to_create.append(total)
+        else:
+            to_update.append(total)
+        total.qty_total += d["qty"]
+        total.value_total += d["value"]
+        total.entry_count += d["count"]
+        total.last_entry_at = d["last"]
+
+    if to_update:
+        PartSourceMovementTotal.objects.bulk_update(
+            to_update, ["qty_total", "value_total", "entry_count", "last_entry_at"], batch_size=DEFAULT_BATCH_SIZE
+        )
+    if to_create:
+        PartSourceMovementTotal.objects.bulk_create(to_create, batch_size=DEFAULT_BATCH_SIZE)
+
+
+def _reset_source_movement_totals() -> None:
+    from apps.inventory.models import PartSourceMovementTotal  # local import
+
+    PartSourceMovementTotal.objects.all().delete()
+
+
+PART_SOURCE_MOVEMENT_TOTALS = register_projection(
+    Projection(
+        name="part_source_movement_totals",
+        fields=("company_id", "part_id", "source_type", "movement_type", "qty", "transaction_value"),
+        fold=_fold_source_movement_totals,
+        reset=_reset_source_movement_totals,
+        description="Qty/value totals per part x source_type x movement_type.",
+    )
+)
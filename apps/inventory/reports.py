@@ -0,0 +1,169 @@
+# apps/inventory/reports.py
+from __future__ import annotations
+
+import csv
+import json
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+from uuid import UUID
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.inventory.models import PartStockSummary
+from apps.inventory.stock_deltas import stripe_count, with_current_qty
+
+
+# Server-side cursor fetch size (rows per round-trip).
+DEFAULT_CHUNK_SIZE = 2000
+
+VALUATION_GROUPS = ("part", "part_type")
+VALUATION_FORMATS = ("csv", "jsonl")
+
+_VALUE_FIELD = DecimalField(max_digits=32, decimal_places=10)
+
+PART_COLUMNS = (
+    "part_id",
+    "part_no",
+    "name",
+    "part_type",
+    "available_qty",
+    "weighted_avg_cost",
+    "stock_value",
+)
+
+PART_TYPE_COLUMNS = (
+    "part_type",
+    "part_count",
+    "available_qty",
+    "stock_value",
+)
+
+
+def _summaries(company_id: UUID):
+    """
+    Company summaries annotated with `current_qty`: available_qty plus any
+    outstanding striped deltas (STOCK_SUMMARY_STRIPES > 0).
+    """
+    qs = PartStockSummary.objects.filter(company_id=company_id)
+    if stripe_count():
+        return with_current_qty(qs)
+    return qs.annotate(current_qty=F("available_qty"))
+
+
+def _stock_value_expr():
+    """
+    current_qty * weighted_avg_cost, computed in the database.
+    """
+    return ExpressionWrapper(F("current_qty") * F("weighted_avg_cost"), output_field=_VALUE_FIELD)
+
+
+def valuation_by_part(company_id: UUID, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """
+    Stream one valuation row per part (PartStockSummary JOIN Part).
+
+    Uses a server-side cursor (.iterator(chunk_size)) so memory stays constant
+    regardless of how many parts the company has.
+    """
+    qs = (
+        _summaries(company_id)
+        .annotate(stock_value=_stock_value_expr())
+        .order_by("part__part_no")
+        .values_list(
+            "part_id",
+            "part__part_no",
+            "part__name",
+            "part__part_type",
+            "current_qty",
+            "weighted_avg_cost",
+            "stock_value",
+        )
+    )
+    for row in qs.iterator(chunk_size=chunk_size):
+        yield dict(zip(PART_COLUMNS, row))
+
+
+def valuation_by_part_type(company_id: UUID) -> Iterator[dict[str, Any]]:
+    """
+    Aggregate stock value per part_type in the database (one GROUP BY query).
+    """
+    qs = (
+        _summaries(company_id)
+        .values("part__part_type")
+        .annotate(
+            part_count=Count("id"),
+            total_qty=Coalesce(Sum("current_qty"), Value(Decimal("0"))),
+            total_value=Coalesce(Sum(_stock_value_expr()), Value(Decimal("0")), output_field=_VALUE_FIELD),
+        )
+        .order_by("part__part_type")
+    )
+    for row in qs.iterator():
+        yield {
+            "part_type": row["part__part_type"],
+            "part_count": row["part_count"],
+            "available_qty": row["total_qty"],
+            "stock_value": row["total_value"],
+        }
+
+
+def valuation_rows(company_id: UUID, *, group_by: str = "part", chunk_size: int = DEFAULT_CHUNK_SIZE):
+    if group_by == "part":
+        return PART_COLUMNS, valuation_by_part(company_id, chunk_size=chunk_size)
+    if group_by == "part_type":
+        return PART_TYPE_COLUMNS, valuation_by_part_type(company_id)
+    raise ValueError(f"Unknown valuation group_by: {group_by}")
+
+
+# =========================
+# Incremental renderers
+# =========================
+class _Echo:
+    """
+    File-like object whose write() returns the value (csv.writer -> generator).
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+def iter_csv(columns: Iterable[str], rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    columns = tuple(columns)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_cell(row[c]) for c in columns])
+
+
+def iter_jsonl(columns: Iterable[str], rows: Iterable[dict[str, Any]]) -> Iterator[str]:
+    columns = tuple(columns)
+    for row in rows:
+        payload = {c: (str(row[c]) if isinstance(row[c], (Decimal, UUID)) else row[c]) for c in columns}
+        yield json.dumps(payload, ensure_ascii=False) + "\n"
+
+
+def render_valuation(
+    company_id: UUID,
+    *,
+    fmt: str = "csv",
+    group_by: str = "part",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Lazily render the valuation report as CSV or JSON lines.
+    Nothing is read from the database until the iterator is consumed.
+    """
+    if fmt not in VALUATION_FORMATS:
+        raise ValueError(f"Unknown valuation format: {fmt}")
+
+    columns, rows = valuation_rows(company_id, group_by=group_by, chunk_size=chunk_size)
+    if fmt == "csv":
+        return iter_csv(columns, rows)
+    return iter_jsonl(columns, rows)
@@ -0,0 +1,305 @@
+# apps/inventory/reversals.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Iterable
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+
+from apps.audit.hooks import AuditContext, emit_audit_event
+from apps.inventory.cdc import notify_ledger_insert
+from apps.inventory.ledger_sequence import reserve_ledger_sequences, sequence_follows_part_lock
+from factory_manager.db_routing import pin_to_primary
+from factory_manager.instrumentation import instrumented, span
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+INSERT_BATCH_SIZE = 500
+
+
+@dataclass
+class DocumentReversal:
+    company_id: UUID
+    entries: list = field(default_factory=list)
+    deltas: dict[UUID, Decimal] = field(default_factory=dict)
+    dry_run: bool = False
+
+    @property
+    def sequences(self) -> list[int] | None:
+        # increasing, not necessarily consecutive (ledger_sequence: gaps on PostgreSQL)
+        if not self.entries or self.dry_run:
+            return None
+        return [entry.sequence for entry in self.entries]
+
+
+# =========================
+# Service
+# =========================
+@instrumented("ledger.reverse_document")
+def reverse_document(
+    company_id: UUID,
+    *,
+    source_ref: dict[str, Any] | None = None,
+    entry_ids: Iterable[UUID] | None = None,
+    reason: str = "",
+    actor_id=None,
+    dry_run: bool = False,
+) -> DocumentReversal:
+    """
+    Reverse every ledger row of a document in one batch (D-3.28 rules, set-based).
+
+    Originals are selected by exact `source_ref` match or by `entry_ids`
+    (exactly one of the two). Fail-closed, all or nothing:
+    - unknown ids, other-company rows or reverse rows in the selection
+    - any original that already has a reverse (D-3.29; audited per original)
+    - any part whose net reverse delta would drive stock negative (D-3.25; audited)
+
+    Query shape is constant in the document size: one originals load, one
+    reverse probe, one available-qty aggregate for the parts that lose stock,
+    one sequence block, chunked bulk INSERT and one stock summary batch (plus
+    one advisory lock per part on PostgreSQL).
+    """
+    from apps.inventory.hooks import on_reverse_batch  # local import
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    if (source_ref is None) == (entry_ids is None):
+        raise ValidationError("reverse_document: pass exactly one of source_ref / entry_ids")
+
+    originals = _load_originals(StockLedgerEntry, company_id, source_ref=source_ref, entry_ids=entry_ids)
+    _assert_not_reversed(StockLedgerEntry, company_id, originals)
+
+    reversal = DocumentReversal(company_id=company_id, dry_run=dry_run)
+    # audit-sized document key (payload guards cap list sizes)
+    document = source_ref
+    if document is None:
+        document = {"entry_id_count": len(originals), "first_entry_id": str(originals[0].id)}
+    for orig in originals:
+        entry = _inverted(StockLedgerEntry, orig, reason=reason)
+        reversal.entries.append(entry)
+        reversal.deltas[orig.part_id] = reversal.deltas.get(orig.part_id, Decimal("0")) + entry._movement_delta_qty()
+
+    neg_block: list[tuple[Any, Decimal, Decimal]] = []
+    try:
+        with transaction.atomic():
+            # Lock order (apps.inventory.ledger_sequence): the counter row before the part
+            # locks; the database sequence after locking every part of the document
+            lock_all = not dry_run and sequence_follows_part_lock()
+            if lock_all:
+                _lock_parts(reversal, reversal.deltas)
+            elif not dry_run:
+                _reserve_sequences(reversal)
+
+            _assert_stock_covers(StockLedgerEntry, reversal, neg_block, locked=lock_all)
+            if lock_all:
+                _reserve_sequences(reversal)
+
+            if dry_run:
+                transaction.set_rollback(True)
+                return reversal
+
+            with span("ledger.reverse_document.insert"):
+                try:
+                    with transaction.atomic():
+                        StockLedgerEntry.objects.bulk_create(reversal.entries, batch_size=INSERT_BATCH_SIZE)
+                except IntegrityError as exc:
+                    # concurrent reverse of the same original (OneToOne reverse_of)
+                    raise ValidationError("reverse_of already has a reverse entry") from exc
+                # one NOTIFY per batch: consumers fetch by sequence range anyway
+                notify_ledger_insert(reversal.entries[-1])
+
+            on_reverse_batch(company_id=company_id, deltas=reversal.deltas)
+
+            emit_audit_event(
+                event_name="inventory.document.reversed",
+                payload={
+                    "document": document,
+                    "reason": reason,
+                    "entry_count": len(reversal.entries),
+                    "part_count": len(reversal.deltas),
+                    "first_sequence": reversal.entries[0].sequence,
+                    "last_sequence": reversal.entries[-1].sequence,
+                },
+                context=AuditContext(company_id),
+                actor_id=actor_id,
+            )
+    except ValidationError:
+        for entry, current, projected in neg_block:
+            entry_delta = reversal.deltas[entry.part_id]
+            _emit_negative_stock_block_audit(entry, document, current=current, delta=entry_delta, projected=projected)
+        raise
+
+    pin_to_primary()
+    return reversal
+
+
+# =========================
+# Steps
+# =========================
+def _load_originals(StockLedgerEntry, company_id, *, source_ref, entry_ids) -> list:
+    with span("ledger.reverse_document.load"):
+        if source_ref is not None:
+            if not source_ref:
+                raise ValidationError("reverse_document: source_ref must not be empty")
+            qs = StockLedgerEntry.objects.filter(company_id=company_id, source_ref=source_ref)
+        else:
+            ids = {UUID(str(i)) for i in entry_ids}
+            qs = StockLedgerEntry.objects.filter(id__in=ids)
+        originals = list(qs.order_by("sequence"))
+
+    if entry_ids is not None:
+        missing = ids - {o.id for o in originals}
+        if missing:
+            raise ValidationError(f"reverse_document: {len(missing)} entry id(s) not found")
+    if not originals:
+        raise ValidationError("reverse_document: no ledger entries matched")
+    if any(o.company_id != company_id for o in originals):
+        raise ValidationError("company_id mismatch between reverse entry and original entry")
+    if any(o.reverse_of_id for o in originals):
+        raise ValidationError("cannot reverse a reverse entry")
+    return originals
+
+
+def _assert_not_reversed(StockLedgerEntry, company_id, originals: list) -> None:
+    """
+    D-3.29 for the whole document: one reverse_of_id IN (...) probe.
+    """
+    by_id = {o.id: o for o in originals}
+    with span("ledger.reverse_document.reverse_probe"):
+        existing = dict(
+            StockLedgerEntry.objects.filter(reverse_of_id__in=list(by_id)).values_list("reverse_of_id", "id")
+        )
+    if not existing:
+        return
+
+    for orig_id, reverse_id in existing.items():
+        orig = by_id[orig_id]
+        try:
+            emit_audit_event(
+                event_name="inventory.reverse.duplicate_blocked",
+                payload={
+                    "reverse_of_id": str(orig_id),
+                    "existing_reverse_id": str(reverse_id),
+                    "part_id": str(orig.part_id),
+                    "movement_type": str(orig.movement_type),
+                    "source_type": str(StockLedgerEntry.SourceType.ADJUSTMENT),
+                    "qty": str(orig.qty),
+                    "unit_cost": str(orig.unit_cost),
+                    "source_ref": orig.source_ref or {},
+                },
+                context=AuditContext(company_id),
+                actor_id=None,
+            )
+        except Exception:
+            pass
+    raise ValidationError(f"reverse_of already has a reverse entry ({len(existing)} of {len(originals)} entries)")
+
+
+def _inverted(StockLedgerEntry, orig, *, reason: str):
+    """
+    D-3.28 canonical inversion: IN <-> OUT with the same qty, ADJUSTMENT with -qty;
+    adjustment source lane, original unit cost (no WAC effect per D-3.30).
+    """
+    MovementType = StockLedgerEntry.MovementType
+    if orig.movement_type == MovementType.IN:
+        movement_type, qty = MovementType.OUT, Decimal(orig.qty)
+    elif orig.movement_type == MovementType.OUT:
+        movement_type, qty = MovementType.IN, Decimal(orig.qty)
+    else:
+        movement_type, qty = MovementType.ADJUSTMENT, Decimal(orig.qty) * Decimal("-1")
+
+    return StockLedgerEntry(
+        company_id=orig.company_id,
+        part_id=orig.part_id,
+        movement_type=movement_type,
+        source_type=StockLedgerEntry.SourceType.ADJUSTMENT,
+        qty=qty,
+        unit_cost=orig.unit_cost,
+        transaction_value=qty * Decimal(orig.unit_cost),
+        reference_price=orig.reference_price,
+        reverse_of_id=orig.id,
+        source_ref={"reverse_of": str(orig.id), "document": orig.source_ref, "reason": reason},
+    )
+
+
+def _reserve_sequences(reversal: DocumentReversal) -> None:
+    # one block; entries keep original (sequence) order
+    for entry, sequence in zip(reversal.entries, reserve_ledger_sequences(reversal.company_id, len(reversal.entries))):
+        entry.sequence = sequence
+
+
+def _lock_parts(reversal: DocumentReversal, part_ids: Iterable[UUID]) -> dict:
+    """
+    Part locks in part id order (no lock-order deadlocks); re-locking a part
+    this transaction already holds is a no-op. Returns {part_id: first entry}.
+    """
+    first_entry = {}
+    for entry in reversal.entries:
+        first_entry.setdefault(entry.part_id, entry)
+
+    with span("ledger.reverse_document.lock_wait"):
+        for part_id in sorted(part_ids):
+            first_entry[part_id]._acquire_part_xact_lock()
+    return first_entry
+
+
+def _assert_stock_covers(StockLedgerEntry, reversal: DocumentReversal, neg_block: list, *, locked: bool = False) -> None:
+    """
+    D-3.25, once per part on the net document delta: lock the parts that lose
+    stock (sorted => no lock-order deadlocks; skipped when `locked`, i.e. the
+    caller holds every part lock already), then one grouped aggregate.
+    """
+    losing = sorted(part_id for part_id, delta in reversal.deltas.items() if delta < 0)
+    if not losing:
+        return
+
+    if locked:
+        first_entry = {}
+        for entry in reversal.entries:
+            first_entry.setdefault(entry.part_id, entry)
+    else:
+        first_entry = _lock_parts(reversal, losing)
+
+    with span("ledger.reverse_document.available_aggregate"):
+        available = dict(
+            StockLedgerEntry.objects.filter(company_id=reversal.company_id, part_id__in=losing)
+            .values("part_id")
+            .annotate(total=Sum(StockLedgerEntry.signed_qty()))
+            .values_list("part_id", "total")
+        )
+
+    for part_id in losing:
+        current = Decimal(available.get(part_id) or 0)
+        projected = current + reversal.deltas[part_id]
+        if projected < 0:
+            neg_block.append((first_entry[part_id], current, projected))
+    if neg_block:
+        raise ValidationError(f"negative stock not allowed (ledger-time guard): {len(neg_block)} part(s)")
+
+
+def _emit_negative_stock_block_audit(entry, document, *, current: Decimal, delta: Decimal, projected: Decimal) -> None:
+    """
+    Outside the rolled-back transaction (persists when we block). Best-effort.
+    """
+    try:
+        emit_audit_event(
+            event_name="inventory.negative_stock.blocked",
+            payload={
+                "part_id": str(entry.part_id),
+                "movement_type": str(entry.movement_type),
+                "source_type": str(entry.source_type),
+                "qty": str(-delta),
+                "delta_qty": str(delta),
+                "current_available_qty": str(current),
+                "projected_available_qty": str(projected),
+                "unit_cost": None,  # net of a multi-row document
+                "source_ref": {"reverse_document": document},
+            },
+            context=AuditContext(entry.company_id),
+            actor_id=None,
+        )
+    except Exception:
+        return
@@ -0,0 +1,125 @@
+# apps/inventory/services.py
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from apps.audit.hooks import emit_audit_event
+from apps.inventory.stock_deltas import current_summary, stripe_count
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+# =========================
+# Ledger worker pool (ASGI)
+# =========================
+# The lock + insert critical section holds a DB connection for its whole
+# duration; running it on Django's single thread-sensitive executor serialises
+# every async request behind it. A dedicated pool sized to the DB connection
+# budget (LEDGER_ASYNC_WORKERS) runs posts in parallel without oversubscribing
+# the pool. LEDGER_ASYNC_WORKERS=0 => fall back to the thread-sensitive executor.
+_executor: ThreadPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def ledger_executor() -> ThreadPoolExecutor | None:
+    global _executor, _executor_workers
+    workers = int(getattr(settings, "LEDGER_ASYNC_WORKERS", 10))
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ledger-post")
+            _executor_workers = workers
+        return _executor
+
+
+def _in_db_thread(fn):
+    """
+    Pool threads outlive requests: apply the request_started/finished connection
+    hygiene (CONN_MAX_AGE, broken connections, pool return) around each call.
+    """
+
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return run
+
+
+def _to_async(fn):
+    executor = ledger_executor()
+    if executor is None:
+        return sync_to_async(fn, thread_sensitive=True)
+    return sync_to_async(_in_db_thread(fn), thread_sensitive=False, executor=executor)
+
+
+# =========================
+# Sync services (WSGI / management commands)
+# =========================
+def post_ledger_entry(**fields: Any):
+    """
+    Post one ledger entry (locking, negative-stock guard, idempotency and the
+    summary hook all live in StockLedgerEntry.save).
+
+    Returns (entry, created) like get_or_create: an idempotent duplicate
+    returns the already stored row with created=False.
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    entry = StockLedgerEntry(**fields)
+    entry.save()
+    if entry._was_duplicate:
+        return StockLedgerEntry.objects.get(pk=entry.pk), False
+    return entry, True
+
+
+def get_stock_summary(company_id: UUID, part_id: UUID):
+    from apps.inventory.models import PartStockSummary  # local import
+
+    if stripe_count():
+        return current_summary(company_id, part_id)
+    return PartStockSummary.objects.filter(company_id=company_id, part_id=part_id).first()
+
+
+# =========================
+# Async services (ASGI)
+# =========================
+async def apost_ledger_entry(**fields: Any):
+    return await _to_async(post_ledger_entry)(**fields)
+
+
+async def aget_stock_summary(company_id: UUID, part_id: UUID):
+    """
+    Plain read: Django's async ORM is enough (no lock held across awaits).
+    Striped mode adds a delta read: same helper as the sync path, off the loop.
+    """
+    from apps.inventory.models import PartStockSummary  # local import
+
+    if stripe_count():
+        return await _to_async(get_stock_summary)(company_id, part_id)
+    return await PartStockSummary.objects.filter(company_id=company_id, part_id=part_id).afirst()
+
+
+async def aemit_audit_event(*, event_name: str, payload: dict, context, actor_id=None):
+    """
+    Guards and the AUDIT_EMIT_ALLOWED gate are synchronous: run the whole
+    emit on the ledger pool rather than re-implementing it on the async ORM.
+    """
+    return await _to_async(emit_audit_event)(
+        event_name=event_name,
+        payload=payload,
+        context=context,
+        actor_id=actor_id,
+    )
@@ -0,0 +1,183 @@
+# apps/inventory/stock_audit.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Sum
+
+from apps.audit.hooks import AuditContext, emit_audit_event
+from apps.inventory.ledger_sequence import ledger_heads
+from apps.inventory.stock_deltas import outstanding_qty
+from factory_manager.instrumentation import instrumented
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+MISMATCH_EVENT = "inventory.stock_summary.mismatch"
+FIELD_AVAILABLE_QTY = "available_qty"
+FIELD_WEIGHTED_AVG_COST = "weighted_avg_cost"
+PART_CHUNK_SIZE = 1000
+
+# Every read of the auditor goes to the primary: PartStockSummary is a replica
+# read model (db_routing), and a lagging summary compared with the primary
+# ledger looks like drift that confirmed() cannot filter out.
+AUDIT_DB = DEFAULT_DB_ALIAS
+
+
+@dataclass(frozen=True)
+class StockMismatch:
+    company_id: UUID
+    part_id: UUID
+    field: str
+    summary_value: Decimal | None  # None => no summary row
+    ledger_value: Decimal | None
+
+
+# =========================
+# Set-based comparison
+# =========================
+def compare_parts(company_id: UUID, part_ids: Iterable[UUID] | None = None) -> list[StockMismatch]:
+    """
+    available_qty of `company_id` (optionally limited to `part_ids`) vs the
+    signed ledger sum: one GROUP BY over the ledger plus one summary read per
+    chunk of parts, independent of the number of ledger rows per part.
+    Parts with ledger rows but no summary row are reported too. Outstanding
+    striped deltas count as part of the summary. Both sides read the primary.
+    """
+    from apps.inventory.models import PartStockSummary, StockLedgerEntry  # local import
+
+    ids = None if part_ids is None else list(dict.fromkeys(part_ids))
+    chunks = [None] if ids is None else [ids[i : i + PART_CHUNK_SIZE] for i in range(0, len(ids), PART_CHUNK_SIZE)]
+
+    mismatches: list[StockMismatch] = []
+    for chunk in chunks:
+        ledger = StockLedgerEntry.objects.using(AUDIT_DB).filter(company_id=company_id)
+        summaries = PartStockSummary.objects.using(AUDIT_DB).filter(company_id=company_id)
+        if chunk is not None:
+            ledger = ledger.filter(part_id__in=chunk)
+            summaries = summaries.filter(part_id__in=chunk)
+
+        ledger_qty = dict(
+            ledger.order_by()
+            .values("part_id")
+            .annotate(total=Sum(StockLedgerEntry.signed_qty()))
+            .values_list("part_id", "total")
+        )
+        summary_qty = dict(summaries.values_list("part_id", "available_qty"))
+        for part_id, pending in outstanding_qty(company_id, chunk, using=AUDIT_DB).items():
+            summary_qty[part_id] = Decimal(summary_qty.get(part_id) or 0) + pending
+
+        for part_id in sorted(ledger_qty.keys() | summary_qty.keys()):
+            expected = Decimal(ledger_qty.get(part_id) or 0)
+            actual = summary_qty.get(part_id)
+            if actual is None or Decimal(actual) != expected:
+                mismatches.append(StockMismatch(company_id, part_id, FIELD_AVAILABLE_QTY, actual, expected))
+    return mismatches
+
+
+def compare_wac(company_id: UUID, part_ids: Iterable[UUID] | None = None) -> list[StockMismatch]:
+    """
+    weighted_avg_cost vs an exact ledger replay (apps.inventory.wac_replay).
+    Streams the company's ledger once: meant for full runs, not every few minutes.
+    """
+    from apps.inventory.wac_replay import find_divergences, replay_wac  # local import
+
+    mismatches = []
+    replays = replay_wac(company_id=company_id, part_ids=part_ids, using=AUDIT_DB)
+    for replay, diffs in find_divergences(replays, using=AUDIT_DB):
+        for diff in diffs:
+            if diff.field == FIELD_WEIGHTED_AVG_COST:
+                mismatches.append(StockMismatch(company_id, replay.part_id, diff.field, diff.summary, diff.replayed))
+    return mismatches
+
+
+def confirmed(mismatches: list[StockMismatch]) -> list[StockMismatch]:
+    """
+    Re-check only the mismatching parts once. The summary hook commits after
+    the ledger insert, so a post landing between the two reads of a run looks
+    like drift; real drift survives the second look.
+    """
+    by_company: dict[UUID, set[UUID]] = {}
+    for m in mismatches:
+        if m.field == FIELD_AVAILABLE_QTY:
+            by_company.setdefault(m.company_id, set()).add(m.part_id)
+    still = {
+        (m.company_id, m.part_id): m
+        for company_id, part_ids in by_company.items()
+        for m in compare_parts(company_id, sorted(part_ids))
+    }
+    return [m for m in mismatches if m.field != FIELD_AVAILABLE_QTY or (m.company_id, m.part_id) in still]
+
+
+# =========================
+# Part selection
+# =========================
+def sample_summary_parts(percent: float) -> dict[UUID, list[UUID]]:
+    """
+    {company_id: [part_id]} for a random sample of ~`percent`% of summary rows.
+    PostgreSQL: TABLESAMPLE SYSTEM (block sampling, reads only the sampled pages).
+    Other vendors: ORDER BY RANDOM() LIMIT (full scan; fine for small tables).
+    """
+    from apps.inventory.models import PartStockSummary  # local import
+
+    if not 0 < percent <= 100:
+        raise ValueError("percent must be in (0, 100]")
+
+    db = AUDIT_DB
+    connection = connections[db]
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(PartStockSummary._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT company_id, part_id FROM {table} TABLESAMPLE SYSTEM (%s)", [percent])
+            rows = cursor.fetchall()
+    else:
+        total = PartStockSummary.objects.using(db).count()
+        limit = max(1, round(total * percent / 100.0)) if total else 0
+        rows = list(PartStockSummary.objects.using(db).order_by("?").values_list("company_id", "part_id")[:limit])
+
+    sample: dict[UUID, list[UUID]] = {}
+    for company_id, part_id in rows:
+        sample.setdefault(UUID(str(company_id)), []).append(UUID(str(part_id)))
+    return sample
+
+
+def company_shard(company_ids: Iterable[UUID], shard: int, shards: int) -> list[UUID]:
+    """
+    Stable company partition for parallel full runs (shard in [0, shards)).
+    """
+    if not 0 <= shard < shards:
+        raise ValueError("shard must be in [0, shards)")
+    return sorted(c for c in company_ids if c.int % shards == shard)
+
+
+def known_companies() -> set[UUID]:
+    from apps.inventory.models import PartStockSummary  # local import
+
+    summaries = PartStockSummary.objects.using(AUDIT_DB).values_list("company_id", flat=True).distinct()
+    return set(ledger_heads(using=AUDIT_DB)) | set(summaries)
+
+
+# =========================
+# Reporting
+# =========================
+@instrumented("inventory.stock_audit.emit")
+def emit_mismatch_events(mismatches: Iterable[StockMismatch], *, mode: str) -> int:
+    count = 0
+    for m in mismatches:
+        emit_audit_event(
+            event_name=MISMATCH_EVENT,
+            payload={
+                "part_id": str(m.part_id),
+                "field": m.field,
+                "summary_value": str(m.summary_value) if m.summary_value is not None else None,
+                "ledger_value": str(m.ledger_value) if m.ledger_value is not None else None,
+                "mode": mode,
+            },
+            context=AuditContext(m.company_id),
+            actor_id=None,
+        )
+        count += 1
+    return count
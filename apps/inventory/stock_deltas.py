@@ -0,0 +1,223 @@
+# apps/inventory/stock_deltas.py
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import groupby
+from typing import Iterable
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from factory_manager.instrumentation import instrumented
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+# =========================
+# Striped summary counters
+# =========================
+# STOCK_SUMMARY_STRIPES = N > 0: qty-only summary updates (OUT, adjustment,
+# reverse lane) become an upsert into one of N PartStockDelta rows per part, so
+# concurrent posts of a hot part contend on N rows instead of one summary row.
+# WAC-moving INs still lock the summary and fold the part's stripes first (WAC
+# needs the exact on-hand qty). The negative-stock guard is unaffected: it
+# aggregates the ledger under the per-part lock.
+# Readers: summary.available_qty + outstanding deltas (helpers below).
+# Switching back to 0: run compact_stock_deltas once.
+DEFAULT_COMPACT_BATCH_PARTS = 500
+
+_QTY_FIELD = DecimalField(max_digits=18, decimal_places=6)
+
+
+def stripe_count() -> int:
+    return max(0, int(getattr(settings, "STOCK_SUMMARY_STRIPES", 0)))
+
+
+def add_delta(company_id: UUID, part_id: UUID, delta: Decimal, *, stripes: int | None = None) -> None:
+    """
+    Add `delta` to a random stripe of the part: one upsert, no summary lock.
+    """
+    from apps.inventory.models import PartStockDelta  # local import
+
+    stripes = stripes or stripe_count() or 1
+    db = router.db_for_write(PartStockDelta)
+    connection = connections[db]
+    opts = PartStockDelta._meta
+    table = connection.ops.quote_name(opts.db_table)
+    params = [
+        opts.get_field("company_id").get_db_prep_value(company_id, connection),
+        opts.get_field("part").target_field.get_db_prep_value(part_id, connection),
+        random.randrange(stripes),
+        opts.get_field("qty_delta").get_db_prep_save(Decimal(delta), connection),
+    ]
+
+    # INSERT .. ON CONFLICT: PostgreSQL and SQLite >= 3.24
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (company_id, part_id, stripe, qty_delta) VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT (company_id, part_id, stripe) DO UPDATE SET qty_delta = {table}.qty_delta + EXCLUDED.qty_delta",
+            params,
+        )
+
+
+def fold_part(company_id: UUID, part_id: UUID) -> Decimal:
+    """
+    Lock, sum and delete the part's stripes; the caller adds the result to the
+    (already locked) summary in the same transaction. Concurrent upserts wait
+    on the locked stripes and land in fresh rows after commit.
+    """
+    from apps.inventory.models import PartStockDelta  # local import
+
+    rows = list(
+        PartStockDelta.objects.select_for_update()
+        .filter(company_id=company_id, part_id=part_id)
+        .values_list("id", "qty_delta")
+    )
+    if not rows:
+        return Decimal("0")
+    PartStockDelta.objects.filter(id__in=[r[0] for r in rows]).delete()
+    return sum((Decimal(r[1]) for r in rows), Decimal("0"))
+
+
+# =========================
+# Readers
+# =========================
+def outstanding_qty(
+    company_id: UUID, part_ids: Iterable[UUID] | None = None, *, using: str | None = None
+) -> dict[UUID, Decimal]:
+    """
+    {part_id: SUM(qty_delta)} not yet folded into PartStockSummary (one GROUP BY).
+    """
+    from apps.inventory.models import PartStockDelta  # local import
+
+    qs = PartStockDelta.objects.using(using).filter(company_id=company_id)
+    if part_ids is not None:
+        qs = qs.filter(part_id__in=list(part_ids))
+    return {
+        part_id: Decimal(total)
+        for part_id, total in qs.order_by().values("part_id").annotate(total=Sum("qty_delta")).values_list("part_id", "total")
+    }
+
+
+def with_current_qty(qs):
+    """
+    Annotate a PartStockSummary queryset with `current_qty` =
+    available_qty + outstanding deltas (correlated subquery on the stripe index).
+    """
+    from apps.inventory.models import PartStockDelta  # local import
+
+    pending = (
+        PartStockDelta.objects.filter(company_id=OuterRef("company_id"), part_id=OuterRef("part_id"))
+        .order_by()
+        .values("part_id")
+        .annotate(total=Sum("qty_delta"))
+        .values("total")
+    )
+    return qs.annotate(
+        current_qty=F("available_qty") + Coalesce(Subquery(pending, output_field=_QTY_FIELD), Value(Decimal("0")))
+    )
+
+
+def current_summary(company_id: UUID, part_id: UUID):
+    """
+    PartStockSummary with available_qty including outstanding deltas (not saved).
+    An unfolded part without a summary row yet gets an unsaved zero-cost row.
+    """
+    from apps.inventory.models import PartStockSummary  # local import
+
+    summary = PartStockSummary.objects.filter(company_id=company_id, part_id=part_id).first()
+    pending = outstanding_qty(company_id, [part_id]).get(part_id)
+    if pending is None:
+        return summary
+    if summary is None:
+        summary = PartStockSummary(company_id=company_id, part_id=part_id)
+    summary.available_qty = Decimal(summary.available_qty) + pending
+    return summary
+
+
+def lock_deltas(part_ids: Iterable[UUID], *, using: str | None = None) -> list[UUID]:
+    """
+    Lock the parts' stripe rows and return their ids. For writers that recompute
+    summaries from the ledger (rebuild / replay --apply): lock the summaries, then
+    the stripes (same order as the hook and compact()), read the ledger after
+    locking, then delete_deltas() exactly these ids. Deltas that arrive later
+    land in fresh rows and are kept.
+    """
+    from apps.inventory.models import PartStockDelta  # local import
+
+    qs = PartStockDelta.objects.using(using or router.db_for_write(PartStockDelta))
+    return list(
+        qs.select_for_update().filter(part_id__in=list(part_ids)).order_by("part_id", "stripe").values_list("id", flat=True)
+    )
+
+
+def delete_deltas(delta_ids: Iterable[UUID], *, using: str | None = None) -> int:
+    from apps.inventory.models import PartStockDelta  # local import
+
+    delta_ids = list(delta_ids)
+    if not delta_ids:
+        return 0
+    deleted, _ = PartStockDelta.objects.using(using or router.db_for_write(PartStockDelta)).filter(id__in=delta_ids).delete()
+    return deleted
+
+
+# =========================
+# Compactor
+# =========================
+@dataclass(frozen=True)
+class CompactionRun:
+    parts: int
+    rows: int
+
+
+@instrumented("inventory.stock_deltas.compact")
+def compact(*, batch_parts: int = DEFAULT_COMPACT_BATCH_PARTS, company_id: UUID | None = None) -> CompactionRun:
+    """
+    Fold outstanding deltas of up to `batch_parts` parts into PartStockSummary in
+    one transaction: lock summaries then stripes (part order, same as the hook),
+    one bulk update / insert, delete the folded stripe rows.
+    """
+    from apps.inventory.models import PartStockDelta, PartStockSummary  # local import
+
+    candidates = PartStockDelta.objects.all()
+    if company_id is not None:
+        candidates = candidates.filter(company_id=company_id)
+    keys = list(candidates.order_by("part_id").values_list("company_id", "part_id").distinct()[:batch_parts])
+    if not keys:
+        return CompactionRun(parts=0, rows=0)
+    part_ids = [part_id for _, part_id in keys]
+
+    with transaction.atomic():
+        summaries = {
+            s.part_id: s
+            for s in PartStockSummary.objects.select_for_update().filter(part_id__in=part_ids).order_by("part_id")
+        }
+        stripes = list(
+            PartStockDelta.objects.select_for_update()
+            .filter(part_id__in=part_ids)
+            .order_by("part_id", "stripe")
+            .values_list("id", "company_id", "part_id", "qty_delta")
+        )
+
+        now = timezone.now()
+        to_update, to_create = [], []
+        for (company, part_id), rows in groupby(stripes, key=lambda r: (r[1], r[2])):
+            total = sum((Decimal(r[3]) for r in rows), Decimal("0"))
+            summary = summaries.get(part_id)
+            if summary is None:
+                to_create.append(PartStockSummary(company_id=company, part_id=part_id, available_qty=total))
+                continue
+            summary.available_qty = Decimal(summary.available_qty) + total
+            summary.updated_at = now
+            to_update.append(summary)
+
+        PartStockSummary.objects.bulk_update(to_update, ["available_qty", "updated_at"])
+        PartStockSummary.objects.bulk_create(to_create)
+        PartStockDelta.objects.filter(id__in=[r[0] for r in stripes]).delete()
+
+    return CompactionRun(parts=len(to_update) + len(to_create), rows=len(stripes))
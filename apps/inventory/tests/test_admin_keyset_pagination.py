@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.inventory.admin import StockLedgerEntryAdmin
+from apps.inventory.models import Part, StockLedgerEntry
+from apps.tenancy.admin_changelist import decode_cursor, encode_cursor
+
+
+class LedgerAdminKeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = get_user_model().objects.create_superuser(
+            username="su", email="su@example.com", password="pass12345"
+        )
+        cls.company_id = uuid4()
+        cls.other_company_id = uuid4()
+
+        def _entries(company_id, n):
+            part = Part.objects.create(
+                company_id=company_id,
+                part_no=f"RM-{company_id.hex[:6]}",
+                name="Raw",
+                part_type=Part.PartType.RAW_MATERIAL,
+                procurement_strategy=Part.ProcurementStrategy.BUY,
+            )
+            for i in range(n):
+                StockLedgerEntry.objects.create(
+                    company_id=company_id,
+                    part=part,
+                    movement_type=StockLedgerEntry.MovementType.IN,
+                    source_type=StockLedgerEntry.SourceType.PURCHASE,
+                    qty=Decimal("1"),
+                    unit_cost=Decimal("2"),
+                    source_ref={"doc": f"GR-{i}"},
+                )
+
+        _entries(cls.company_id, 5)
+        _entries(cls.other_company_id, 2)
+
+        # identical timestamps: id must break ties deterministically
+        base = timezone.now() - timedelta(days=1)
+        ids = list(StockLedgerEntry.objects.filter(company_id=cls.company_id).values_list("id", flat=True))
+        StockLedgerEntry.objects.filter(id__in=ids[:3]).update(created_at=base)
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+        self.url = reverse("admin:inventory_stockledgerentry_changelist")
+
+    def _walk(self, params):
+        seen, pages, url_params = [], 0, dict(params)
+        while True:
+            resp = self.client.get(self.url, url_params)
+            self.assertEqual(resp.status_code, 200)
+            cl = resp.context["cl"]
+            seen.extend(obj.pk for obj in cl.result_list)
+            pages += 1
+            if not cl.keyset_next_url:
+                return seen, pages, cl
+            url_params = dict(p.split("=", 1) for p in cl.keyset_next_url.lstrip("?").split("&"))
+
+    def test_pages_cover_every_row_once_in_seek_order(self):
+        with mock.patch.object(StockLedgerEntryAdmin, "list_per_page", 2):
+            seen, pages, cl = self._walk({})
+
+        expected = list(StockLedgerEntry.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 4)
+        self.assertEqual(cl.result_count, 7)
+        self.assertFalse(cl.result_count_is_estimate)
+        self.assertIsNotNone(cl.keyset_prev_url)
+
+    def test_previous_page_returns_same_rows(self):
+        with mock.patch.object(StockLedgerEntryAdmin, "list_per_page", 2):
+            first = self.client.get(self.url).context["cl"]
+            nxt = dict(p.split("=", 1) for p in first.keyset_next_url.lstrip("?").split("&"))
+            second = self.client.get(self.url, nxt).context["cl"]
+            prev = dict(p.split("=", 1) for p in second.keyset_prev_url.lstrip("?").split("&"))
+            back = self.client.get(self.url, prev).context["cl"]
+
+        self.assertEqual([o.pk for o in back.result_list], [o.pk for o in first.result_list])
+
+    def test_lazy_company_filter(self):
+        resp = self.client.get(self.url, {"company_id": str(self.other_company_id)})
+        cl = resp.context["cl"]
+        self.assertEqual(cl.result_count, 2)
+        self.assertTrue(all(o.company_id == self.other_company_id for o in cl.result_list))
+
+        bad = self.client.get(self.url, {"company_id": "not-a-uuid"})
+        self.assertEqual(bad.status_code, 302)
+        self.assertIn("e=1", bad.headers["Location"])
+
+    def test_cursor_roundtrip_and_invalid_cursor(self):
+        obj = StockLedgerEntry.objects.first()
+        created_at, pk = decode_cursor(encode_cursor(obj.created_at, obj.pk))
+        self.assertEqual((created_at, pk), (obj.created_at, str(obj.pk)))
+
+        resp = self.client.get(self.url, {"after": "%%%"})
+        self.assertEqual(resp.status_code, 302)
+
+    def test_list_fetches_truncated_source_ref_only(self):
+        part = Part.objects.filter(company_id=self.company_id).first()
+        StockLedgerEntry.objects.create(
+            company_id=self.company_id,
+            part=part,
+            movement_type=StockLedgerEntry.MovementType.IN,
+            source_type=StockLedgerEntry.SourceType.PURCHASE,
+            qty=Decimal("1"),
+            unit_cost=Decimal("2"),
+            source_ref={"doc": "GR-BIG", "note": "x" * 5000},
+        )
+
+        resp = self.client.get(self.url)
+
+        cl = resp.context["cl"]
+        row = cl.result_list[0]
+        self.assertIn("source_ref", row.get_deferred_fields())
+        self.assertLessEqual(len(row.source_ref_head), 81)
+        self.assertNotContains(resp, "x" * 100)
+        self.assertContains(resp, "...")
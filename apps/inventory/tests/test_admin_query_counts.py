@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.inventory.models import BOM, BOMItem, Part, StockLedgerEntry
+from apps.tenancy.models import Company, Role, UserMembership
+
+
+class AdminChangelistQueryCountTests(TestCase):
+    """
+    Regression: changelist query count must not grow with the number of rows
+    (tenant decision and link URLs are resolved once per request).
+    """
+
+    seq = count()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name="Acme")
+        cls.user = get_user_model().objects.create_user(
+            username="manager", password="pass12345", is_staff=True, is_active=True
+        )
+        cls.user.user_permissions.add(
+            *Permission.objects.filter(
+                codename__in=[
+                    "view_part",
+                    "view_bom",
+                    "view_bomitem",
+                    "view_stockledgerentry",
+                    "view_partstocksummary",
+                ]
+            )
+        )
+        UserMembership.objects.create(user=cls.user, company=cls.company, role=Role.COMPANY_MANAGER)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _add_rows(self, n: int) -> None:
+        company_id = self.company.id
+        for _ in range(n):
+            i = next(self.seq)
+            parent = Part.objects.create(
+                company_id=company_id,
+                part_no=f"FG-{i}",
+                name=f"FG {i}",
+                part_type=Part.PartType.FINISHED_GOOD,
+                procurement_strategy=Part.ProcurementStrategy.MAKE,
+            )
+            component = Part.objects.create(
+                company_id=company_id,
+                part_no=f"RM-{i}",
+                name=f"RM {i}",
+                part_type=Part.PartType.RAW_MATERIAL,
+                procurement_strategy=Part.ProcurementStrategy.BUY,
+            )
+            bom = BOM.objects.create(company_id=company_id, parent_part=parent, revision_index=1)
+            BOMItem.objects.create(company_id=company_id, bom=bom, component_part=component, qty_per=Decimal("1"))
+            StockLedgerEntry.objects.create(
+                company_id=company_id,
+                part=component,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal("1"),
+                unit_cost=Decimal("2"),
+                source_ref={"doc": f"GR-{i}"},
+            )
+
+    def _queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def _assert_constant(self, url_name: str, *, link: str | None = None) -> None:
+        url = reverse(url_name)
+        self._add_rows(2)
+        small = self._queries(url)
+
+        self._add_rows(8)
+        resp = self.client.get(url)
+        if link:
+            self.assertContains(resp, link)
+        self.assertEqual(self._queries(url), small)
+
+    def test_part_changelist(self):
+        self._assert_constant("admin:inventory_part_changelist")
+
+    def test_bom_changelist(self):
+        self._assert_constant("admin:inventory_bom_changelist", link="/admin/inventory/part/")
+
+    def test_bomitem_changelist(self):
+        self._assert_constant("admin:inventory_bomitem_changelist", link="/admin/inventory/bom/")
+
+    def test_stockledgerentry_changelist(self):
+        self._assert_constant("admin:inventory_stockledgerentry_changelist", link="/admin/inventory/part/")
+
+    def test_partstocksummary_changelist(self):
+        self._assert_constant("admin:inventory_partstocksummary_changelist", link="/admin/inventory/part/")
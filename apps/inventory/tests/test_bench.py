@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.inventory.bench_data import BenchDataSpec, delete_bench_data, generate_bench_data
+from apps.inventory.benchmarks import rolled_back
+from apps.inventory.models import BOM, EffectiveBOMEdge, LedgerSequence, Part, PartStockSummary, StockLedgerEntry
+from apps.tenancy.models import Company
+
+
+SPEC = BenchDataSpec(companies=2, parts_per_company=10, bom_depth=2, bom_fanout=2, ledger_entries_per_part=3, seed=7)
+
+
+class BenchDataTests(TestCase):
+    def _snapshot(self):
+        with rolled_back():
+            companies = generate_bench_data(SPEC)
+            return (
+                [c.company_id for c in companies],
+                sorted(Part.objects.values_list("id", "part_no")),
+                sorted(EffectiveBOMEdge.objects.values_list("parent_part_id", "component_part_id")),
+                sorted(StockLedgerEntry.objects.values_list("id", "qty")),
+            )
+
+    def test_generator_is_deterministic(self):
+        self.assertEqual(self._snapshot(), self._snapshot())
+
+    def test_generator_shape(self):
+        companies = generate_bench_data(SPEC)
+
+        self.assertEqual(len(companies), 2)
+        for company in companies:
+            self.assertEqual(len(company.layers), 2)
+            self.assertEqual(len(company.parts), 10)
+            self.assertEqual(BOM.objects.filter(company_id=company.company_id, is_active=True).count(), len(company.boms))
+            self.assertEqual(company.ledger_entries, 10 * 3)
+            self.assertFalse(PartStockSummary.objects.filter(company_id=company.company_id, available_qty__lt=0).exists())
+
+    def test_delete_removes_every_generated_row(self):
+        ids = [c.company_id for c in generate_bench_data(SPEC)]
+
+        delete_bench_data(ids)
+
+        for model in (Part, BOM, EffectiveBOMEdge, StockLedgerEntry, PartStockSummary, LedgerSequence):
+            self.assertFalse(model.objects.filter(company_id__in=ids).exists(), model.__name__)
+        self.assertFalse(Company.objects.filter(id__in=ids).exists())
+
+
+class BenchCommandTests(TestCase):
+    def test_writes_results_and_cleans_up(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            call_command(
+                "bench",
+                "--companies", "1",
+                "--parts", "8",
+                "--bom-depth", "2",
+                "--history", "2",
+                "--posts", "5",
+                "--bom-saves", "2",
+                "--admin-requests", "1",
+                "--output", path,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+            with open(path, encoding="utf-8") as fh:
+                report = json.load(fh)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(report["meta"]["spec"]["parts_per_company"], 8)
+        by_name = {r["name"]: r for r in report["results"]}
+        for name in ("generate", "ledger.post.in", "ledger.post.out", "ledger.post.reverse", "summary.rebuild", "bom.save.revision"):
+            self.assertIn(name, by_name)
+        self.assertEqual(by_name["ledger.post.reverse"]["ops"], 5)
+        for result in report["results"]:
+            self.assertEqual(result.get("errors", 0), 0, result)
+        self.assertTrue(any(name.startswith("admin.list.") for name in by_name))
+        self.assertIn("p95_ms", by_name["ledger.post.out"])
+
+        self.assertEqual(Part.objects.count(), 0)
+        self.assertEqual(StockLedgerEntry.objects.count(), 0)
+        self.assertEqual(Company.objects.count(), 0)
+        self.assertEqual(get_user_model().objects.count(), 0)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from apps.inventory.guards import MAX_BOM_DEPTH, analyze_bom_graph, assert_bom_graph_valid
+
+
+def _chain(n: int):
+    nodes = [uuid4() for _ in range(n + 1)]
+    return {a: [b] for a, b in zip(nodes, nodes[1:])}, nodes
+
+
+class BomGraphAnalyzerTests(SimpleTestCase):
+    def test_longest_path_depth_not_shortest(self):
+        # root -> a -> b -> c and root -> c : longest depth is 3
+        root, a, b, c = (uuid4() for _ in range(4))
+        graph = {root: [c, a], a: [b], b: [c]}
+
+        report = analyze_bom_graph(graph, [root])
+
+        self.assertTrue(report.is_valid)
+        self.assertEqual(report.max_depth, 3)
+        self.assertEqual(report.depth_path, (root, a, b, c))
+
+    def test_cycle_returns_offending_path(self):
+        root, a, b = (uuid4() for _ in range(3))
+        graph = {root: [a], a: [b], b: [a]}
+
+        report = analyze_bom_graph(graph, [root])
+
+        self.assertEqual(report.cycle_path, (a, b, a))
+        with self.assertRaises(ValidationError) as ctx:
+            assert_bom_graph_valid(graph, [root])
+        self.assertIn("Circular BOM detected", str(ctx.exception))
+        self.assertEqual(ctx.exception.code, "bom_cycle")
+
+    def test_depth_limit_is_inclusive(self):
+        graph, nodes = _chain(MAX_BOM_DEPTH)
+        self.assertEqual(assert_bom_graph_valid(graph, [nodes[0]]).max_depth, MAX_BOM_DEPTH)
+
+        graph, nodes = _chain(MAX_BOM_DEPTH + 1)
+        report = analyze_bom_graph(graph, [nodes[0]])
+        self.assertTrue(report.depth_exceeded)
+        self.assertEqual(report.depth_path, tuple(nodes))
+
+    def test_depth_exceeded_through_already_visited_subtree(self):
+        # second root reaches a finished subtree deeper than the limit allows
+        graph, nodes = _chain(MAX_BOM_DEPTH)
+        top = uuid4()
+        graph[top] = [nodes[0]]
+
+        report = analyze_bom_graph(graph, [nodes[0], top])
+
+        self.assertTrue(report.depth_exceeded)
+        self.assertEqual(report.depth_path, (top, *nodes))
+
+    def test_deep_graph_has_no_recursion_limit(self):
+        graph, nodes = _chain(50_000)
+
+        report = analyze_bom_graph(graph, [nodes[0]], max_depth=10**9)
+
+        self.assertEqual(report.max_depth, 50_000)
+
+    def test_many_roots_share_one_traversal(self):
+        shared = uuid4()
+        leaf = uuid4()
+        roots = [uuid4() for _ in range(5)]
+        graph = {r: [shared] for r in roots}
+        graph[shared] = [leaf]
+
+        report = analyze_bom_graph(graph, roots)
+
+        self.assertTrue(report.is_valid)
+        self.assertEqual(report.max_depth, 2)
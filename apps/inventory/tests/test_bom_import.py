@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import io
+from decimal import Decimal
+from uuid import uuid4
+
+from django.test import TestCase
+
+from apps.inventory.importers import import_boms, iter_records
+from apps.inventory.models import BOM, BOMItem, EffectiveBOMEdge, Part
+
+
+CSV_HEADER = "parent_part_no,revision_index,is_active,component_part_no,qty_per,is_direct\n"
+
+
+class BomImportTests(TestCase):
+    def setUp(self) -> None:
+        self.company_id = uuid4()
+
+        def _part(part_no, part_type, strategy):
+            return Part.objects.create(
+                company_id=self.company_id,
+                part_no=part_no,
+                name=part_no,
+                part_type=part_type,
+                procurement_strategy=strategy,
+            )
+
+        self.fg = _part("FG-1", Part.PartType.FINISHED_GOOD, Part.ProcurementStrategy.MAKE)
+        self.sf = _part("SF-1", Part.PartType.SEMI_FINISHED, Part.ProcurementStrategy.MAKE)
+        self.rm = _part("RM-1", Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY)
+        self.cs = _part("CS-1", Part.PartType.CONSUMABLE, Part.ProcurementStrategy.BUY)
+
+    def _csv(self, body: str):
+        return iter_records(io.StringIO(CSV_HEADER + body), "csv")
+
+    def test_tree_is_bulk_created_with_constant_query_count(self):
+        body = (
+            "FG-1,1,1,SF-1,2,1\n"
+            "FG-1,1,1,CS-1,0.5,1\n"
+            "SF-1,1,1,RM-1,3.25,1\n"
+        )
+
+        # parts prefetch + existing headers + edge load + SAVEPOINT/RELEASE
+        # + deactivate previous revisions + 2 bulk INSERTs + edge index DELETE/INSERT
+        with self.assertNumQueries(10):
+            result = import_boms(self.company_id, self._csv(body))
+
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.boms_created, 2)
+        self.assertEqual(result.created, 3)
+        self.assertEqual(
+            BOMItem.objects.get(bom__parent_part=self.sf, component_part=self.rm).qty_per,
+            Decimal("3.25"),
+        )
+
+    def test_invalid_rows_reject_their_whole_bom_only(self):
+        body = (
+            "FG-1,1,1,SF-1,2,1\n"
+            "FG-1,1,1,CS-1,1,0\n"  # indirect consumable
+            "SF-1,1,1,RM-1,1,1\n"
+            "RM-1,1,1,CS-1,1,1\n"  # raw material cannot be a BOM parent
+        )
+
+        result = import_boms(self.company_id, self._csv(body))
+
+        self.assertEqual(result.boms_created, 1)
+        self.assertEqual({e.line_no for e in result.errors}, {2, 3, 5})
+        self.assertTrue(BOM.objects.filter(parent_part=self.sf).exists())
+        self.assertFalse(BOM.objects.filter(parent_part=self.fg).exists())
+
+    def test_cycle_against_existing_graph_fails_whole_batch(self):
+        existing = BOM.objects.create(company_id=self.company_id, parent_part=self.sf, revision_index=1)
+        other_sf = Part.objects.create(
+            company_id=self.company_id,
+            part_no="SF-2",
+            name="SF-2",
+            part_type=Part.PartType.SEMI_FINISHED,
+            procurement_strategy=Part.ProcurementStrategy.MAKE,
+        )
+        BOMItem.objects.create(company_id=self.company_id, bom=existing, component_part=other_sf, qty_per=Decimal("1"))
+
+        result = import_boms(self.company_id, self._csv("SF-2,1,1,SF-1,1,1\nFG-1,1,1,RM-1,1,1\n"))
+
+        self.assertEqual([e.key for e in result.errors], ["graph"])
+        self.assertIn("Circular BOM detected", result.errors[0].message)
+        self.assertEqual(result.boms_created, 0)
+        self.assertFalse(BOM.objects.filter(parent_part=self.fg).exists())
+
+    def test_existing_revision_is_rejected(self):
+        BOM.objects.create(company_id=self.company_id, parent_part=self.fg, revision_index=1)
+
+        result = import_boms(self.company_id, self._csv("FG-1,1,1,RM-1,1,1\nFG-1,2,1,RM-1,1,1\n"))
+
+        self.assertEqual([e.line_no for e in result.errors], [2])
+        self.assertEqual(result.boms_created, 1)
+        self.assertTrue(BOM.objects.filter(parent_part=self.fg, revision_index=2).exists())
+
+    def test_new_active_revision_replaces_live_edges(self):
+        # SF-1 rev 1 used SF-2; rev 2 drops it, so SF-2 -> SF-1 is no longer a cycle
+        sf2 = Part.objects.create(
+            company_id=self.company_id,
+            part_no="SF-2",
+            name="SF-2",
+            part_type=Part.PartType.SEMI_FINISHED,
+            procurement_strategy=Part.ProcurementStrategy.MAKE,
+        )
+        old = BOM.objects.create(company_id=self.company_id, parent_part=self.sf, revision_index=1)
+        BOMItem.objects.create(company_id=self.company_id, bom=old, component_part=sf2, qty_per=Decimal("1"))
+
+        result = import_boms(self.company_id, self._csv("SF-1,2,1,RM-1,1,1\nSF-2,1,1,SF-1,1,1\n"))
+
+        self.assertEqual(result.errors, [])
+        old.refresh_from_db()
+        self.assertFalse(old.is_active)
+        self.assertEqual(
+            set(EffectiveBOMEdge.objects.filter(company_id=self.company_id).values_list("parent_part_id", "component_part_id")),
+            {(self.sf.id, self.rm.id), (sf2.id, self.sf.id)},
+        )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from factory_manager import db_pool
+from factory_manager.db_pool import configure_database
+from factory_manager.views import pool_metrics
+
+
+PG = "django.db.backends.postgresql"
+
+
+class ConfigureDatabaseTests(SimpleTestCase):
+    def test_disabled_by_default(self):
+        db = configure_database({"ENGINE": PG, "CONN_MAX_AGE": 600}, env={})
+        self.assertEqual(db["OPTIONS"], {})
+        self.assertEqual(db["CONN_MAX_AGE"], 600)
+
+    def test_pool_replaces_persistent_connections(self):
+        env = {"DB_POOL": "1", "DB_POOL_MAX_SIZE": "32"}
+        with mock.patch.object(db_pool.importlib.util, "find_spec", return_value=object()):
+            db = configure_database({"ENGINE": PG, "CONN_MAX_AGE": 600}, env=env)
+        self.assertEqual(db["CONN_MAX_AGE"], 0)
+        self.assertEqual(db["OPTIONS"]["pool"]["max_size"], 32)
+        self.assertEqual(db["OPTIONS"]["pool"]["min_size"], db_pool.DEFAULT_POOL_MIN_SIZE)
+
+    def test_pool_without_psycopg_pool_fails_closed(self):
+        with mock.patch.object(db_pool.importlib.util, "find_spec", return_value=None):
+            with self.assertRaises(ImproperlyConfigured):
+                configure_database({"ENGINE": PG}, env={"DB_POOL": "1"})
+
+    def test_prepare_threshold_enables_server_side_binding(self):
+        db = configure_database({"ENGINE": PG}, env={"DB_PREPARE_THRESHOLD": "3"})
+        self.assertEqual(db["OPTIONS"], {"server_side_binding": True, "prepare_threshold": 3})
+
+    def test_non_postgres_untouched(self):
+        db = {"ENGINE": "django.db.backends.sqlite3"}
+        self.assertIs(configure_database(db, env={"DB_POOL": "1", "DB_PREPARE_THRESHOLD": "3"}), db)
+        self.assertNotIn("OPTIONS", db)
+
+
+class PoolMetricsViewTests(SimpleTestCase):
+    def test_staff_only(self):
+        request = RequestFactory().get("/ops/db-pool/")
+        request.user = AnonymousUser()
+        with self.assertRaises(PermissionDenied):
+            pool_metrics(request)
+
+    def test_reports_every_alias(self):
+        request = RequestFactory().get("/ops/db-pool/")
+        request.user = mock.Mock(is_authenticated=True, is_staff=True)
+        payload = json.loads(pool_metrics(request).content)
+        self.assertEqual(payload["databases"][0]["alias"], "default")
+        self.assertFalse(payload["databases"][0]["pooled"])
+
+
+class PoolMetricsMiddlewareTests(TestCase):
+    def test_staff_without_membership_passes_tenant_middleware(self):
+        staff = get_user_model().objects.create_user(username="ops", password="x", is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get("/ops/db-pool/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["databases"][0]["alias"], "default")
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+
+from django.db import connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from apps.audit.models import AuditEvent
+from apps.inventory.models import Part, PartStockSummary, StockLedgerEntry
+from factory_manager import db_routing
+from factory_manager.db_routing import (
+    REPLICA_ALIAS,
+    PrimaryPinMiddleware,
+    PrimaryReplicaRouter,
+    is_pinned_to_primary,
+    pin_to_primary,
+    replica_is_fresh,
+    replica_reads,
+    reset_primary_pin,
+)
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        reset_primary_pin()
+        patches = [
+            mock.patch.object(db_routing, "replica_configured", return_value=True),
+            mock.patch.object(db_routing, "replica_is_fresh", return_value=True),
+        ]
+        self.fresh = patches[1].start()
+        patches[0].start()
+        for p in patches:
+            self.addCleanup(p.stop)
+        self.addCleanup(reset_primary_pin)
+
+    def test_read_models_go_to_replica_outside_transactions(self):
+        self.assertEqual(self.router.db_for_read(PartStockSummary), REPLICA_ALIAS)
+        self.assertEqual(self.router.db_for_read(AuditEvent), REPLICA_ALIAS)
+        self.assertEqual(self.router.db_for_read(StockLedgerEntry), "default")
+        self.assertEqual(self.router.db_for_write(PartStockSummary), "default")
+
+    def test_replica_reads_block_routes_any_model(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(StockLedgerEntry), REPLICA_ALIAS)
+        self.assertEqual(self.router.db_for_read(StockLedgerEntry), "default")
+
+    def test_primary_transaction_pin_and_lag_keep_reads_on_primary(self):
+        with mock.patch.object(connections["default"], "in_atomic_block", True):
+            self.assertEqual(self.router.db_for_read(PartStockSummary), "default")
+
+        self.fresh.return_value = False
+        self.assertEqual(self.router.db_for_read(PartStockSummary), "default")
+        self.fresh.return_value = True
+
+        pin_to_primary()
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(PartStockSummary), "default")
+
+    def test_middleware_resets_pin(self):
+        pin_to_primary()
+        middleware = PrimaryPinMiddleware(lambda request: HttpResponse())
+        middleware(RequestFactory().get("/"))
+        self.assertFalse(is_pinned_to_primary())
+
+    def test_streaming_response_keeps_pin_until_exhausted(self):
+        seen = []
+
+        def view(request):
+            pin_to_primary()
+            return StreamingHttpResponse(seen.append(is_pinned_to_primary()) or b"x" for _ in range(2))
+
+        response = PrimaryPinMiddleware(view)(RequestFactory().get("/"))
+        self.assertEqual(b"".join(response.streaming_content), b"xx")
+        self.assertEqual(seen, [True, True])
+        self.assertFalse(is_pinned_to_primary())
+
+    def test_abandoned_stream_resets_pin_on_close(self):
+        def view(request):
+            pin_to_primary()
+            return StreamingHttpResponse(b"x" for _ in range(2))
+
+        for consumed in (0, 1):
+            response = PrimaryPinMiddleware(view)(RequestFactory().get("/"))
+            for _ in range(consumed):
+                next(iter(response))
+            self.assertTrue(is_pinned_to_primary())
+
+            response.close()
+            self.assertFalse(is_pinned_to_primary())
+
+    def test_never_migrates_replica(self):
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, "inventory"))
+        self.assertIsNone(self.router.allow_migrate("default", "inventory"))
+
+
+class ReplicaLagGuardTests(SimpleTestCase):
+    def setUp(self):
+        db_routing.clear_lag_cache()
+        self.addCleanup(db_routing.clear_lag_cache)
+
+    def test_lag_probe_is_cached_and_bounded(self):
+        with self.settings(DATABASE_REPLICA_MAX_LAG_SECONDS=5, DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS=60):
+            with mock.patch.object(db_routing, "replica_lag_seconds", return_value=1.0) as probe:
+                self.assertTrue(replica_is_fresh())
+                self.assertTrue(replica_is_fresh())
+            probe.assert_called_once()
+
+            db_routing.clear_lag_cache()
+            with mock.patch.object(db_routing, "replica_lag_seconds", return_value=30.0):
+                self.assertFalse(replica_is_fresh())
+
+            db_routing.clear_lag_cache()
+            with mock.patch.object(db_routing, "replica_lag_seconds", return_value=None):
+                self.assertFalse(replica_is_fresh())
+
+
+class LedgerWritePinsPrimaryTests(TestCase):
+    def tearDown(self):
+        reset_primary_pin()
+
+    def test_ledger_insert_pins_request_to_primary(self):
+        company_id = uuid4()
+        part = Part.objects.create(
+            company_id=company_id,
+            part_no="RM-1",
+            name="RM-1",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+        reset_primary_pin()
+
+        StockLedgerEntry.objects.create(
+            company_id=company_id,
+            part=part,
+            movement_type=StockLedgerEntry.MovementType.IN,
+            source_type=StockLedgerEntry.SourceType.PURCHASE,
+            qty=Decimal("1"),
+            unit_cost=Decimal("2"),
+            source_ref={"doc": "GR-1"},
+        )
+
+        self.assertTrue(is_pinned_to_primary())
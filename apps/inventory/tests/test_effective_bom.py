@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from io import StringIO
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.inventory.guards import _load_edges, assert_bom_valid
+from apps.inventory.models import BOM, BOMItem, EffectiveBOMEdge, Part
+
+
+class EffectiveBomIndexTests(TestCase):
+    def setUp(self) -> None:
+        self.company_id = uuid4()
+
+        def _part(part_no, part_type, strategy):
+            return Part.objects.create(
+                company_id=self.company_id,
+                part_no=part_no,
+                name=part_no,
+                part_type=part_type,
+                procurement_strategy=strategy,
+            )
+
+        MAKE, BUY = Part.ProcurementStrategy.MAKE, Part.ProcurementStrategy.BUY
+        self.fg = _part("FG-1", Part.PartType.FINISHED_GOOD, MAKE)
+        self.sf = _part("SF-1", Part.PartType.SEMI_FINISHED, MAKE)
+        self.sf2 = _part("SF-2", Part.PartType.SEMI_FINISHED, MAKE)
+        self.rm1 = _part("RM-1", Part.PartType.RAW_MATERIAL, BUY)
+        self.rm2 = _part("RM-2", Part.PartType.RAW_MATERIAL, BUY)
+
+    def _bom(self, parent, rev, *components, is_active=True):
+        bom = BOM.objects.create(company_id=self.company_id, parent_part=parent, revision_index=rev, is_active=is_active)
+        for component in components:
+            BOMItem.objects.create(company_id=self.company_id, bom=bom, component_part=component, qty_per=Decimal("1"))
+        return bom
+
+    def _live(self):
+        return {(e.parent_part_id, e.component_part_id) for e in _load_edges(self.company_id)}
+
+    def test_activating_revision_retires_previous_and_swaps_edges(self):
+        rev1 = self._bom(self.fg, 1, self.rm1)
+        rev2 = self._bom(self.fg, 2, self.rm2)
+
+        rev1.refresh_from_db()
+        self.assertFalse(rev1.is_active)
+        self.assertTrue(rev2.is_active)
+        self.assertEqual(self._live(), {(self.fg.id, self.rm2.id)})
+
+    def test_inactive_revisions_are_not_walked(self):
+        self._bom(self.sf, 1, self.sf2)
+        self._bom(self.sf, 2, self.rm1)
+
+        # SF-2 -> SF-1 would close a cycle only through the retired revision
+        self._bom(self.sf2, 1, self.sf)
+
+        self.assertEqual(self._live(), {(self.sf.id, self.rm1.id), (self.sf2.id, self.sf.id)})
+        report = assert_bom_valid(self.company_id, [self.sf2.id])
+        self.assertIsNone(report.cycle_path)
+        self.assertEqual(report.depth_path, (self.sf2.id, self.sf.id, self.rm1.id))
+
+    def test_inactive_revision_has_no_edges_and_item_delete_cascades(self):
+        self._bom(self.fg, 1, self.rm1, is_active=False)
+        self.assertEqual(self._live(), set())
+
+        active = self._bom(self.sf, 1, self.rm1, self.rm2)
+        BOMItem.objects.filter(bom=active, component_part=self.rm2).delete()
+        self.assertEqual(self._live(), {(self.sf.id, self.rm1.id)})
+
+    def test_rebuild_command_restores_index(self):
+        self._bom(self.fg, 1, self.sf, self.rm1)
+        self._bom(self.sf, 1, self.rm2)
+        expected = self._live()
+
+        EffectiveBOMEdge.objects.all().delete()
+        call_command("rebuild_effective_bom", "--company-id", str(self.company_id), stdout=StringIO())
+
+        self.assertEqual(self._live(), expected)
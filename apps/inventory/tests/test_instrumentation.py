@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+
+from apps.inventory.models import Part, StockLedgerEntry
+from factory_manager import instrumentation
+from factory_manager.instrumentation import (
+    NOOP_SPAN,
+    MemorySink,
+    PrometheusSink,
+    configure_instrumentation,
+    metrics_view,
+    span,
+)
+
+
+class InstrumentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-SPAN",
+            name="Span RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def tearDown(self):
+        configure_instrumentation([])
+
+    def _post(self, movement_type, qty):
+        StockLedgerEntry.objects.create(
+            company_id=self.company_id,
+            part=self.part,
+            movement_type=movement_type,
+            source_type=StockLedgerEntry.SourceType.PURCHASE,
+            qty=Decimal(qty),
+            unit_cost=Decimal("2"),
+            source_ref={"test": "span"},
+        )
+
+    def test_disabled_span_is_shared_noop(self):
+        configure_instrumentation([])
+        self.assertIs(span("anything"), NOOP_SPAN)
+
+    def test_ledger_write_phases_are_recorded(self):
+        sink = MemorySink()
+        configure_instrumentation([sink])
+
+        self._post(StockLedgerEntry.MovementType.IN, 10)
+        self._post(StockLedgerEntry.MovementType.OUT, 3)
+
+        spans = sink.snapshot()
+        self.assertEqual(spans["ledger.save"]["count"], 2)
+        self.assertEqual(spans["ledger.on_ledger_insert"]["count"], 2)
+        self.assertEqual(spans["ledger.save.insert"]["count"], 2)
+        # negative-stock guard path only for the OUT
+        self.assertEqual(spans["ledger.save.available_aggregate"]["count"], 1)
+        self.assertGreater(spans["ledger.save"]["queries"], spans["ledger.save.insert"]["queries"])
+        self.assertGreaterEqual(spans["ledger.save.insert"]["queries"], 1)
+
+    def test_errors_are_counted(self):
+        sink = MemorySink()
+        configure_instrumentation([sink])
+
+        with self.assertRaises(ValueError):
+            with span("boom"):
+                raise ValueError("x")
+        self.assertEqual(sink.snapshot()["boom"]["errors"], 1)
+
+    def test_prometheus_endpoint(self):
+        sink = PrometheusSink()
+        configure_instrumentation([sink])
+        with span('odd"name'):
+            pass
+
+        request = RequestFactory().get("/ops/metrics/", REMOTE_ADDR="10.0.0.5")
+        request.user = AnonymousUser()
+        with self.settings(INSTRUMENTATION_METRICS_ALLOWED_IPS="10.0.0.0/24"):
+            body = metrics_view(request).content.decode()
+        self.assertIn('fm_span_duration_seconds_count{span="odd\\"name"} 1', body)
+        self.assertIn('fm_span_duration_seconds_bucket{span="odd\\"name",le="+Inf"} 1', body)
+
+        # loopback alone is not trusted (a local reverse proxy makes every client local)
+        for addr in ("127.0.0.1", "10.0.1.5"):
+            remote = RequestFactory().get("/ops/metrics/", REMOTE_ADDR=addr)
+            remote.user = AnonymousUser()
+            with self.settings(INSTRUMENTATION_METRICS_ALLOWED_IPS="10.0.0.0/24"), self.assertRaises(PermissionDenied):
+                metrics_view(remote)
+        request.user = mock.Mock(is_authenticated=True, is_staff=True)
+
+        configure_instrumentation(["memory"])
+        with self.assertRaises(Http404):
+            metrics_view(request)
+
+    def test_sink_requires_record(self):
+        with self.assertRaises(TypeError):
+            instrumentation.Sink()
+
+    def test_settings_driven_configuration(self):
+        with self.settings(INSTRUMENTATION_SINKS="memory, log"):
+            instrumentation._sinks = None
+            sinks = instrumentation.active_sinks()
+        self.assertEqual([type(s).__name__ for s in sinks], ["MemorySink", "LogSink"])
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.inventory import cdc
+from apps.inventory.cdc import LEDGER_CHANNEL, LedgerChange, deliver, notify_ledger_insert, parse_notification, resolve_handler
+from apps.inventory.models import Part, ProjectionCheckpoint, StockLedgerEntry
+
+
+COLLECTED: list[dict] = []
+
+
+def collect(rows):
+    COLLECTED.extend(rows)
+
+
+class NotificationTests(SimpleTestCase):
+    def test_parse_notification(self):
+        company_id = uuid4()
+        self.assertEqual(parse_notification(f"{company_id}:42"), LedgerChange(company_id=company_id, sequence=42))
+        self.assertIsNone(parse_notification("garbage"))
+
+    def test_notify_only_on_postgresql(self):
+        entry = mock.Mock(company_id=uuid4(), sequence=7)
+        fake = mock.MagicMock()
+        fake.vendor = "postgresql"
+        cursor = fake.cursor.return_value.__enter__.return_value
+
+        with mock.patch.object(cdc, "connections", {"default": fake}):
+            with self.settings(LEDGER_CDC_NOTIFY=True):
+                notify_ledger_insert(entry)
+            with self.settings(LEDGER_CDC_NOTIFY=False):
+                notify_ledger_insert(entry)
+
+        cursor.execute.assert_called_once_with("SELECT pg_notify(%s, %s);", [LEDGER_CHANNEL, f"{entry.company_id}:7"])
+
+    def test_resolve_handler(self):
+        self.assertIs(resolve_handler("jsonl"), cdc.jsonl_handler)
+        self.assertIs(resolve_handler(f"{__name__}.collect"), collect)
+        with self.assertRaises(ValueError):
+            resolve_handler("nope.nothing")
+
+
+# no holdback and on_commit heads: the same on PostgreSQL and the counter-row backends
+@override_settings(LEDGER_CONSUMER_HOLDBACK_SECONDS=0)
+class DeliveryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-CDC",
+            name="CDC RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def setUp(self):
+        COLLECTED.clear()
+
+    def _post(self, n=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                StockLedgerEntry.objects.create(
+                    company_id=self.company_id,
+                    part=self.part,
+                    movement_type=StockLedgerEntry.MovementType.IN,
+                    source_type=StockLedgerEntry.SourceType.PURCHASE,
+                    qty=Decimal("1"),
+                    unit_cost=Decimal("1"),
+                    source_ref={"doc": str(uuid4())},
+                )
+                for _ in range(n)
+            ]
+
+    def test_failed_handler_is_redelivered(self):
+        seqs = [e.sequence for e in self._post(3)]
+
+        def failing(rows):
+            raise RuntimeError("downstream down")
+
+        with self.assertRaises(RuntimeError):
+            deliver("finance", failing, self.company_id, batch_size=2)
+        # the failed batch rolled back together with its checkpoint row
+        self.assertFalse(ProjectionCheckpoint.objects.filter(name="cdc:finance").exists())
+
+        self.assertEqual(deliver("finance", collect, self.company_id, batch_size=2), 3)
+        self.assertEqual([r["sequence"] for r in COLLECTED], seqs)
+        self.assertEqual(ProjectionCheckpoint.objects.get(name="cdc:finance").last_sequence, seqs[-1])
+
+    def test_once_command_catches_up_from_checkpoint(self):
+        posted = self._post(2)
+        call_command("ledger_cdc_consume", "--consumer", "mes", "--handler", f"{__name__}.collect", "--once", stderr=StringIO())
+        posted += self._post(1)
+        call_command("ledger_cdc_consume", "--consumer", "mes", "--handler", f"{__name__}.collect", "--once", stderr=StringIO())
+
+        self.assertEqual([r["sequence"] for r in COLLECTED], [e.sequence for e in posted])
+        self.assertEqual(COLLECTED[0]["company_id"], self.company_id)
+
+    def test_held_back_row_is_repolled_when_it_settles(self):
+        horizon = [None]
+        timeouts = []
+        posted = []
+
+        class Stop(Exception):
+            pass
+
+        class FakeListener:
+            channel = LEDGER_CHANNEL
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return None
+
+            def poll(listener, *, timeout, window):
+                timeouts.append(timeout)
+                if len(timeouts) == 1:
+                    # committed and notified, but 2 s short of the consumer horizon
+                    posted.extend(self._post())
+                    horizon[0] = posted[0].created_at - timedelta(seconds=2)
+                    return [LedgerChange(company_id=self.company_id, sequence=posted[0].sequence)]
+                if len(timeouts) == 2:
+                    horizon[0] = posted[0].created_at
+                    return []
+                raise Stop
+
+        command = "apps.inventory.management.commands.ledger_cdc_consume"
+        with mock.patch("apps.inventory.ledger_sequence.settled_horizon", side_effect=lambda: horizon[0]), mock.patch(
+            f"{command}.connections", {"default": mock.Mock(vendor="postgresql")}
+        ), mock.patch(f"{command}.LedgerListener", FakeListener), self.assertRaises(Stop):
+            call_command(
+                "ledger_cdc_consume",
+                "--consumer",
+                "mes",
+                "--handler",
+                f"{__name__}.collect",
+                "--resync-seconds",
+                "30",
+                stderr=StringIO(),
+            )
+
+        # the second poll waits for the held row (2 s), not for the 30 s resync timer
+        self.assertEqual(timeouts[:2], [30.0, 2.0])
+        self.assertEqual([r["id"] for r in COLLECTED], [posted[0].id])
+
+    def test_listen_requires_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command("ledger_cdc_consume", "--consumer", "mes", "--handler", f"{__name__}.collect", stderr=StringIO())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import gzip
+import json
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from apps.inventory.ledger_export import export_ledger, import_ledger_export
+from apps.inventory.models import Part, StockLedgerEntry
+from apps.inventory.reversals import reverse_document
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "part_id",
+    "sequence",
+    "created_at",
+    "movement_type",
+    "qty",
+    "unit_cost",
+    "transaction_value",
+    "reverse_of_id",
+    "source_ref",
+)
+
+
+class LedgerExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-EXP",
+            name="Export RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+        rows = (("in", "10.1234", "GR-1"), ("out", "2.5", "ISSUE-1"), ("in", "0.0001", "GR-2"))
+        for movement_type, qty, doc in rows:
+            StockLedgerEntry.objects.create(
+                company_id=cls.company_id,
+                part=cls.part,
+                movement_type=movement_type,
+                source_type="purchase" if movement_type == "in" else "production",
+                qty=Decimal(qty),
+                unit_cost=Decimal("2"),
+                source_ref={"doc": doc, "note": 'line "1",\nsplit'},
+            )
+        reverse_document(cls.company_id, source_ref={"doc": "ISSUE-1", "note": 'line "1",\nsplit'}, reason="test")
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def _snapshot(self):
+        return list(
+            StockLedgerEntry.objects.filter(company_id=self.company_id)
+            .order_by("sequence")
+            .values_list(*SNAPSHOT_FIELDS)
+        )
+
+    def test_export_manifest_and_scaled_decimals(self):
+        result = export_ledger(self.tmp / "out", company_ids=[self.company_id], row_group_rows=3)
+
+        manifest = json.loads((self.tmp / "out" / "manifest.json").read_text())
+        self.assertEqual((result.rows, manifest["rows"]), (4, 4))
+        sequences = [row[SNAPSHOT_FIELDS.index("sequence")] for row in self._snapshot()]
+        self.assertEqual(
+            [(g["first_sequence"], g["rows"]) for g in manifest["row_groups"]],
+            [(sequences[0], 3), (sequences[3], 1)],
+        )
+        self.assertEqual(manifest["columns"][7], {"name": "qty_e6", "kind": "int64", "scale": 6})
+
+        with gzip.open(self.tmp / "out" / "ledger.csv.gz", "rt", newline="") as fh:
+            lines = fh.read()
+        self.assertTrue(lines.startswith("id,company_id,part_id,sequence,created_at,"))
+        self.assertIn(",10123400,20000,202468,", lines)  # 10.1234 x 2 = 20.2468
+        self.assertIn(",100,20000,2,", lines)  # 0.0001 x 2 = 0.0002
+
+    def test_round_trip_into_empty_database(self):
+        before = self._snapshot()
+        call_command(
+            "export_ledger", "--output", str(self.tmp / "out"), "--company-id", str(self.company_id), stdout=StringIO()
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {StockLedgerEntry._meta.db_table}")
+        self.assertEqual(self._snapshot(), [])
+
+        out = StringIO()
+        call_command("import_ledger_export", str(self.tmp / "out"), stdout=out)
+
+        self.assertIn("imported rows=4 parts=1", out.getvalue())
+        self.assertEqual(self._snapshot(), before)
+        with self.assertRaises(CommandError):
+            call_command("import_ledger_export", str(self.tmp / "out"), stdout=StringIO())
+
+    def test_checksum_mismatch_rolls_back(self):
+        export_ledger(self.tmp / "out", company_ids=[self.company_id])
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {StockLedgerEntry._meta.db_table}")
+        manifest_path = self.tmp / "out" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["files"]["ledger"]["sha256"] = "0" * 64
+        manifest_path.write_text(json.dumps(manifest))
+
+        with self.assertRaisesMessage(ValueError, "Checksum mismatch"):
+            import_ledger_export(self.tmp / "out")
+        self.assertEqual(self._snapshot(), [])
+
+    def test_rejects_non_empty_target(self):
+        (self.tmp / "busy").mkdir()
+        (self.tmp / "busy" / "x").write_text("x")
+        with self.assertRaises(ValueError):
+            export_ledger(self.tmp / "busy")
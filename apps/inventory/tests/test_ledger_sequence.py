@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipIf
+from uuid import uuid4
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+
+from apps.inventory.ledger_sequence import (
+    iter_ledger_batches,
+    ledger_head,
+    ledger_heads,
+    ledger_rows_after,
+    settled_horizon,
+    settles_in,
+)
+from apps.inventory.models import Part, StockLedgerEntry
+
+
+class LedgerSequenceTestsMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_a = uuid4()
+        cls.company_b = uuid4()
+        cls.part_a = cls._part(cls.company_a)
+        cls.part_b = cls._part(cls.company_b)
+
+    @classmethod
+    def _part(cls, company_id):
+        return Part.objects.create(
+            company_id=company_id,
+            part_no="RM-SEQ",
+            name="Seq RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def _post_committed(self, part, **extra):
+        # PostgreSQL moves the company head in transaction.on_commit
+        with self.captureOnCommitCallbacks(execute=True):
+            return self._post(part, **extra)
+
+    def _post(self, part, *, doc=None, **extra):
+        fields = {
+            "company_id": part.company_id,
+            "part": part,
+            "movement_type": StockLedgerEntry.MovementType.IN,
+            "source_type": StockLedgerEntry.SourceType.PURCHASE,
+            "qty": Decimal("1"),
+            "unit_cost": Decimal("1"),
+            "source_ref": {"doc": doc or str(uuid4())},
+        }
+        fields.update(extra)
+        return StockLedgerEntry.objects.create(**fields)
+
+
+# PostgreSQL draws from one shared sequence and holds fresh rows back; these
+# tests hold on every backend (no holdback, on_commit callbacks run).
+@override_settings(LEDGER_CONSUMER_HOLDBACK_SECONDS=0)
+class LedgerSequenceTests(LedgerSequenceTestsMixin, TestCase):
+    def test_per_company_sequences_increase(self):
+        a = [self._post_committed(self.part_a).sequence for _ in range(3)]
+        b = [self._post_committed(self.part_b).sequence for _ in range(2)]
+
+        self.assertEqual(a, sorted(set(a)))
+        self.assertEqual(b, sorted(set(b)))
+        self.assertEqual(ledger_heads(), {self.company_a: a[-1], self.company_b: b[-1]})
+        self.assertEqual(ledger_head(uuid4()), 0)
+
+    def test_rolled_back_insert_is_never_read(self):
+        first = self._post_committed(self.part_a)
+        try:
+            with transaction.atomic():
+                self._post(self.part_a)
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        last = self._post_committed(self.part_a)
+
+        self.assertGreater(last.sequence, first.sequence)
+        self.assertEqual([r["id"] for r in ledger_rows_after(self.company_a, 0)], [first.id, last.id])
+
+    def test_idempotent_duplicate_does_not_consume_a_number(self):
+        first = self._post_committed(self.part_a, doc="GR-1", idempotency_key="k-1", idempotency_scope="test")
+        dup = self._post_committed(self.part_a, doc="GR-1", idempotency_key="k-1", idempotency_scope="test")
+
+        self.assertEqual(ledger_head(self.company_a), first.sequence)
+        self.assertEqual(StockLedgerEntry.objects.filter(company_id=self.company_a).count(), 1)
+        self.assertEqual(dup.pk, first.pk)
+
+    def test_rows_after_in_batches(self):
+        posted = [self._post_committed(self.part_a) for _ in range(5)]
+        self._post_committed(self.part_b)
+        seqs = [e.sequence for e in posted]
+
+        rows = ledger_rows_after(self.company_a, seqs[1], batch_size=2, fields=("id", "qty"))
+        self.assertEqual([r["sequence"] for r in rows], seqs[2:4])
+        self.assertEqual([r["id"] for r in rows], [e.id for e in posted[2:4]])
+
+        batches = list(iter_ledger_batches(self.company_a, batch_size=2))
+        self.assertEqual([[r["sequence"] for r in b] for b in batches], [seqs[:2], seqs[2:4], seqs[4:]])
+
+    def test_two_entries_in_one_transaction(self):
+        opening = self._post_committed(self.part_a)
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            receipt = self._post(self.part_a, qty=Decimal("3"))
+            # OUT takes the part lock; on PostgreSQL its sequence is drawn after it (lock order)
+            issue = self._post(self.part_a, movement_type=StockLedgerEntry.MovementType.OUT, qty=Decimal("2"))
+
+        self.assertLess(opening.sequence, receipt.sequence)
+        self.assertLess(receipt.sequence, issue.sequence)
+        self.assertEqual(ledger_head(self.company_a), issue.sequence)
+        self.assertEqual(
+            [r["sequence"] for r in ledger_rows_after(self.company_a, opening.sequence)],
+            [receipt.sequence, issue.sequence],
+        )
+
+    def test_rows_after_stops_at_first_unsettled_row(self):
+        rows = [self._post_committed(self.part_a) for _ in range(3)]
+        # row 2 committed late (younger than row 3): nothing past it is returned
+        now = rows[2].created_at
+        StockLedgerEntry.objects.filter(pk=rows[1].pk).update(created_at=now + timedelta(seconds=5))
+
+        settled = ledger_rows_after(self.company_a, 0, settled_before=now)
+        self.assertEqual([r["sequence"] for r in settled], [rows[0].sequence])
+
+
+@skipIf(connection.vendor != "postgresql", "database sequence path (PostgreSQL only)")
+class DatabaseSequenceHoldbackTests(LedgerSequenceTestsMixin, TestCase):
+    @override_settings(LEDGER_CONSUMER_HOLDBACK_SECONDS=60, LEDGER_CONSUMER_CLOCK_SKEW_SECONDS=60)
+    def test_fresh_rows_are_held_back(self):
+        entry = self._post_committed(self.part_a)
+
+        self.assertIsNotNone(settled_horizon())
+        self.assertEqual(ledger_rows_after(self.company_a, 0), [])
+        self.assertEqual(ledger_head(self.company_a), entry.sequence)
+        self.assertGreater(settles_in(self.company_a, 0), 0)
+
+
+@skipIf(connection.vendor == "postgresql", "counter-row path (non-PostgreSQL only)")
+class CounterRowSequenceTests(LedgerSequenceTestsMixin, TestCase):
+    def test_per_company_sequences_are_dense(self):
+        a = [self._post(self.part_a).sequence for _ in range(3)]
+        b = [self._post(self.part_b).sequence for _ in range(2)]
+
+        self.assertEqual(a, [1, 2, 3])
+        self.assertEqual(b, [1, 2])
+        self.assertEqual(ledger_heads(), {self.company_a: 3, self.company_b: 2})
+        self.assertIsNone(settled_horizon())  # commit-ordered: no holdback
+
+    def test_rolled_back_insert_leaves_no_gap(self):
+        self._post(self.part_a)
+        try:
+            with transaction.atomic():
+                self._post(self.part_a)
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        self.assertEqual(self._post(self.part_a).sequence, 2)
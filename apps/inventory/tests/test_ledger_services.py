@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import threading
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connections
+from django.db.models import Model
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from apps.audit.models import AuditEvent
+from apps.inventory import services, views
+from apps.inventory.models import Part, StockLedgerEntry
+from apps.inventory.services import aemit_audit_event, aget_stock_summary, apost_ledger_entry, post_ledger_entry
+from apps.tenancy.context import clear_active_scope, set_active_scope
+
+
+def _part(company_id, part_no="RM-SVC"):
+    return Part.objects.create(
+        company_id=company_id,
+        part_no=part_no,
+        name="Service RM",
+        part_type=Part.PartType.RAW_MATERIAL,
+        procurement_strategy=Part.ProcurementStrategy.BUY,
+    )
+
+
+def _fields(part, movement_type="in", qty="5", **extra):
+    fields = {
+        "company_id": part.company_id,
+        "part_id": part.id,
+        "movement_type": movement_type,
+        "source_type": "purchase" if movement_type == "in" else "production",
+        "qty": Decimal(qty),
+        "unit_cost": Decimal("2"),
+        "source_ref": {"doc": str(uuid4())},
+    }
+    fields.update(extra)
+    return fields
+
+
+@override_settings(LEDGER_ASYNC_WORKERS=0)
+class LedgerServiceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = _part(cls.company_id)
+
+    def tearDown(self):
+        clear_active_scope()
+
+    def test_post_is_idempotent(self):
+        fields = _fields(self.part, idempotency_key="k-1", idempotency_scope="COMPANY")
+        entry, created = post_ledger_entry(**fields)
+        dup, dup_created = post_ledger_entry(**dict(fields, source_ref={"doc": "other"}))
+
+        self.assertTrue(created)
+        self.assertFalse(dup_created)
+        self.assertEqual((dup.pk, dup.sequence), (entry.pk, entry.sequence))
+
+    def test_insert_race_reports_the_stored_duplicate(self):
+        fields = _fields(self.part, idempotency_key="k-2", idempotency_scope="COMPANY")
+        stored, _ = post_ledger_entry(**fields)
+
+        # the fast-path probe misses, the insert loses the race, the retry finds the winner
+        probe = mock.patch.object(
+            StockLedgerEntry, "_find_idempotent_duplicate_v2", autospec=True, side_effect=[None, stored]
+        )
+        with probe, mock.patch.object(Model, "save", side_effect=IntegrityError("duplicate key")):
+            dup, created = post_ledger_entry(**dict(fields, source_ref={"doc": "other"}))
+
+        self.assertFalse(created)
+        self.assertEqual((dup.pk, dup.sequence), (stored.pk, stored.sequence))
+        self.assertEqual(StockLedgerEntry.objects.filter(company_id=self.company_id).count(), 1)
+
+    async def test_async_post_and_summary(self):
+        entry, created = await apost_ledger_entry(**_fields(self.part))
+        self.assertTrue(created)
+        self.assertIsNotNone(entry.sequence)
+
+        summary = await aget_stock_summary(self.company_id, self.part.id)
+        self.assertEqual(summary.available_qty, Decimal("5"))
+        self.assertIsNone(await aget_stock_summary(uuid4(), self.part.id))
+
+        with self.assertRaises(ValidationError):
+            await apost_ledger_entry(**_fields(self.part, movement_type="out", qty="50"))
+
+    async def test_async_audit_emit(self):
+        await aemit_audit_event(
+            event_name="inventory.negative_stock.blocked",
+            payload={
+                "part_id": str(self.part.id),
+                "movement_type": "out",
+                "source_type": "production",
+                "qty": "1",
+                "delta_qty": "-1",
+                "current_available_qty": "0",
+                "projected_available_qty": "-1",
+                "unit_cost": "1",
+                "reference_price": None,
+                "source_ref": {},
+                "idempotency_key": None,
+                "idempotency_scope": None,
+            },
+            context=SimpleNamespace(company_id=self.company_id, is_system=False),
+        )
+        self.assertTrue(await AuditEvent.objects.filter(company_id=self.company_id).aexists())
+
+    def test_sync_view(self):
+        set_active_scope(company_id=self.company_id)
+        body = {k: str(v) for k, v in _fields(self.part).items() if k != "source_ref"}
+        body["source_ref"] = {"doc": "GR-1"}
+        request = RequestFactory().post("/", body, content_type="application/json")
+
+        response = views.ledger_entry_create(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            json.loads(response.content)["sequence"], StockLedgerEntry.objects.get(company_id=self.company_id).sequence
+        )
+
+        bad = RequestFactory().post("/", {"part_id": "nope"}, content_type="application/json")
+        self.assertEqual(views.ledger_entry_create(bad).status_code, 400)
+
+    async def test_async_views_use_tenant_scope(self):
+        set_active_scope(company_id=self.company_id)
+        body = {
+            "part_id": str(self.part.id),
+            "movement_type": "in",
+            "source_type": "purchase",
+            "qty": "3",
+            "unit_cost": "2",
+            "source_ref": {"doc": "GR-2"},
+            # ignored: company comes from the tenant scope
+            "company_id": str(uuid4()),
+        }
+        factory = AsyncRequestFactory()
+        response = await views.aledger_entry_create(factory.post("/", body, content_type="application/json"))
+        self.assertEqual(response.status_code, 201)
+
+        response = await views.astock_summary(factory.get("/"), self.part.id)
+        self.assertEqual(json.loads(response.content)["available_qty"], "3.000000")
+
+        set_active_scope(company_id=uuid4())
+        response = await views.aledger_entry_create(factory.post("/", body, content_type="application/json"))
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(LEDGER_ASYNC_WORKERS=2)
+class LedgerWorkerPoolTests(TransactionTestCase):
+    def tearDown(self):
+        connections.close_all()
+
+    async def test_posts_run_on_the_ledger_pool(self):
+        company_id = uuid4()
+        part = await sync_to_async(_part)(company_id)
+
+        threads = []
+
+        def post(**fields):
+            threads.append(threading.current_thread().name)
+            return post_ledger_entry(**fields)
+
+        with mock.patch.object(services, "post_ledger_entry", post):
+            entry, _ = await apost_ledger_entry(**_fields(part))
+
+        self.assertTrue(threads[0].startswith("ledger-post"))
+        self.assertIsNotNone(entry.sequence)
+        self.assertEqual(await StockLedgerEntry.objects.filter(company_id=company_id).acount(), 1)
+
+    def test_load_test_command(self):
+        # concurrency 1: shared-cache SQLite raises (not waits) on concurrent writers
+        out = StringIO()
+        call_command("bench_ledger_asgi", "--requests", "6", "--parts", "2", "--concurrency", "1", stdout=out)
+
+        results = {r["name"]: r for r in json.loads(out.getvalue())["results"]}
+        self.assertEqual(set(results), {"ledger.post.wsgi", "ledger.post.asgi", "ledger.post.asgi_thread_sensitive"})
+        self.assertTrue(all(r["ops"] == 6 and r["errors"] == 0 for r in results.values()))
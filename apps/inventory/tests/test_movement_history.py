@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from uuid import uuid4
+
+from django.test import RequestFactory, TestCase
+
+from apps.inventory import views
+from apps.inventory.history import movement_history
+from apps.inventory.models import Part, StockLedgerEntry
+from apps.tenancy.context import clear_active_scope, set_active_scope
+
+
+class MovementHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-HIST",
+            name="History RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+        # balance after each row: 10, 7, 12, 11, 9
+        for movement_type, source_type, qty in (
+            ("in", "purchase", "10"),
+            ("out", "production", "3"),
+            ("in", "purchase", "5"),
+            ("adjustment", "adjustment", "-1"),
+            ("out", "production", "2"),
+        ):
+            StockLedgerEntry.objects.create(
+                company_id=cls.company_id,
+                part=cls.part,
+                movement_type=movement_type,
+                source_type=source_type,
+                qty=Decimal(qty),
+                unit_cost=Decimal("1"),
+                source_ref={"doc": str(uuid4())},
+            )
+
+    def test_cursor_pages_keep_running_balance(self):
+        first = movement_history(self.company_id, self.part.id, limit=2)
+        second = movement_history(self.company_id, self.part.id, limit=2, after=first.next_cursor)
+        last = movement_history(self.company_id, self.part.id, limit=2, after=second.next_cursor)
+
+        rows = first.rows + second.rows + last.rows
+        self.assertEqual([r.running_balance for r in rows], [Decimal(v) for v in ("10", "7", "12", "11", "9")])
+        self.assertEqual([r.sequence for r in rows], sorted(r.sequence for r in rows))
+        self.assertIsNone(last.next_cursor)
+
+    def test_filters_do_not_change_the_balance(self):
+        page = movement_history(self.company_id, self.part.id, movement_type="out")
+
+        self.assertEqual(
+            [(r.qty, r.running_balance) for r in page.rows], [(Decimal("3"), Decimal("7")), (Decimal("2"), Decimal("9"))]
+        )
+        self.assertEqual(movement_history(self.company_id, uuid4()).rows, [])
+
+    def test_filtered_pages_seed_from_opening_balance(self):
+        first = movement_history(self.company_id, self.part.id, movement_type="out", limit=1)
+        second = movement_history(self.company_id, self.part.id, movement_type="out", limit=1, after=first.next_cursor)
+
+        self.assertEqual([r.running_balance for r in first.rows + second.rows], [Decimal("7"), Decimal("9")])
+        self.assertIsNone(second.next_cursor)
+
+    def test_invalid_cursor_and_limit(self):
+        with self.assertRaises(ValueError):
+            movement_history(self.company_id, self.part.id, after="not-a-cursor")
+        with self.assertRaises(ValueError):
+            movement_history(self.company_id, self.part.id, limit=0)
+
+    def test_view_uses_tenant_scope(self):
+        set_active_scope(company_id=self.company_id)
+        self.addCleanup(clear_active_scope)
+
+        request = RequestFactory().get("/", {"limit": "4", "source_type": "purchase"})
+        response = views.part_movement_history(request, self.part.id)
+
+        body = json.loads(response.content)
+        self.assertEqual([r["running_balance"] for r in body["results"]], ["10.000000", "12.000000"])
+        self.assertIsNone(body["next_cursor"])
+        bad = views.part_movement_history(RequestFactory().get("/", {"limit": "x"}), self.part.id)
+        self.assertEqual(bad.status_code, 400)
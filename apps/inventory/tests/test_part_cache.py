@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest import mock
+from uuid import uuid4
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.inventory import part_cache as part_cache_module
+from apps.inventory.models import BOM, BOMItem, Part, StockLedgerEntry
+from apps.inventory.part_cache import PartAttributeCache, PartAttrs, part_cache
+
+
+class PartAttributeCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.rm = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-CACHE",
+            name="Cache RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+        cls.sf = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="SF-CACHE",
+            name="Cache SF",
+            part_type=Part.PartType.SEMI_FINISHED,
+            procurement_strategy=Part.ProcurementStrategy.MAKE,
+        )
+
+    def setUp(self):
+        part_cache.clear()
+
+    def _post(self):
+        with CaptureQueriesContext(connection) as ctx:
+            StockLedgerEntry.objects.create(
+                company_id=self.company_id,
+                part_id=self.rm.id,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal("1"),
+                unit_cost=Decimal("1"),
+                source_ref={"doc": str(uuid4())},
+            )
+        return len(ctx)
+
+    def test_warm_cache_saves_a_query_per_ledger_write(self):
+        self._post()  # first insert also creates the stock summary row
+        part_cache.clear()
+        cold = self._post()
+        warm = self._post()
+
+        self.assertEqual(warm, cold - 1)
+        self.assertEqual(part_cache.get(self.company_id, self.rm.id), PartAttrs(self.company_id, "raw_material", "buy"))
+
+    def test_part_save_invalidates(self):
+        part_cache.get(self.company_id, self.sf.id)
+        self.sf.procurement_strategy = Part.ProcurementStrategy.BUY
+        self.sf.save()
+
+        self.assertEqual(part_cache.get(self.company_id, self.sf.id).procurement_strategy, "buy")
+
+    def test_cached_identity_fields_are_write_once(self):
+        part_cache.get(self.company_id, self.sf.id)
+        for field, value in (("part_type", Part.PartType.RAW_MATERIAL), ("company_id", uuid4())):
+            part = Part.objects.get(id=self.sf.id)
+            setattr(part, field, value)
+            with self.assertRaisesMessage(ValidationError, f"{field} cannot change once the part exists"):
+                part.save()
+
+        self.assertEqual(Part.objects.get(id=self.sf.id).part_type, Part.PartType.SEMI_FINISHED)
+        self.assertEqual(part_cache.get(self.company_id, self.sf.id).part_type, "semi_finished")
+
+    def test_invalidate_drops_the_loaded_company_key(self):
+        part = Part.objects.get(id=self.rm.id)
+        part_cache.get(self.company_id, part.id)
+        part.company_id = uuid4()
+
+        part_cache_module.invalidate_part(part)
+
+        self.assertEqual(len(part_cache), 0)
+
+    def test_cross_company_lookup_is_not_cached(self):
+        other_company = uuid4()
+        attrs = part_cache.get(other_company, self.rm.id)
+
+        self.assertEqual(attrs.company_id, self.company_id)
+        self.assertEqual(len(part_cache), 0)
+        with self.assertRaises(ValidationError):
+            StockLedgerEntry.objects.create(
+                company_id=other_company,
+                part_id=self.rm.id,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal("1"),
+                unit_cost=Decimal("1"),
+                source_ref={"doc": "x"},
+            )
+
+    def test_bom_validation_by_id_uses_cache(self):
+        fg = Part.objects.create(
+            company_id=self.company_id,
+            part_no="FG-CACHE",
+            name="Cache FG",
+            part_type=Part.PartType.FINISHED_GOOD,
+            procurement_strategy=Part.ProcurementStrategy.MAKE,
+        )
+        bom = BOM.objects.create(company_id=self.company_id, parent_part_id=fg.id)
+        BOMItem.objects.create(company_id=self.company_id, bom=bom, component_part_id=self.rm.id, qty_per=Decimal("1"))
+
+        with self.assertRaises(ValidationError):
+            BOMItem(company_id=self.company_id, bom=bom, component_part_id=fg.id, qty_per=Decimal("1")).full_clean()
+        self.assertGreaterEqual(part_cache.hits + part_cache.misses, 3)
+
+    def test_lru_and_ttl(self):
+        cache = PartAttributeCache(max_size=1, ttl_seconds=60)
+        cache.get(self.company_id, self.rm.id)
+        cache.get(self.company_id, self.sf.id)
+        self.assertEqual(len(cache), 1)
+
+        with mock.patch.object(part_cache_module.time, "monotonic", return_value=1e12):
+            with self.assertNumQueries(1):
+                cache.get(self.company_id, self.sf.id)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import io
+from uuid import uuid4
+
+from django.test import TestCase
+
+from apps.inventory.importers import import_parts, iter_records
+from apps.inventory.models import Part
+
+
+CSV_HEADER = "part_no,name,part_type,procurement_strategy,is_saleable,standard_cost\n"
+
+
+class PartImportTests(TestCase):
+    def setUp(self) -> None:
+        self.company_id = uuid4()
+        Part.objects.create(
+            company_id=self.company_id,
+            part_no="RM-EXISTING",
+            name="Existing",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def _csv(self, body: str):
+        return iter_records(io.StringIO(CSV_HEADER + body), "csv")
+
+    def test_valid_rows_are_bulk_created_and_errors_reported_per_line(self):
+        body = (
+            "RM-1,Raw 1,raw_material,buy,0,1.5000\n"
+            "FG-1,Finished 1,finished_good,buy,1,\n"  # finished_good MUST make
+            "RM-EXISTING,Dup of DB,raw_material,buy,0,\n"
+            "RM-1,Dup in file,raw_material,buy,0,\n"
+            "SF-1,Semi 1,semi_finished,make,no,\n"
+            "XX-1,Bad type,unknown_type,buy,0,\n"
+        )
+
+        # preload + one bulk INSERT, plus SAVEPOINT/RELEASE for the import transaction
+        with self.assertNumQueries(4):
+            result = import_parts(self.company_id, self._csv(body), batch_size=100)
+
+        self.assertEqual(result.total_rows, 6)
+        self.assertEqual(result.created, 2)
+        self.assertEqual({e.line_no for e in result.errors}, {3, 4, 5, 7})
+        self.assertIn("finished_good MUST make", next(e.message for e in result.errors if e.line_no == 3))
+        self.assertIn("already exists", next(e.message for e in result.errors if e.line_no == 4))
+        self.assertIn("already exists", next(e.message for e in result.errors if e.line_no == 5))
+
+        self.assertEqual(
+            set(Part.objects.filter(company_id=self.company_id).values_list("part_no", flat=True)),
+            {"RM-EXISTING", "RM-1", "SF-1"},
+        )
+
+    def test_dry_run_validates_without_writing(self):
+        result = import_parts(self.company_id, self._csv("RM-1,Raw 1,raw_material,buy,0,\n"), dry_run=True)
+
+        self.assertEqual(result.valid_rows, 1)
+        self.assertEqual(result.created, 0)
+        self.assertFalse(Part.objects.filter(company_id=self.company_id, part_no="RM-1").exists())
+
+    def test_jsonl_records_and_invalid_json(self):
+        stream = io.StringIO(
+            '{"part_no": "CS-1", "name": "Glue", "part_type": "consumable", "procurement_strategy": "buy"}\n'
+            "not-json\n"
+        )
+
+        result = import_parts(self.company_id, iter_records(stream, "jsonl"))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([e.line_no for e in result.errors], [2])
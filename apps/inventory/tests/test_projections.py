@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from io import StringIO
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.inventory.models import Part, PartSourceMovementTotal, ProjectionCheckpoint, StockLedgerEntry
+from apps.inventory.projections import (
+    PART_SOURCE_MOVEMENT_TOTALS,
+    catch_up,
+    get_projection,
+    pending_companies,
+    register_projection,
+    replay,
+)
+
+
+NAME = PART_SOURCE_MOVEMENT_TOTALS.name
+
+
+# no holdback: freshly posted rows are readable on PostgreSQL too
+@override_settings(LEDGER_CONSUMER_HOLDBACK_SECONDS=0)
+class ProjectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-PROJ",
+            name="Projection RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def _post(self, movement_type, source_type, qty, unit_cost="2"):
+        # PostgreSQL moves the company head (pending_companies) in transaction.on_commit
+        with self.captureOnCommitCallbacks(execute=True):
+            return StockLedgerEntry.objects.create(
+                company_id=self.company_id,
+                part=self.part,
+                movement_type=movement_type,
+                source_type=source_type,
+                qty=Decimal(qty),
+                unit_cost=Decimal(unit_cost),
+                source_ref={"doc": str(uuid4())},
+            )
+
+    def _totals(self):
+        return {
+            (t.source_type, t.movement_type): (t.qty_total, t.value_total, t.entry_count)
+            for t in PartSourceMovementTotal.objects.filter(company_id=self.company_id)
+        }
+
+    def _seed(self):
+        IN, OUT = StockLedgerEntry.MovementType.IN, StockLedgerEntry.MovementType.OUT
+        PURCHASE, PRODUCTION = StockLedgerEntry.SourceType.PURCHASE, StockLedgerEntry.SourceType.PRODUCTION
+        self._post(IN, PURCHASE, 10, "2")
+        self._post(IN, PURCHASE, 5, "4")
+        self._post(OUT, PRODUCTION, 3, "3")
+
+    def test_ledger_insert_does_not_touch_projections(self):
+        self._seed()
+        self.assertFalse(PartSourceMovementTotal.objects.exists())
+        self.assertFalse(ProjectionCheckpoint.objects.exists())
+
+    def test_catch_up_in_batches_and_checkpoint(self):
+        self._seed()
+
+        run = catch_up(NAME, batch_size=2)
+        self.assertEqual((run.rows, run.batches), (3, 2))
+        self.assertEqual(
+            self._totals(),
+            {
+                ("purchase", "in"): (Decimal("15"), Decimal("40"), 2),
+                ("production", "out"): (Decimal("3"), Decimal("9"), 1),
+            },
+        )
+
+        # idempotent at the head, incremental afterwards
+        self.assertEqual(catch_up(NAME).rows, 0)
+        last = self._post(StockLedgerEntry.MovementType.IN, StockLedgerEntry.SourceType.PURCHASE, 1, "1")
+        self.assertEqual(catch_up(NAME).rows, 1)
+        self.assertEqual(self._totals()[("purchase", "in")], (Decimal("16"), Decimal("41"), 3))
+
+        checkpoint = ProjectionCheckpoint.objects.get(name=NAME, company_id=self.company_id)
+        self.assertEqual((checkpoint.last_sequence, checkpoint.rows_applied), (last.sequence, 4))
+
+    def test_replay_rebuilds_from_scratch(self):
+        self._seed()
+        catch_up(NAME)
+        expected = self._totals()
+
+        PartSourceMovementTotal.objects.update(qty_total=Decimal("999"))
+        run = replay(NAME)
+
+        self.assertEqual(run.rows, 3)
+        self.assertEqual(self._totals(), expected)
+        self.assertEqual(ProjectionCheckpoint.objects.get(name=NAME).rows_applied, 3)
+
+    def test_companies_are_checkpointed_independently(self):
+        self._seed()
+        other_company = uuid4()
+        other = Part.objects.create(
+            company_id=other_company,
+            part_no="RM-PROJ",
+            name="Other RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            StockLedgerEntry.objects.create(
+                company_id=other_company,
+                part=other,
+                movement_type=StockLedgerEntry.MovementType.IN,
+                source_type=StockLedgerEntry.SourceType.PURCHASE,
+                qty=Decimal("1"),
+                unit_cost=Decimal("1"),
+                source_ref={"doc": "other"},
+            )
+
+        self.assertEqual(catch_up(NAME, company_id=other_company).rows, 1)
+        self.assertEqual(pending_companies(NAME), [self.company_id])
+        run = catch_up(NAME)
+        self.assertEqual((run.rows, run.companies), (3, 1))
+        self.assertEqual(pending_companies(NAME), [])
+
+    def test_registry(self):
+        with self.assertRaises(ValueError):
+            register_projection(PART_SOURCE_MOVEMENT_TOTALS)
+        with self.assertRaises(ValueError):
+            get_projection("nope")
+
+    def test_command(self):
+        self._seed()
+        out = StringIO()
+        call_command("run_projections", "--projection", NAME, stdout=out)
+        self.assertIn("rows=3", out.getvalue())
+
+        out = StringIO()
+        call_command("run_projections", "--replay", stdout=out)
+        self.assertIn(f"replayed {NAME} rows=3", out.getvalue())
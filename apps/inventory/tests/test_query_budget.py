@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from io import StringIO
+from itertools import count
+from types import SimpleNamespace
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.audit.constants import EMIT_QUERY_BUDGET
+from apps.audit.hooks import emit_audit_event
+from apps.inventory.constants import QueryBudgets
+from apps.inventory.models import BOM, BOMItem, Part, PartStockSummary, StockLedgerEntry
+from factory_manager.query_budget import QueryBudgetExceeded, QueryBudgetTestMixin, query_budget, sql_shape
+
+
+class QueryBudgetHelperTests(QueryBudgetTestMixin, TestCase):
+    def test_sql_shape_drops_parameters(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+        self.assertEqual(sql_shape('SAVEPOINT "s1_x2"'), sql_shape('SAVEPOINT "s9_x7"'))
+
+    def test_raise_mode_reports_repeated_shapes(self):
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(1, name="n_plus_one", mode="raise"):
+                for _ in range(3):
+                    list(Part.objects.filter(part_no=str(uuid4())))
+
+        report = ctx.exception.report
+        self.assertEqual(report.executed, 3)
+        self.assertEqual(report.repeated_shapes()[0][1], 3)
+        self.assertIn("3x SELECT", str(ctx.exception))
+
+    def test_log_mode_warns_and_off_mode_is_inert(self):
+        with self.assertLogs("factory_manager.query_budget", level="WARNING"):
+            with query_budget(0, name="logged", mode="log"):
+                Part.objects.exists()
+
+        budget = query_budget(0, mode="off")
+        with budget:
+            Part.objects.exists()
+        self.assertIsNone(budget.report)
+
+    def test_decorator_uses_a_fresh_budget_per_call(self):
+        @query_budget(1, mode="raise")
+        def one_query():
+            return Part.objects.exists()
+
+        one_query()
+        one_query()
+
+    def test_block_exception_wins(self):
+        with self.assertRaises(ValueError):
+            with query_budget(0, mode="raise"):
+                Part.objects.exists()
+                raise ValueError("boom")
+
+
+class CriticalPathBudgetTests(QueryBudgetTestMixin, TestCase):
+    """
+    Guarded budgets for inventory and audit paths (see apps.inventory.constants.QueryBudgets).
+    """
+
+    seq = count()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.rm = cls._part("RM", Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY)
+        cls.sf = cls._part("SF", Part.PartType.SEMI_FINISHED, Part.ProcurementStrategy.MAKE)
+
+    @classmethod
+    def _part(cls, prefix, part_type, strategy):
+        i = next(cls.seq)
+        return Part.objects.create(
+            company_id=cls.company_id,
+            part_no=f"{prefix}-{i}",
+            name=f"{prefix} {i}",
+            part_type=part_type,
+            procurement_strategy=strategy,
+        )
+
+    def _entry(self, part, movement_type, qty, *, source_type=None, reverse_of=None, unit_cost="2"):
+        IN = StockLedgerEntry.MovementType.IN
+        return StockLedgerEntry(
+            company_id=self.company_id,
+            part=part,
+            movement_type=movement_type,
+            source_type=source_type or (StockLedgerEntry.SourceType.PURCHASE if movement_type == IN else StockLedgerEntry.SourceType.PRODUCTION),
+            qty=Decimal(qty),
+            unit_cost=Decimal(unit_cost),
+            reverse_of=reverse_of,
+            source_ref={"doc": str(uuid4())},
+        )
+
+    def test_ledger_in_out_reverse(self):
+        IN, OUT = StockLedgerEntry.MovementType.IN, StockLedgerEntry.MovementType.OUT
+
+        with self.assertQueryBudget(QueryBudgets.LEDGER_SAVE):
+            self._entry(self.rm, IN, 10).save()
+        with self.assertQueryBudget(QueryBudgets.LEDGER_SAVE):
+            out = self._entry(self.rm, OUT, 4)
+            out.save()
+        with self.assertQueryBudget(QueryBudgets.LEDGER_SAVE):
+            self._entry(self.rm, IN, 4, source_type=StockLedgerEntry.SourceType.ADJUSTMENT, reverse_of=out).save()
+
+    def test_bom_and_item_save(self):
+        with self.assertQueryBudget(QueryBudgets.BOM_SAVE):
+            bom = BOM(company_id=self.company_id, parent_part=self.sf)
+            bom.save()
+        with self.assertQueryBudget(QueryBudgets.BOMITEM_SAVE):
+            BOMItem(company_id=self.company_id, bom=bom, component_part=self.rm, qty_per=Decimal("1")).save()
+
+    def test_audit_emit(self):
+        with self.assertQueryBudget(EMIT_QUERY_BUDGET):
+            emit_audit_event(
+                event_name="inventory.admin",
+                payload={"action": "test.budget"},
+                context=SimpleNamespace(company_id=self.company_id),
+            )
+
+    @override_settings(QUERY_BUDGET_MODE="raise")
+    def test_admin_changelists(self):
+        for _ in range(5):
+            part = self._part("RMX", Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY)
+            self._entry(part, StockLedgerEntry.MovementType.IN, 3).save()
+
+        user = get_user_model().objects.create_superuser(username="root", password="pass12345", email="r@example.com")
+        self.client.force_login(user)
+        for name in ("part", "bom", "bomitem", "stockledgerentry", "partstocksummary"):
+            resp = self.client.get(reverse(f"admin:inventory_{name}_changelist"))
+            self.assertEqual(resp.status_code, 200, name)
+        self.assertEqual(self.client.get(reverse("admin:audit_auditevent_changelist")).status_code, 200)
+
+    def test_rebuild_stock_summary_is_constant_in_part_count(self):
+        def rebuild_queries() -> int:
+            with CaptureQueriesContext(connection) as ctx:
+                call_command("rebuild_stock_summary", company_id=str(self.company_id), stdout=StringIO())
+            return len(ctx.captured_queries)
+
+        self._entry(self.rm, StockLedgerEntry.MovementType.IN, 5).save()
+        small = rebuild_queries()
+
+        for _ in range(8):
+            part = self._part("RMY", Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY)
+            self._entry(part, StockLedgerEntry.MovementType.IN, 5).save()
+        # one new part per chunk => INSERT on the first run, UPDATE afterwards
+        rebuild_queries()
+        self.assertEqual(rebuild_queries(), small)
+
+    def test_rebuild_part_ids_and_last_costs(self):
+        IN = StockLedgerEntry.MovementType.IN
+        self._entry(self.rm, IN, 5, unit_cost="2").save()
+        self._entry(self.rm, IN, 5, unit_cost="4").save()
+        self._entry(self.rm, IN, 5, source_type=StockLedgerEntry.SourceType.PRODUCTION, unit_cost="7").save()
+        other = self._part("RMZ", Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY)
+        self._entry(other, IN, 5).save()
+
+        PartStockSummary.objects.filter(company_id=self.company_id).update(
+            available_qty=Decimal("0"), last_purchase_cost=None, last_production_cost=None
+        )
+        call_command("rebuild_stock_summary", part_ids=str(self.rm.id), stdout=StringIO())
+
+        rm = PartStockSummary.objects.get(part=self.rm)
+        self.assertEqual(rm.available_qty, Decimal("15"))
+        self.assertEqual(rm.last_purchase_cost, Decimal("4"))
+        self.assertEqual(rm.last_production_cost, Decimal("7"))
+        self.assertEqual(PartStockSummary.objects.get(part=other).available_qty, Decimal("0"))
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_stock_summary", part_ids="not-a-uuid", stdout=StringIO())
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from uuid import uuid4
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.audit.models import AuditEvent
+from apps.inventory.hooks import on_reverse_batch
+from apps.inventory.models import Part, PartStockSummary, StockLedgerEntry
+from apps.inventory.reversals import reverse_document
+
+
+class ReverseDocumentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part_a = cls._part("RM-REV-A")
+        cls.part_b = cls._part("RM-REV-B")
+
+    @classmethod
+    def _part(cls, part_no):
+        return Part.objects.create(
+            company_id=cls.company_id,
+            part_no=part_no,
+            name=part_no,
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def _post(self, part, qty, doc, movement_type="in", line=None):
+        return StockLedgerEntry.objects.create(
+            company_id=self.company_id,
+            part=part,
+            movement_type=movement_type,
+            source_type="purchase" if movement_type == "in" else "production",
+            qty=Decimal(qty),
+            unit_cost=Decimal("3"),
+            source_ref={"doc": doc, "line": line if line is not None else str(uuid4())},
+        )
+
+    def _receipt(self, doc, lines):
+        for i, (part, qty) in enumerate(lines):
+            StockLedgerEntry.objects.create(
+                company_id=self.company_id,
+                part=part,
+                movement_type="in",
+                source_type="purchase",
+                qty=Decimal(qty),
+                unit_cost=Decimal("3"),
+                source_ref={"doc": doc},
+                idempotency_key=f"{doc}-{i}",
+                idempotency_scope="COMPANY",
+            )
+
+    def _available(self, part):
+        return PartStockSummary.objects.get(part=part).available_qty
+
+    def test_reverses_whole_document(self):
+        self._receipt("GR-1", [(self.part_a, 4), (self.part_a, 6), (self.part_b, 5)])
+        self._receipt("GR-2", [(self.part_b, 2)])
+        wac_before = PartStockSummary.objects.get(part=self.part_a).weighted_avg_cost
+
+        result = reverse_document(self.company_id, source_ref={"doc": "GR-1"}, reason="wrong supplier")
+
+        self.assertEqual(len(result.entries), 3)
+        last_receipt = StockLedgerEntry.objects.filter(reverse_of__isnull=True).order_by("-sequence")[0]
+        self.assertEqual(result.sequences, sorted(set(result.sequences)))
+        self.assertGreater(result.sequences[0], last_receipt.sequence)
+        self.assertEqual(self._available(self.part_a), Decimal("0"))
+        self.assertEqual(self._available(self.part_b), Decimal("2"))
+        self.assertEqual(PartStockSummary.objects.get(part=self.part_a).weighted_avg_cost, wac_before)
+
+        reverses = StockLedgerEntry.objects.filter(reverse_of__isnull=False)
+        self.assertEqual(reverses.count(), 3)
+        self.assertTrue(all(r.movement_type == "out" and r.source_type == "adjustment" for r in reverses))
+        self.assertEqual(
+            AuditEvent.objects.get(event_name="inventory.document.reversed").payload["entry_count"], 3
+        )
+
+    def test_query_count_is_constant_in_document_size(self):
+        self._receipt("GR-S", [(self.part_a, 1), (self.part_b, 1)])
+        self._receipt("GR-L", [(self.part_a, 1)] * 5 + [(self.part_b, 1)] * 5)
+
+        counts = []
+        for doc in ("GR-S", "GR-L"):
+            with CaptureQueriesContext(connection) as ctx:
+                reverse_document(self.company_id, source_ref={"doc": doc}, reason="test")
+            counts.append(len(ctx))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_double_reverse_is_blocked_and_audited(self):
+        self._receipt("GR-3", [(self.part_a, 2), (self.part_b, 2)])
+        reverse_document(self.company_id, source_ref={"doc": "GR-3"}, reason="first")
+
+        with self.assertRaises(ValidationError):
+            reverse_document(self.company_id, source_ref={"doc": "GR-3"}, reason="again")
+        self.assertEqual(AuditEvent.objects.filter(event_name="inventory.reverse.duplicate_blocked").count(), 2)
+
+    def test_negative_stock_is_checked_once_per_part_on_net_delta(self):
+        self._receipt("GR-4", [(self.part_a, 10)])
+        self._post(self.part_a, 8, "WO-1", movement_type="out")
+
+        with self.assertRaises(ValidationError):
+            reverse_document(self.company_id, source_ref={"doc": "GR-4"}, reason="test")
+
+        self.assertFalse(StockLedgerEntry.objects.filter(reverse_of__isnull=False).exists())
+        self.assertEqual(self._available(self.part_a), Decimal("2"))
+        blocked = AuditEvent.objects.get(event_name="inventory.negative_stock.blocked")
+        self.assertEqual(blocked.payload["projected_available_qty"], "-8.000000")
+
+    def test_id_selection_guards(self):
+        first = self._post(self.part_a, 3, "GR-5")
+        reverse_document(self.company_id, entry_ids=[first.id], reason="test")
+        reverse_row = StockLedgerEntry.objects.get(reverse_of=first)
+
+        with self.assertRaisesMessage(ValidationError, "cannot reverse a reverse entry"):
+            reverse_document(self.company_id, entry_ids=[reverse_row.id], reason="test")
+        with self.assertRaisesMessage(ValidationError, "not found"):
+            reverse_document(self.company_id, entry_ids=[uuid4()], reason="test")
+        with self.assertRaises(ValidationError):
+            reverse_document(uuid4(), entry_ids=[first.id], reason="test")
+
+    def test_dry_run_and_command(self):
+        self._receipt("GR-6", [(self.part_b, 1)])
+
+        out = StringIO()
+        call_command(
+            "reverse_document", "--company", str(self.company_id), "--source-ref", '{"doc": "GR-6"}',
+            "--reason", "test", "--dry-run", stdout=out,
+        )
+        self.assertIn("DRY-RUN OK: entries=1", out.getvalue())
+        self.assertFalse(StockLedgerEntry.objects.filter(reverse_of__isnull=False).exists())
+
+        out = StringIO()
+        call_command(
+            "reverse_document", "--company", str(self.company_id), "--source-ref", '{"doc": "GR-6"}',
+            "--reason", "test", stdout=out,
+        )
+        self.assertIn("OK: reversed entries=1", out.getvalue())
+
+    def test_reverse_batch_tolerates_concurrent_summary_insert(self):
+        part = self._part("RM-REV-RACE")
+        bulk_create = QuerySet.bulk_create
+
+        def racing_bulk_create(qs, objs, *args, **kwargs):
+            # another transaction's get_or_create wins between the locked read and the INSERT
+            PartStockSummary.objects.create(company_id=self.company_id, part=part, available_qty=Decimal("5"))
+            return bulk_create(qs, objs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, "bulk_create", autospec=True, side_effect=racing_bulk_create):
+            on_reverse_batch(company_id=self.company_id, deltas={part.id: Decimal("-2")})
+
+        self.assertEqual(self._available(part), Decimal("3"))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from uuid import UUID, uuid4
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.audit.models import AuditEvent
+from apps.inventory.models import Part, PartStockSummary, StockLedgerEntry
+from apps.inventory.stock_audit import company_shard, compare_parts, compare_wac, known_companies, sample_summary_parts
+from factory_manager.db_routing import PrimaryReplicaRouter
+
+
+class StockSummaryAuditTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.parts = []
+        for i in range(3):
+            part = Part.objects.create(
+                company_id=cls.company_id,
+                part_no=f"RM-AUD-{i}",
+                name=f"Audit RM {i}",
+                part_type=Part.PartType.RAW_MATERIAL,
+                procurement_strategy=Part.ProcurementStrategy.BUY,
+            )
+            for qty in (5, 2):
+                StockLedgerEntry.objects.create(
+                    company_id=cls.company_id,
+                    part=part,
+                    movement_type=StockLedgerEntry.MovementType.IN,
+                    source_type=StockLedgerEntry.SourceType.PURCHASE,
+                    qty=Decimal(qty),
+                    unit_cost=Decimal("1"),
+                    source_ref={"doc": str(uuid4())},
+                )
+            cls.parts.append(part)
+
+    def _events(self):
+        return AuditEvent.objects.filter(event_name="inventory.stock_summary.mismatch")
+
+    def test_consistent_ledger_has_no_mismatch(self):
+        self.assertEqual(compare_parts(self.company_id), [])
+
+    def test_full_mode_reports_and_audits_drift(self):
+        PartStockSummary.objects.filter(part=self.parts[0]).update(available_qty=Decimal("6"))
+        PartStockSummary.objects.filter(part=self.parts[1]).delete()
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("verify_stock_summary", "--mode", "full", "--fail-on-mismatch", stdout=out)
+
+        self.assertIn("mismatches=2", out.getvalue())
+        payloads = sorted((e.payload["part_id"], e.payload["summary_value"]) for e in self._events())
+        self.assertEqual(
+            payloads, sorted([(str(self.parts[0].id), "6.000000"), (str(self.parts[1].id), None)])
+        )
+        self.assertTrue(all(e.company_id == self.company_id for e in self._events()))
+
+    def test_full_mode_wac_check(self):
+        PartStockSummary.objects.filter(part=self.parts[2]).update(weighted_avg_cost=Decimal("9"))
+
+        out = StringIO()
+        call_command(
+            "verify_stock_summary", "--mode", "full", "--company-id", str(self.company_id), "--check-wac", "--no-audit",
+            stdout=out,
+        )
+
+        self.assertIn(f"part={self.parts[2].id} weighted_avg_cost summary=9.0000 ledger=1.0000", out.getvalue())
+        self.assertFalse(self._events().exists())
+
+    def test_sampled_mode(self):
+        PartStockSummary.objects.filter(part=self.parts[0]).update(available_qty=Decimal("0"))
+
+        sample = sample_summary_parts(100)
+        self.assertEqual(sorted(sample[self.company_id]), sorted(p.id for p in self.parts))
+
+        out = StringIO()
+        call_command("verify_stock_summary", "--sample-percent", "100", stdout=out)
+        self.assertIn("mismatches=1", out.getvalue())
+        self.assertEqual(self._events().get().payload["mode"], "sampled")
+
+    def test_company_shards_partition(self):
+        companies = {uuid4() for _ in range(20)}
+        shards = [company_shard(companies, i, 3) for i in range(3)]
+
+        self.assertEqual(sorted(c for s in shards for c in s), sorted(companies))
+        self.assertEqual(company_shard({UUID(int=7)}, 1, 3), [UUID(int=7)])
+
+    def test_reads_primary_when_router_picks_replica(self):
+        PartStockSummary.objects.filter(part=self.parts[0]).update(available_qty=Decimal("6"))
+
+        # "replica" is not configured here: any routed read would fail
+        with mock.patch.object(PrimaryReplicaRouter, "db_for_read", return_value="replica"):
+            mismatches = compare_parts(self.company_id)
+            sample = sample_summary_parts(100)
+            self.assertIn(self.company_id, known_companies())
+            self.assertEqual(compare_wac(self.company_id), [])
+
+        self.assertEqual([(m.part_id, m.summary_value) for m in mismatches], [(self.parts[0].id, Decimal("6"))])
+        self.assertEqual(len(sample[self.company_id]), 3)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from decimal import Decimal
+from uuid import uuid4
+
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from apps.inventory.models import Part, PartStockSummary
+from apps.inventory.reports import render_valuation, valuation_by_part, valuation_by_part_type
+from apps.inventory.views import valuation_report
+from apps.tenancy.context import clear_active_scope, set_active_scope
+
+
+class ValuationReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.other_company_id = uuid4()
+
+        def _part(company_id, part_no, part_type, strategy, qty, wac):
+            part = Part.objects.create(
+                company_id=company_id,
+                part_no=part_no,
+                name=f"Part {part_no}",
+                part_type=part_type,
+                procurement_strategy=strategy,
+            )
+            PartStockSummary.objects.create(
+                company_id=company_id,
+                part=part,
+                available_qty=Decimal(qty),
+                weighted_avg_cost=Decimal(wac),
+            )
+            return part
+
+        RM, BUY = Part.PartType.RAW_MATERIAL, Part.ProcurementStrategy.BUY
+        FG, MAKE = Part.PartType.FINISHED_GOOD, Part.ProcurementStrategy.MAKE
+
+        cls.rm1 = _part(cls.company_id, "RM-001", RM, BUY, "10", "2.5000")
+        cls.rm2 = _part(cls.company_id, "RM-002", RM, BUY, "4", "1.0000")
+        cls.fg1 = _part(cls.company_id, "FG-001", FG, MAKE, "3", "20.0000")
+        _part(cls.other_company_id, "RM-001", RM, BUY, "99", "9.0000")
+
+    def tearDown(self):
+        clear_active_scope()
+
+    def test_by_part_rows_are_tenant_scoped_and_valued(self):
+        rows = list(valuation_by_part(self.company_id, chunk_size=2))
+
+        self.assertEqual([r["part_no"] for r in rows], ["FG-001", "RM-001", "RM-002"])
+        by_no = {r["part_no"]: r for r in rows}
+        self.assertEqual(by_no["RM-001"]["stock_value"], Decimal("25"))
+        self.assertEqual(by_no["FG-001"]["stock_value"], Decimal("60"))
+
+    def test_by_part_type_aggregates_in_db(self):
+        rows = {r["part_type"]: r for r in valuation_by_part_type(self.company_id)}
+
+        self.assertEqual(set(rows), {Part.PartType.RAW_MATERIAL, Part.PartType.FINISHED_GOOD})
+        self.assertEqual(rows[Part.PartType.RAW_MATERIAL]["part_count"], 2)
+        self.assertEqual(rows[Part.PartType.RAW_MATERIAL]["available_qty"], Decimal("14"))
+        self.assertEqual(rows[Part.PartType.RAW_MATERIAL]["stock_value"], Decimal("29"))
+
+    def test_csv_and_jsonl_rendering(self):
+        lines = "".join(render_valuation(self.company_id, fmt="csv")).splitlines()
+        self.assertEqual(lines[0].split(","), ["part_id", "part_no", "name", "part_type", "available_qty", "weighted_avg_cost", "stock_value"])
+        self.assertEqual(len(lines), 4)
+
+        records = [json.loads(line) for line in render_valuation(self.company_id, fmt="jsonl", group_by="part_type")]
+        self.assertEqual(len(records), 2)
+        self.assertEqual({r["part_type"] for r in records}, {"raw_material", "finished_good"})
+
+    def test_streaming_view_uses_active_company(self):
+        request = RequestFactory().get("/inventory/reports/valuation/", {"format": "jsonl"})
+
+        set_active_scope(company_id=self.company_id)
+        response = valuation_report(request)
+
+        self.assertTrue(response.streaming)
+        records = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(records), 3)
+
+    def test_streaming_view_fails_closed_without_tenant(self):
+        request = RequestFactory().get("/inventory/reports/valuation/")
+        with self.assertRaises(PermissionDenied):
+            valuation_report(request)
+
+    def test_management_command_writes_file(self):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            call_command("valuation_report", "--company-id", str(self.company_id), "--output", path)
+            with open(path, encoding="utf-8") as fh:
+                self.assertEqual(len(fh.read().splitlines()), 4)
+        finally:
+            os.remove(path)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.inventory.management.commands import replay_wac as replay_wac_command
+from apps.inventory.models import Part, PartStockSummary, StockLedgerEntry
+from apps.inventory.reversals import reverse_document
+from apps.inventory.wac_replay import _div_half_up, find_divergences, replay_part, replay_wac
+
+
+class ReplayEngineTests(SimpleTestCase):
+    def test_half_up_integer_division(self):
+        self.assertEqual(_div_half_up(5, 2), 3)
+        self.assertEqual(_div_half_up(-5, 2), -3)
+        self.assertEqual(_div_half_up(4, 3), 1)
+        self.assertEqual(_div_half_up(5, 3), 2)
+
+    def test_series_and_negative_detection(self):
+        company_id, part_id = uuid4(), uuid4()
+        rows = [
+            (part_id, company_id, 1, uuid4(), "in", "purchase", Decimal("3"), Decimal("1.0000"), None),
+            (part_id, company_id, 2, uuid4(), "in", "production", Decimal("1"), Decimal("2.0000"), None),
+            (part_id, company_id, 3, uuid4(), "out", "production", Decimal("5"), Decimal("0"), None),
+        ]
+
+        replay = replay_part(company_id, part_id, rows, series=True)
+
+        # 1.25 exactly; stored 4 places
+        self.assertEqual(replay.weighted_avg_cost, Decimal("1.2500"))
+        self.assertEqual(replay.last_purchase_cost, Decimal("1"))
+        self.assertEqual(replay.last_production_cost, Decimal("2"))
+        self.assertEqual(replay.negative_at_sequence, 3)
+        self.assertEqual([s[1] for s in replay.series], [Decimal("3"), Decimal("4"), Decimal("-1")])
+
+
+# no holdback: --apply may write parts posted a moment ago (PostgreSQL)
+@override_settings(LEDGER_CONSUMER_HOLDBACK_SECONDS=0)
+class WacReplayTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_id = uuid4()
+        cls.part = Part.objects.create(
+            company_id=cls.company_id,
+            part_no="RM-WAC",
+            name="WAC RM",
+            part_type=Part.PartType.RAW_MATERIAL,
+            procurement_strategy=Part.ProcurementStrategy.BUY,
+        )
+
+    def _post(self, movement_type, qty, unit_cost, doc=None):
+        return StockLedgerEntry.objects.create(
+            company_id=self.company_id,
+            part=self.part,
+            movement_type=movement_type,
+            source_type="purchase" if movement_type == "in" else "production",
+            qty=Decimal(qty),
+            unit_cost=Decimal(unit_cost),
+            source_ref={"doc": doc or str(uuid4())},
+        )
+
+    def _seed(self):
+        self._post("in", 10, "2")
+        self._post("out", 4, "2")
+        last_in = self._post("in", 6, "5", doc="GR-LAST")
+        # the wrong IN moves WAC; its reverse (stock-only lane) does not move it back
+        self._post("in", 3, "9", doc="GR-WRONG")
+        reverse_document(self.company_id, source_ref={"doc": "GR-WRONG"}, reason="test")
+        return last_in
+
+    def test_replay_matches_incremental_summary(self):
+        self._seed()
+
+        (replay,) = replay_wac(company_id=self.company_id)
+
+        # (6 * 2 + 6 * 5) / 12 = 3.5, then (12 * 3.5 + 3 * 9) / 15 -- not in_value / in_qty over all time
+        self.assertEqual(replay.weighted_avg_cost, Decimal("4.6"))
+        self.assertEqual(replay.available_qty, Decimal("12"))
+        self.assertEqual(list(find_divergences([replay])), [])
+
+    def test_divergence_report_and_apply(self):
+        self._seed()
+        PartStockSummary.objects.filter(part=self.part).update(weighted_avg_cost=Decimal("3.1250"))
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("replay_wac", "--format", "jsonl", "--fail-on-divergence", stdout=out)
+        report = json.loads(out.getvalue().splitlines()[0])
+        self.assertEqual(report["diffs"], {"weighted_avg_cost": {"summary": "3.1250", "replayed": "4.6000"}})
+
+        call_command("replay_wac", "--apply", stdout=StringIO())
+        self.assertEqual(PartStockSummary.objects.get(part=self.part).weighted_avg_cost, Decimal("4.6"))
+
+    def test_apply_replays_again_under_lock(self):
+        self._seed()
+        PartStockSummary.objects.filter(part=self.part).update(weighted_avg_cost=Decimal("3.1250"))
+        report = replay_wac_command.find_divergences
+
+        def report_then_post(replays):
+            yield from report(replays)
+            self._post("in", 3, "1")  # lands after the unlocked report scan
+
+        out = StringIO()
+        with mock.patch.object(replay_wac_command, "find_divergences", side_effect=report_then_post):
+            call_command("replay_wac", "--apply", stdout=out)
+
+        # (12 * 4.6 + 3 * 1) / 15: the late IN is in the written values
+        summary = PartStockSummary.objects.get(part=self.part)
+        self.assertEqual((summary.available_qty, summary.weighted_avg_cost), (Decimal("15"), Decimal("3.88")))
+        self.assertIn("applied=1", out.getvalue())
+        self.assertEqual(list(find_divergences(replay_wac(company_id=self.company_id))), [])
+
+    def test_apply_skips_parts_inside_the_holdback(self):
+        last_in = self._seed()
+        PartStockSummary.objects.filter(part=self.part).update(weighted_avg_cost=Decimal("3.1250"))
+
+        out = StringIO()
+        horizon = last_in.created_at - timedelta(seconds=1)
+        with mock.patch.object(replay_wac_command, "settled_horizon", return_value=horizon):
+            call_command("replay_wac", "--apply", stdout=out)
+
+        self.assertIn("applied=0 held=1", out.getvalue())
+        self.assertEqual(PartStockSummary.objects.get(part=self.part).weighted_avg_cost, Decimal("3.1250"))
+
+    def test_what_if_cost_override(self):
+        last_in = self._seed()
+
+        out = StringIO()
+        call_command("replay_wac", "--cost-override", f"{last_in.id}=8", stdout=out)
+
+        # (6 * 2 + 6 * 8) / 12 = 5, then (12 * 5 + 3 * 9) / 15
+        self.assertIn("weighted_avg_cost=4.6000->5.8000", out.getvalue())
+        self.assertIn("WHAT-IF: diverged_parts=1", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("replay_wac", "--cost-override", f"{last_in.id}=8", "--apply", stdout=StringIO())
@@ -0,0 +1,16 @@
+# apps/inventory/urls.py
+from __future__ import annotations
+
+from django.urls import path
+
+from apps.inventory import views
+
+app_name = "inventory"
+
+urlpatterns = [
+    path("reports/valuation/", views.valuation_report, name="valuation_report"),
+    path("ledger/entries/", views.ledger_entry_create, name="ledger_entry_create"),
+    path("ledger/entries/async/", views.aledger_entry_create, name="aledger_entry_create"),
+    path("parts/<uuid:part_id>/stock/", views.astock_summary, name="stock_summary"),
+    path("parts/<uuid:part_id>/history/", views.part_movement_history, name="part_movement_history"),
+]
@@ -0,0 +1,175 @@
+# apps/inventory/views.py
+from __future__ import annotations
+
+import json
+from decimal import Decimal, InvalidOperation
+from uuid import UUID
+
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied, ValidationError
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
+
+from apps.inventory.history import DEFAULT_PAGE_SIZE, movement_history
+from apps.inventory.reports import VALUATION_FORMATS, VALUATION_GROUPS, render_valuation
+from apps.inventory.services import aget_stock_summary, apost_ledger_entry, post_ledger_entry
+from apps.tenancy.context import get_active_company_id
+from factory_manager.db_routing import replica_reads
+
+
+_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+
+def _require_company_id():
+    company_id = get_active_company_id()
+    if not company_id:
+        raise PermissionDenied("Tenant scope unresolved (fail-closed).")
+    return company_id
+
+
+@require_GET
+def valuation_report(request):
+    """
+    Streaming inventory valuation report for the active company.
+    Tenant scope comes from TenantRBACMiddleware (fail-closed if unresolved).
+    """
+    company_id = _require_company_id()
+
+    fmt = request.GET.get("format", "csv")
+    group_by = request.GET.get("group_by", "part")
+    if fmt not in VALUATION_FORMATS or group_by not in VALUATION_GROUPS:
+        return HttpResponseBadRequest("Invalid format/group_by")
+
+    response = StreamingHttpResponse(
+        render_valuation(company_id, fmt=fmt, group_by=group_by),
+        content_type=_CONTENT_TYPES[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="valuation-{group_by}.{fmt}"'
+    return response
+
+
+# =========================
+# Ledger posting (sync = WSGI path, async = ASGI path; same contract)
+# =========================
+_LEDGER_OPTIONAL = ("reference_price", "idempotency_key", "idempotency_scope")
+
+
+def _ledger_fields(request, company_id) -> dict:
+    """
+    JSON body -> StockLedgerEntry fields. company_id always comes from the
+    tenant scope, never from the body. Raises ValueError on malformed input.
+    """
+    try:
+        body = json.loads(request.body or b"{}")
+    except json.JSONDecodeError as exc:
+        raise ValueError("Invalid JSON body") from exc
+    if not isinstance(body, dict):
+        raise ValueError("JSON object expected")
+
+    try:
+        fields = {
+            "company_id": company_id,
+            "part_id": UUID(str(body["part_id"])),
+            "movement_type": str(body["movement_type"]),
+            "source_type": str(body["source_type"]),
+            "qty": Decimal(str(body["qty"])),
+            "unit_cost": Decimal(str(body["unit_cost"])),
+            "source_ref": body.get("source_ref") or {},
+        }
+        for name in _LEDGER_OPTIONAL:
+            if body.get(name) is not None:
+                fields[name] = Decimal(str(body[name])) if name == "reference_price" else str(body[name])
+    except KeyError as exc:
+        raise ValueError(f"Missing field: {exc.args[0]}") from exc
+    except (TypeError, ValueError, InvalidOperation) as exc:
+        raise ValueError("Invalid field value") from exc
+    return fields
+
+
+def _ledger_entry_json(entry) -> dict:
+    return {
+        "id": str(entry.id),
+        "sequence": entry.sequence,
+        "part_id": str(entry.part_id),
+        "movement_type": entry.movement_type,
+        "qty": str(entry.qty),
+        "transaction_value": str(entry.transaction_value),
+    }
+
+
+def _ledger_error(exc: Exception) -> JsonResponse:
+    if isinstance(exc, ValidationError):
+        errors = exc.message_dict if hasattr(exc, "error_dict") else {"__all__": exc.messages}
+        return JsonResponse({"errors": errors}, status=400)
+    return JsonResponse({"errors": {"__all__": [str(exc)]}}, status=400)
+
+
+@require_POST
+def ledger_entry_create(request):
+    company_id = _require_company_id()
+    try:
+        entry, created = post_ledger_entry(**_ledger_fields(request, company_id))
+    except (ValueError, ValidationError, ObjectDoesNotExist) as exc:
+        return _ledger_error(exc)
+    return JsonResponse(_ledger_entry_json(entry), status=201 if created else 200)
+
+
+@require_POST
+async def aledger_entry_create(request):
+    """
+    ASGI twin of ledger_entry_create: the lock + insert runs on the ledger
+    worker pool (apps.inventory.services), not the thread-sensitive executor.
+    """
+    company_id = _require_company_id()
+    try:
+        entry, created = await apost_ledger_entry(**_ledger_fields(request, company_id))
+    except (ValueError, ValidationError, ObjectDoesNotExist) as exc:
+        return _ledger_error(exc)
+    return JsonResponse(_ledger_entry_json(entry), status=201 if created else 200)
+
+
+@require_GET
+async def astock_summary(request, part_id):
+    company_id = _require_company_id()
+    summary = await aget_stock_summary(company_id, part_id)
+    if summary is None:
+        return JsonResponse({"part_id": str(part_id), "available_qty": "0", "weighted_avg_cost": "0"})
+    return JsonResponse(
+        {
+            "part_id": str(part_id),
+            "available_qty": str(summary.available_qty),
+            "weighted_avg_cost": str(summary.weighted_avg_cost),
+        }
+    )
+
+
+@require_GET
+def part_movement_history(request, part_id):
+    """
+    Cursor-paginated ledger history of one part with running balance
+    (?after=<next_cursor>&limit=&movement_type=&source_type=). Browsing
+    tolerates replica lag, so reads go to the replica when it is fresh.
+    """
+    company_id = _require_company_id()
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_PAGE_SIZE))
+        with replica_reads():
+            page = movement_history(
+                company_id,
+                part_id,
+                after=request.GET.get("after") or None,
+                limit=limit,
+                movement_type=request.GET.get("movement_type") or None,
+                source_type=request.GET.get("source_type") or None,
+            )
+    except ValueError as exc:
+        return _ledger_error(exc)
+    return JsonResponse(
+        {
+            "part_id": str(part_id),
+            "results": [row.as_json() for row in page.rows],
+            "next_cursor": page.next_cursor,
+        }
+    )
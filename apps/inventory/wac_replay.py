@@ -0,0 +1,240 @@
+# apps/inventory/wac_replay.py
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import accumulate, groupby
+from typing import Iterable, Iterator, Mapping
+from uuid import UUID
+
+from django.db import router
+
+from factory_manager.instrumentation import instrumented
+
+# LOCKED: no model imports at module import time (prevents circular imports).
+
+# =========================
+# Scaled-integer columns
+# =========================
+# Column scales follow the model decimal_places, so every stored value is an
+# exact integer: qty 10^6 (18,6), unit_cost / WAC 10^4 (12,4).
+QTY_PLACES = 6
+COST_PLACES = 4
+QTY_SCALE = 10**QTY_PLACES
+COST_SCALE = 10**COST_PLACES
+
+# Row kinds (array('b') column)
+KIND_QTY_ONLY = 0  # OUT, adjustment, reverse lane (D-3.30): stock delta only
+KIND_WAC_IN = 1  # non-reverse IN with qty > 0: moves WAC
+LEDGER_FIELDS = ("part_id", "company_id", "sequence", "id", "movement_type", "source_type", "qty", "unit_cost", "reverse_of_id")
+READ_CHUNK_SIZE = 5000
+
+
+def _scaled(value: Decimal, places: int) -> int:
+    return int(Decimal(value).scaleb(places))
+
+
+def _unscaled(value: int, places: int) -> Decimal:
+    return Decimal(value).scaleb(-places)
+
+
+def _div_half_up(num: int, den: int) -> int:
+    """
+    round_half_up(num / den) in exact integers (same rounding as the summary
+    columns: PostgreSQL numeric / ROUND_HALF_UP in rebuild_stock_summary).
+    """
+    q, r = divmod(abs(num), abs(den))
+    if 2 * r >= abs(den):
+        q += 1
+    return q if (num >= 0) == (den > 0) else -q
+
+
+@dataclass(frozen=True)
+class PartReplay:
+    company_id: UUID
+    part_id: UUID
+    entries: int
+    available_qty: Decimal
+    weighted_avg_cost: Decimal
+    last_purchase_cost: Decimal | None
+    last_production_cost: Decimal | None
+    # first sequence at which the running quantity went below zero (None = never)
+    negative_at_sequence: int | None = None
+    # (sequence, available_qty, weighted_avg_cost) after every row, if requested
+    series: tuple[tuple[int, Decimal, Decimal], ...] | None = None
+
+
+@dataclass(frozen=True)
+class Divergence:
+    company_id: UUID
+    part_id: UUID
+    field: str
+    summary: Decimal | None
+    replayed: Decimal | None
+
+
+REPLAYED_FIELDS = ("available_qty", "weighted_avg_cost", "last_purchase_cost", "last_production_cost")
+
+
+# =========================
+# Engine
+# =========================
+def replay_part(
+    company_id: UUID,
+    part_id: UUID,
+    rows: Iterable[tuple],
+    *,
+    cost_overrides: Mapping[UUID, Decimal] | None = None,
+    series: bool = False,
+) -> PartReplay:
+    """
+    Replay one part's ledger rows (LEDGER_FIELDS tuples, sequence order) with
+    on_ledger_insert() semantics, on array-backed scaled-integer columns:
+    - quantity series: one prefix sum over the signed deltas
+    - WAC: recurrence evaluated only at KIND_WAC_IN rows, rounded to 4 places
+      after every step exactly as the stored summary is
+    """
+    sequences = array("q")
+    deltas = array("q")
+    costs = array("q")
+    kinds = array("b")
+    last_purchase: int | None = None
+    last_production: int | None = None
+
+    for _, _, sequence, entry_id, movement_type, source_type, qty, unit_cost, reverse_of_id in rows:
+        if cost_overrides and entry_id in cost_overrides:
+            unit_cost = cost_overrides[entry_id]
+        q = _scaled(qty, QTY_PLACES)
+        sequences.append(sequence)
+        deltas.append(-q if movement_type == "out" else q)  # in: +qty, adjustment: signed qty
+        costs.append(_scaled(unit_cost, COST_PLACES))
+        wac_in = movement_type == "in" and q > 0 and reverse_of_id is None
+        kinds.append(KIND_WAC_IN if wac_in else KIND_QTY_ONLY)
+        if wac_in and source_type == "purchase":
+            last_purchase = costs[-1]
+        if wac_in and source_type == "production":
+            last_production = costs[-1]
+
+    running = array("q", accumulate(deltas))
+    negative_at = next((sequences[i] for i, v in enumerate(running) if v < 0), None)
+
+    wac = 0
+    wac_series = array("q") if series else None
+    for i in range(len(kinds)):
+        if kinds[i] == KIND_WAC_IN:
+            new_qty = running[i]
+            old_qty = new_qty - deltas[i]
+            # value at QTY x COST scale; Python ints => no overflow
+            total_value = old_qty * wac + deltas[i] * costs[i]
+            wac = _div_half_up(total_value, new_qty) if new_qty != 0 else 0
+        if wac_series is not None:
+            wac_series.append(wac)
+
+    return PartReplay(
+        company_id=company_id,
+        part_id=part_id,
+        entries=len(kinds),
+        available_qty=_unscaled(running[-1] if running else 0, QTY_PLACES),
+        weighted_avg_cost=_unscaled(wac, COST_PLACES),
+        last_purchase_cost=_unscaled(last_purchase, COST_PLACES) if last_purchase is not None else None,
+        last_production_cost=_unscaled(last_production, COST_PLACES) if last_production is not None else None,
+        negative_at_sequence=negative_at,
+        series=(
+            tuple(
+                (sequences[i], _unscaled(running[i], QTY_PLACES), _unscaled(wac_series[i], COST_PLACES))
+                for i in range(len(kinds))
+            )
+            if wac_series is not None
+            else None
+        ),
+    )
+
+
+@instrumented("inventory.wac_replay")
+def replay_wac(
+    *,
+    company_id: UUID | None = None,
+    part_ids: Iterable[UUID] | None = None,
+    cost_overrides: Mapping[UUID, Decimal] | None = None,
+    exclude_entry_ids: Iterable[UUID] | None = None,
+    series: bool = False,
+    using: str | None = None,
+) -> Iterator[PartReplay]:
+    """
+    Stream PartReplay per part: one ordered ledger scan for all selected parts.
+
+    Per part, sequence order is the order on_ledger_insert() folded the rows
+    (apps.inventory.ledger_sequence lock order). Rows still inside the
+    consumer holdback window may be joined by an in-flight lower sequence of
+    another part, never of the same one; replay_wac --apply skips such parts
+    anyway.
+
+    What-if: `cost_overrides` {entry_id: unit_cost} and `exclude_entry_ids`
+    alter the replayed history only (nothing is written).
+    """
+    from apps.inventory.models import StockLedgerEntry  # local import
+
+    qs = StockLedgerEntry.objects.using(using)
+    if company_id is not None:
+        qs = qs.filter(company_id=company_id)
+    if part_ids is not None:
+        qs = qs.filter(part_id__in=list(part_ids))
+    if exclude_entry_ids:
+        qs = qs.exclude(id__in=list(exclude_entry_ids))
+
+    rows = qs.order_by("part_id", "sequence").values_list(*LEDGER_FIELDS).iterator(chunk_size=READ_CHUNK_SIZE)
+    for (part_id, part_company_id), part_rows in groupby(rows, key=lambda r: (r[0], r[1])):
+        yield replay_part(part_company_id, part_id, part_rows, cost_overrides=cost_overrides, series=series)
+
+
+# =========================
+# Divergence report
+# =========================
+def find_divergences(
+    replays: Iterable[PartReplay], *, chunk_size: int = 500, using: str | None = None
+) -> Iterator[tuple[PartReplay, list[Divergence]]]:
+    """
+    Compare replays with PartStockSummary, one summary query per chunk of parts.
+    Yields only parts with at least one differing field (a missing summary row
+    diverges on every field). available_qty includes outstanding striped deltas.
+    Summaries are read from `using` (default: the database the ledger is read
+    from), never from a replica while the replay read the primary.
+    """
+    from apps.inventory.models import PartStockSummary, StockLedgerEntry  # local import
+    from apps.inventory.stock_deltas import outstanding_qty  # local import
+
+    db = using or router.db_for_read(StockLedgerEntry)
+
+    chunk: list[PartReplay] = []
+
+    def flush():
+        summaries = {
+            s["part_id"]: s
+            for s in PartStockSummary.objects.using(db).filter(part_id__in=[r.part_id for r in chunk]).values(
+                "part_id", *REPLAYED_FIELDS
+            )
+        }
+        pending: dict[UUID, Decimal] = {}
+        for company_id, replays in groupby(sorted(chunk, key=lambda r: r.company_id.int), key=lambda r: r.company_id):
+            pending.update(outstanding_qty(company_id, [r.part_id for r in replays], using=db))
+        for part_id, qty in pending.items():
+            if part_id in summaries:
+                summaries[part_id]["available_qty"] += qty
+        for replay in chunk:
+            summary = summaries.get(replay.part_id) or {}
+            diffs = [
+                Divergence(replay.company_id, replay.part_id, name, summary.get(name), getattr(replay, name))
+                for name in REPLAYED_FIELDS
+                if summary.get(name) != getattr(replay, name) or not summary
+            ]
+            if diffs:
+                yield replay, diffs
+
+    for replay in replays:
+        chunk.append(replay)
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            chunk = []
+    if chunk:
+        yield from flush()
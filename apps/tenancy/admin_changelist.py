@@ -0,0 +1,238 @@
+# apps/tenancy/admin_changelist.py
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.db import connections
+from django.db.models import Q
+
+
+# Query-string parameters of the seek paginator (never treated as lookups).
+CURSOR_AFTER_VAR = "after"
+CURSOR_BEFORE_VAR = "before"
+CURSOR_VARS = (CURSOR_AFTER_VAR, CURSOR_BEFORE_VAR)
+
+# Below this planner estimate an exact COUNT(*) is cheap enough to run.
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+# =========================
+# Cursor encoding
+# =========================
+def encode_cursor(created_at: datetime, pk: Any) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, str]:
+    """
+    Fail-closed: malformed cursors raise IncorrectLookupParameters (admin resets to ?e=1).
+    """
+    try:
+        raw = base64.urlsafe_b64decode((token + "=" * (-len(token) % 4)).encode()).decode()
+        created_at, pk = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), pk
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise IncorrectLookupParameters(f"Invalid cursor: {token!r}") from exc
+
+
+# =========================
+# Counting
+# =========================
+def _pg_estimate(qs, connection) -> int | None:
+    """
+    Planner row estimate:
+    - unfiltered table => pg_class.reltuples (no scan)
+    - filtered queryset => EXPLAIN row estimate (no execution)
+    Returns None if the table has never been analyzed.
+    """
+    with connection.cursor() as cur:
+        if not qs.query.where:
+            cur.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [qs.model._meta.db_table],
+            )
+            row = cur.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+
+        sql, params = qs.order_by().values("pk").query.get_compiler(using=qs.db).as_sql()
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cur.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimated_count(qs) -> tuple[int, bool]:
+    """
+    Return (count, is_estimate).
+
+    PostgreSQL: planner estimate when it is large; exact COUNT(*) when the
+    estimate is below EXACT_COUNT_THRESHOLD (or unavailable) and on other backends.
+    """
+    if qs.query.is_empty():
+        return 0, False
+
+    connection = connections[qs.db]
+    if connection.vendor == "postgresql":
+        estimate = _pg_estimate(qs, connection)
+        if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate, True
+
+    return qs.count(), False
+
+
+# =========================
+# Keyset changelist
+# =========================
+class KeysetChangeList(ChangeList):
+    """
+    Seek pagination on (created_at, id) DESC.
+
+    Every page is one index range scan of list_per_page + 1 rows: no OFFSET,
+    no COUNT(*) over the full table, so deep pages cost the same as the first.
+    Navigation is next/previous/first (rendered by admin/keyset_pagination.html).
+    """
+
+    keyset_field = "created_at"
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        for var in CURSOR_VARS:
+            lookup_params.pop(var, None)
+        return lookup_params
+
+    def _cursor_for(self, obj) -> str:
+        return encode_cursor(getattr(obj, self.keyset_field), obj.pk)
+
+    def _seek_values(self, token: str):
+        created_at, pk = decode_cursor(token)
+        try:
+            return created_at, self.lookup_opts.pk.to_python(pk)
+        except Exception as exc:
+            raise IncorrectLookupParameters(f"Invalid cursor: {token!r}") from exc
+
+    def get_results(self, request):
+        after = request.GET.get(CURSOR_AFTER_VAR)
+        before = request.GET.get(CURSOR_BEFORE_VAR)
+
+        # Filter / search links restart from the first page.
+        for var in CURSOR_VARS:
+            self.params.pop(var, None)
+
+        field = self.keyset_field
+        per_page = self.list_per_page
+        qs = self.queryset
+
+        if before:
+            created_at, pk = self._seek_values(before)
+            page = list(
+                qs.filter(Q(**{f"{field}__gt": created_at}) | Q(**{field: created_at, "pk__gt": pk}))
+                .order_by(field, "pk")[: per_page + 1]
+            )
+            has_prev = len(page) > per_page
+            rows = page[:per_page][::-1]
+            has_next = True
+        else:
+            if after:
+                created_at, pk = self._seek_values(after)
+                qs = qs.filter(Q(**{f"{field}__lt": created_at}) | Q(**{field: created_at, "pk__lt": pk}))
+            page = list(qs.order_by(f"-{field}", "-pk")[: per_page + 1])
+            has_next = len(page) > per_page
+            rows = page[:per_page]
+            has_prev = bool(after)
+
+        result_count, is_estimate = estimated_count(self.queryset)
+
+        self.result_count = result_count
+        self.result_count_is_estimate = is_estimate
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = False  # no numbered pages
+        self.paginator = None
+
+        self.keyset_next_url = (
+            self.get_query_string({CURSOR_AFTER_VAR: self._cursor_for(rows[-1])}, remove=CURSOR_VARS)
+            if has_next and rows
+            else None
+        )
+        self.keyset_prev_url = (
+            self.get_query_string({CURSOR_BEFORE_VAR: self._cursor_for(rows[0])}, remove=CURSOR_VARS)
+            if has_prev and rows
+            else None
+        )
+        self.keyset_first_url = self.get_query_string(remove=CURSOR_VARS) if (after or before) else None
+
+
+class KeysetChangeListMixin:
+    """
+    ModelAdmin mixin for large append-only tables (ledger, audit).
+    Column sorting is disabled: the seek order is fixed to (created_at, id) DESC.
+    """
+
+    show_full_result_count = False
+    sortable_by = ()
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+# =========================
+# Lazy tenant filter
+# =========================
+class CompanyIdInputFilter(admin.ListFilter):
+    """
+    Free-text company UUID filter.
+    Unlike list_filter = ("company_id",) it never runs SELECT DISTINCT company_id.
+    """
+
+    title = "company id"
+    parameter_name = "company_id"
+    template = "admin/tenancy/input_filter.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        if self.parameter_name in params:
+            value = (params.pop(self.parameter_name)[-1] or "").strip()
+            if value:
+                try:
+                    model._meta.get_field("company_id").to_python(value)
+                except Exception as exc:
+                    raise IncorrectLookupParameters(f"Invalid company_id: {value!r}") from exc
+                self.used_parameters[self.parameter_name] = value
+
+    def has_output(self):
+        return True
+
+    def value(self):
+        return self.used_parameters.get(self.parameter_name)
+
+    def expected_parameters(self):
+        return [self.parameter_name]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value:
+            return queryset.filter(company_id=value)
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.value() is None,
+            "value": self.value() or "",
+            "parameter_name": self.parameter_name,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name, *CURSOR_VARS]),
+            "hidden_params": [
+                (k, v) for k, v in changelist.params.items() if k not in (self.parameter_name, *CURSOR_VARS)
+            ],
+        }
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+
+from apps.inventory.benchmarks import BenchResult
+from apps.inventory.models import Part
+from apps.tenancy.context import clear_active_scope, require_active_company_id, set_active_scope
+from apps.tenancy.managers import TenantQuerySet
+
+
+# =========================
+# Previous implementation (reference for comparison)
+# =========================
+class _LegacyTenantQuerySet(models.QuerySet):
+    def _with_tenant(self):
+        return self.filter(company_id=require_active_company_id())
+
+    def all(self):
+        return self._with_tenant()
+
+    def filter(self, *args, **kwargs):
+        qs = super().filter(*args, **kwargs)
+        if "company" in kwargs or "company_id" in kwargs:
+            return qs
+        return qs._with_tenant()
+
+    def exclude(self, *args, **kwargs):
+        qs = super().exclude(*args, **kwargs)
+        if "company" in kwargs or "company_id" in kwargs:
+            return qs
+        return qs._with_tenant()
+
+
+_PLANNING_RE = re.compile(r"Planning Time: ([0-9.]+) ms")
+
+
+def _chain(qs, depth: int):
+    qs = qs.all()
+    for i in range(depth):
+        qs = qs.filter(part_no__gte=f"P-{i}") if i % 2 == 0 else qs.exclude(name=f"N-{i}")
+    return qs
+
+
+def _compiled(qs):
+    if isinstance(qs, TenantQuerySet):
+        qs = qs.scoped()
+    return qs.query.get_compiler(using=qs.db).as_sql()
+
+
+def _planning_ms(sql: str, params) -> float | None:
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cur:
+        cur.execute(f"EXPLAIN (SUMMARY) {sql}", params)
+        text = "\n".join(row[0] for row in cur.fetchall())
+    match = _PLANNING_RE.search(text)
+    return float(match.group(1)) if match else None
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark: tenant predicate injected once (TenantQuerySet) vs per chained call (legacy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--depths", type=str, default="1,3,5,10", help="Comma-separated filter chain depths.")
+        parser.add_argument("--repeat", type=int, default=2000)
+        parser.add_argument("--plan-repeat", type=int, default=50, help="EXPLAIN runs per case (PostgreSQL only).")
+
+    def handle(self, *args, **options):
+        set_active_scope(company_id=uuid4())
+        try:
+            for depth in (int(d) for d in options["depths"].split(",") if d.strip()):
+                for label, factory in (
+                    ("legacy", lambda: _LegacyTenantQuerySet(model=Part)),
+                    ("scoped_once", lambda: TenantQuerySet(model=Part)),
+                ):
+                    self.stdout.write(json.dumps(self._run(label, factory, depth, options).as_dict(), sort_keys=True))
+        finally:
+            clear_active_scope()
+
+    def _run(self, label, factory, depth: int, options) -> BenchResult:
+        result = BenchResult(name=f"tenant_queryset.depth{depth}.{label}")
+
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            sql, params = _compiled(_chain(factory(), depth))
+            elapsed = time.perf_counter() - started
+            result.elapsed_s += elapsed
+            result.latencies_ms.append(elapsed * 1000.0)
+            result.ops += 1
+
+        plans = [_planning_ms(sql, params) for _ in range(options["plan_repeat"])]
+        plans = [p for p in plans if p is not None]
+
+        result.extra.update(
+            {
+                "depth": depth,
+                "tenant_predicates": sql.count('"company_id" ='),
+                "sql_chars": len(sql),
+                "planning_ms_avg": round(sum(plans) / len(plans), 4) if plans else None,
+            }
+        )
+        return result
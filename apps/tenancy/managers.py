@@ -1,34 +1,163 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from django.db import models
+from django.db.models import Q
+
+from apps.tenancy.context import (
+    active_facility_id,
+    active_section_id,
+    active_workstation_id,
+    require_active_company_id,
+)
+
+
+# Narrower scopes applied when the model has the column (LOCKED hierarchy).
+_SUB_SCOPES = (
+    ("facility_id", active_facility_id),
+    ("section_id", active_section_id),
+    ("workstation_id", active_workstation_id),
+)
 
-from apps.tenancy.context import require_active_company_id
+_EXPLICIT_KEYS = frozenset({"company", "company_id"})
+
+
+@lru_cache(maxsize=None)
+def _model_columns(model) -> frozenset[str]:
+    return frozenset(f.attname for f in model._meta.concrete_fields)
 
 
 class TenantQuerySet(models.QuerySet):
     """
-    Automatically scopes queries by active_company_id for company-bound models.
+    Automatically scopes queries by the active tenant scope for company-bound models.
+
+    The predicate is added exactly once per evaluation or compilation (fetch,
+    iterator, count, exists, aggregate, update, delete, explain, use as
+    subquery, set operations), to a clone; chained filter()/exclude() calls
+    never repeat it and the receiver itself stays unscoped. The scope
+    ContextVars are read once, at that point.
+
+    - company_id always (fail-closed: no active company => RuntimeError)
+    - facility_id / section_id / workstation_id when set and the model has the column
+    - caller passed company/company_id explicitly => no injection
     """
 
-    def _with_tenant(self):
-        company_id = require_active_company_id()
-        return self.filter(company_id=company_id)
+    def __init__(self, model=None, query=None, using=None, hints=None):
+        super().__init__(model=model, query=query, using=using, hints=hints)
+        self._tenant_scoped = False
+        self._tenant_explicit = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._tenant_scoped = self._tenant_scoped
+        clone._tenant_explicit = self._tenant_explicit
+        return clone
+
+    # =========================
+    # Scope
+    # =========================
+    def _tenant_lookups(self) -> dict:
+        lookups = {"company_id": require_active_company_id()}
+        columns = _model_columns(self.model)
+        for column, var in _SUB_SCOPES:
+            value = var.get()
+            if value and column in columns:
+                lookups[column] = value
+        return lookups
+
+    def _apply_tenant_scope(self) -> None:
+        # only ever called on a fresh clone (see _scoped_clone)
+        if self._tenant_scoped or self._tenant_explicit:
+            return
+        self.query.add_q(Q(**self._tenant_lookups()))
+        self._tenant_scoped = True
+
+    def _scoped_clone(self):
+        """
+        The queryset to evaluate: a clone carrying the tenant predicate of the
+        scope active now. The receiver is never modified, so a queryset reused
+        under another scope (or chained further) gets that scope, not this one.
+        """
+        if self.is_tenant_scoped:
+            return self
+        clone = self._chain()
+        clone._apply_tenant_scope()
+        return clone
+
+    @property
+    def is_tenant_scoped(self) -> bool:
+        return self._tenant_scoped or self._tenant_explicit
 
-    def all(self):
-        return self._with_tenant()
+    def scoped(self):
+        """
+        Return a clone with the tenant predicate already applied (e.g. to inspect SQL).
+        """
+        clone = self._chain()
+        clone._apply_tenant_scope()
+        return clone
 
-    def filter(self, *args, **kwargs):
-        qs = super().filter(*args, **kwargs)
+    def _filter_or_exclude(self, negate, args, kwargs):
+        clone = super()._filter_or_exclude(negate, args, kwargs)
         # If caller already provided company/company_id, do not override.
-        if "company" in kwargs or "company_id" in kwargs:
-            return qs
-        return qs._with_tenant()
-
-    def exclude(self, *args, **kwargs):
-        qs = super().exclude(*args, **kwargs)
-        if "company" in kwargs or "company_id" in kwargs:
-            return qs
-        return qs._with_tenant()
+        if _EXPLICIT_KEYS.intersection(kwargs):
+            clone._tenant_explicit = True
+        return clone
+
+    # =========================
+    # Evaluation / compilation points (run on _scoped_clone())
+    # =========================
+    def _fetch_all(self):
+        if self._result_cache is None and not self.is_tenant_scoped:
+            clone = self._scoped_clone()
+            clone._fetch_all()
+            self._result_cache = clone._result_cache
+            self._prefetch_done = clone._prefetch_done
+            return
+        super()._fetch_all()
+
+    def _iterator(self, use_chunked_fetch, chunk_size):
+        yield from super(TenantQuerySet, self._scoped_clone())._iterator(use_chunked_fetch, chunk_size)
+
+    def aiterator(self, chunk_size=2000):
+        return super(TenantQuerySet, self._scoped_clone()).aiterator(chunk_size=chunk_size)
+
+    def count(self):
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        return super(TenantQuerySet, self._scoped_clone()).count()
+
+    def exists(self):
+        if self._result_cache is not None:
+            return bool(self._result_cache)
+        return super(TenantQuerySet, self._scoped_clone()).exists()
+
+    def contains(self, obj):
+        if self._result_cache is not None:
+            return super().contains(obj)
+        return super(TenantQuerySet, self._scoped_clone()).contains(obj)
+
+    def aggregate(self, *args, **kwargs):
+        return super(TenantQuerySet, self._scoped_clone()).aggregate(*args, **kwargs)
+
+    def update(self, **kwargs):
+        return super(TenantQuerySet, self._scoped_clone()).update(**kwargs)
+
+    def _update(self, values):
+        return super(TenantQuerySet, self._scoped_clone())._update(values)
+
+    def delete(self):
+        return super(TenantQuerySet, self._scoped_clone()).delete()
+
+    def explain(self, *, format=None, **options):
+        return super(TenantQuerySet, self._scoped_clone()).explain(format=format, **options)
+
+    def resolve_expression(self, *args, **kwargs):
+        return super(TenantQuerySet, self._scoped_clone()).resolve_expression(*args, **kwargs)
+
+    def _combinator_query(self, combinator, *other_qs, all=False):
+        other_qs = tuple(qs._scoped_clone() if isinstance(qs, TenantQuerySet) else qs for qs in other_qs)
+        return super(TenantQuerySet, self._scoped_clone())._combinator_query(combinator, *other_qs, all=all)
 
 
 class TenantManager(models.Manager):
@@ -28,8 +28,8 @@ class TenantRBACMiddleware(MiddlewareMixin):
         if not request.user.is_authenticated:
             return
 
-        # Django admin must bypass tenancy gating
-        if request.path.startswith("/admin/"):
+        # Django admin and the staff-only ops endpoints must bypass tenancy gating
+        if request.path.startswith(("/admin/", "/ops/")):
             return
 
         membership = resolve_membership(request.user)
@@ -1,3 +1,107 @@
+from unittest import mock
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
 from django.test import TestCase
 
-# Create your tests here.
+from apps.inventory.models import Part
+from apps.tenancy import managers
+from apps.tenancy.context import clear_active_scope, set_active_scope
+from apps.tenancy.managers import TenantQuerySet
+from apps.tenancy.models import Company, Facility, Role, UserMembership
+
+
+def _parts():
+    return TenantQuerySet(model=Part)
+
+
+class TenantQuerySetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company_a = uuid4()
+        cls.company_b = uuid4()
+        for company_id, prefix in ((cls.company_a, "A"), (cls.company_b, "B")):
+            for i in range(3):
+                Part.objects.create(
+                    company_id=company_id,
+                    part_no=f"{prefix}-{i}",
+                    name=f"{prefix} {i}",
+                    part_type=Part.PartType.RAW_MATERIAL,
+                    procurement_strategy=Part.ProcurementStrategy.BUY,
+                )
+
+    def setUp(self):
+        set_active_scope(company_id=self.company_a)
+
+    def tearDown(self):
+        clear_active_scope()
+
+    def test_predicate_applied_once_across_chained_calls(self):
+        qs = _parts().all().filter(part_type="raw_material").filter(name__startswith="A").exclude(part_no="A-0")
+        self.assertFalse(qs.is_tenant_scoped)
+
+        sql = str(qs.scoped().query)
+        self.assertEqual(sql.count('"company_id" ='), 1)
+
+        with mock.patch.object(managers, "require_active_company_id", wraps=managers.require_active_company_id) as spy:
+            self.assertEqual(sorted(qs.values_list("part_no", flat=True)), ["A-1", "A-2"])
+        spy.assert_called_once()
+
+    def test_all_evaluation_points_are_scoped(self):
+        self.assertEqual(_parts().count(), 3)
+        self.assertTrue(_parts().filter(part_no="A-0").exists())
+        self.assertFalse(_parts().filter(part_no="B-0").exists())
+        self.assertEqual(_parts().aggregate(n=Count("id"))["n"], 3)
+        self.assertEqual(len(list(_parts().iterator())), 3)
+        self.assertEqual(_parts().union(_parts()).count(), 3)
+        self.assertEqual(Part.objects.filter(id__in=_parts().values("id")).count(), 3)
+
+        self.assertEqual(_parts().update(name="renamed"), 3)
+        self.assertEqual(Part.objects.filter(company_id=self.company_b, name="renamed").count(), 0)
+
+    def test_reused_queryset_follows_the_active_scope(self):
+        qs = _parts().filter(part_type="raw_material")
+        self.assertEqual(qs.count(), 3)
+        self.assertTrue(qs.exists())
+        self.assertEqual(qs.aggregate(n=Count("id"))["n"], 3)
+        self.assertEqual(qs.update(name="seen by A"), 3)
+
+        set_active_scope(company_id=self.company_b)
+        self.assertFalse(qs.is_tenant_scoped)
+        self.assertEqual(sorted(qs.all().values_list("part_no", flat=True)), ["B-0", "B-1", "B-2"])
+        self.assertEqual(qs.filter(name="seen by A").count(), 0)
+        self.assertEqual(qs.delete()[0], 3)
+        self.assertEqual(Part.objects.filter(company_id=self.company_a).count(), 3)
+
+    def test_explicit_company_filter_is_not_overridden(self):
+        qs = _parts().filter(company_id=self.company_b)
+        self.assertTrue(qs.is_tenant_scoped)
+        self.assertEqual(qs.count(), 3)
+
+    def test_fail_closed_at_evaluation_without_active_company(self):
+        clear_active_scope()
+        qs = _parts().filter(part_no="A-0")  # building is fine
+        with self.assertRaises(RuntimeError):
+            list(qs)
+
+    def test_sub_scope_applies_only_when_model_has_column(self):
+        company = Company.objects.create(name="Acme")
+        f1 = Facility.objects.create(company=company, name="F1")
+        f2 = Facility.objects.create(company=company, name="F2")
+        User = get_user_model()
+        for name, facility in (("u1", f1), ("u2", f2)):
+            UserMembership.objects.create(
+                user=User.objects.create_user(username=name),
+                company=company,
+                role=Role.PLANNER,
+                facility=facility,
+            )
+
+        set_active_scope(company_id=company.id, facility_id=f1.id)
+        members = TenantQuerySet(model=UserMembership)
+        self.assertEqual(list(members.values_list("user__username", flat=True)), ["u1"])
+
+        # Part has no facility_id column: company scope only
+        set_active_scope(company_id=self.company_a, facility_id=f1.id)
+        self.assertEqual(_parts().count(), 3)
@@ -0,0 +1,93 @@
+# factory_manager/db_pool.py
+from __future__ import annotations
+
+# Imported by settings.py: keep this module free of HTTP / view imports
+# (the /ops/db-pool/ view lives in factory_manager.views).
+
+import importlib.util
+import os
+from typing import Any, Mapping
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# =========================
+# Opt-in configuration (env driven)
+# =========================
+# DB_POOL=1                 psycopg_pool.ConnectionPool (requires psycopg[pool])
+# DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT / DB_POOL_MAX_IDLE
+# DB_PREPARE_THRESHOLD=N    server-side binding + prepare after N executions of a query shape
+DEFAULT_POOL_MIN_SIZE = 2
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_POOL_TIMEOUT = 10.0
+DEFAULT_POOL_MAX_IDLE = 300.0
+
+
+def _flag(env: Mapping[str, str], name: str) -> bool:
+    return env.get(name, "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def pool_options_from_env(env: Mapping[str, str]) -> dict[str, Any]:
+    return {
+        "min_size": int(env.get("DB_POOL_MIN_SIZE", DEFAULT_POOL_MIN_SIZE)),
+        "max_size": int(env.get("DB_POOL_MAX_SIZE", DEFAULT_POOL_MAX_SIZE)),
+        "timeout": float(env.get("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)),
+        "max_idle": float(env.get("DB_POOL_MAX_IDLE", DEFAULT_POOL_MAX_IDLE)),
+    }
+
+
+def configure_database(db: dict[str, Any], env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    """
+    Apply opt-in pooling / prepared statements to a DATABASES entry (PostgreSQL only).
+
+    - pooling replaces persistent connections (CONN_MAX_AGE must be 0 with a pool)
+    - prepared statements need server-side binding (client-side binding never prepares)
+    Fail-closed: DB_POOL=1 without psycopg_pool installed => ImproperlyConfigured.
+    """
+    env = os.environ if env is None else env
+    if "postgresql" not in db.get("ENGINE", ""):
+        return db
+
+    options = dict(db.get("OPTIONS") or {})
+
+    if _flag(env, "DB_POOL"):
+        if importlib.util.find_spec("psycopg_pool") is None:
+            raise ImproperlyConfigured("DB_POOL=1 requires psycopg_pool (pip install 'psycopg[pool]')")
+        options["pool"] = pool_options_from_env(env)
+        db["CONN_MAX_AGE"] = 0
+
+    threshold = env.get("DB_PREPARE_THRESHOLD", "").strip()
+    if threshold:
+        options["server_side_binding"] = True
+        options["prepare_threshold"] = int(threshold)
+
+    db["OPTIONS"] = options
+    return db
+
+
+# =========================
+# Metrics
+# =========================
+def pool_stats(alias: str = DEFAULT_DB_ALIAS) -> dict[str, Any]:
+    """
+    Snapshot of the connection pool of `alias` (psycopg_pool get_stats()) plus
+    the effective prepared-statement settings. Pool-less aliases report pooled=False.
+    """
+    connection = connections[alias]
+    options = connection.settings_dict.get("OPTIONS") or {}
+    data: dict[str, Any] = {
+        "alias": alias,
+        "vendor": connection.vendor,
+        "pooled": False,
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+        "server_side_binding": bool(options.get("server_side_binding")),
+        "prepare_threshold": options.get("prepare_threshold"),
+    }
+
+    pool = getattr(connection, "pool", None)
+    if pool is not None:
+        data["pooled"] = True
+        data["stats"] = dict(pool.get_stats())
+    return data
+
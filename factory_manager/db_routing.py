@@ -0,0 +1,231 @@
+# factory_manager/db_routing.py
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+
+
+REPLICA_ALIAS = "replica"
+
+# Read models routed to the replica by default (model._meta.label_lower).
+DEFAULT_REPLICA_READ_MODELS = frozenset(
+    {
+        "inventory.partstocksummary",
+        "audit.auditevent",
+    }
+)
+
+DEFAULT_MAX_LAG_SECONDS = 5.0
+DEFAULT_LAG_CHECK_INTERVAL_SECONDS = 2.0
+
+_pinned_to_primary: ContextVar[bool] = ContextVar("db_pinned_to_primary", default=False)
+_replica_reads: ContextVar[bool] = ContextVar("db_replica_reads", default=False)
+
+
+# =========================
+# Request-scoped flags
+# =========================
+def pin_to_primary() -> None:
+    """
+    Read-your-writes: after a ledger write, every read of this request/task goes to the primary.
+    """
+    _pinned_to_primary.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    return _pinned_to_primary.get()
+
+
+def reset_primary_pin() -> None:
+    _pinned_to_primary.set(False)
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """
+    Route every read inside the block to the replica (reports, rebuild aggregations,
+    history browsing). The caller accepts bounded staleness (lag guard still applies).
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+# =========================
+# Replication lag guard
+# =========================
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_lag_lock = threading.Lock()
+_lag_cache: dict[str, tuple[float, float | None]] = {}
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_lag_seconds(alias: str = REPLICA_ALIAS) -> float | None:
+    """
+    Replication lag of `alias` in seconds; None if unknown / unreachable.
+    Non-PostgreSQL stand-ins (e.g. SQLite for local testing) report 0.
+    """
+    try:
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            return 0.0
+        with connection.cursor() as cur:
+            cur.execute(_LAG_SQL)
+            row = cur.fetchone()
+    except Exception:
+        return None
+    if not row or row[0] is None:
+        return None
+    return float(row[0])
+
+
+def replica_is_fresh(alias: str = REPLICA_ALIAS) -> bool:
+    """
+    Lag guard: replica is used only if its lag is known and within
+    DATABASE_REPLICA_MAX_LAG_SECONDS. The probe result is cached for
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS (one probe per interval per process).
+    """
+    max_lag = getattr(settings, "DATABASE_REPLICA_MAX_LAG_SECONDS", DEFAULT_MAX_LAG_SECONDS)
+    interval = getattr(settings, "DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS", DEFAULT_LAG_CHECK_INTERVAL_SECONDS)
+
+    now = time.monotonic()
+    with _lag_lock:
+        cached = _lag_cache.get(alias)
+        if cached is not None and now - cached[0] < interval:
+            lag = cached[1]
+        else:
+            lag = None
+            cached = None
+
+    if cached is None:
+        lag = replica_lag_seconds(alias)
+        with _lag_lock:
+            _lag_cache[alias] = (now, lag)
+
+    return lag is not None and lag <= max_lag
+
+
+def clear_lag_cache() -> None:
+    with _lag_lock:
+        _lag_cache.clear()
+
+
+# =========================
+# Router
+# =========================
+class PrimaryReplicaRouter:
+    """
+    Primary/replica routing (no-op unless DATABASES["replica"] is configured).
+
+    Reads go to the replica when:
+    - inside replica_reads(), or
+    - the model is a read model (DATABASE_REPLICA_READ_MODELS) and no primary
+      transaction is open,
+    and the request is not pinned to the primary and the replica passes the lag guard.
+    Writes and migrations always target the primary.
+    """
+
+    def _read_models(self) -> frozenset[str]:
+        models = getattr(settings, "DATABASE_REPLICA_READ_MODELS", None)
+        return frozenset(models) if models is not None else DEFAULT_REPLICA_READ_MODELS
+
+    def db_for_read(self, model, **hints):
+        if not replica_configured() or is_pinned_to_primary():
+            return DEFAULT_DB_ALIAS
+
+        if _replica_reads.get():
+            return REPLICA_ALIAS if replica_is_fresh() else DEFAULT_DB_ALIAS
+
+        # Reads inside a primary transaction must see its writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        if model._meta.label_lower in self._read_models() and replica_is_fresh():
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        dbs = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in dbs and obj2._state.db in dbs:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica schema comes from replication, never from migrate.
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class _PinResettingStream:
+    """
+    Streaming body that resets the pin once exhausted or closed. A class rather
+    than a generator: closing a generator that never started skips its finally.
+    """
+
+    def __init__(self, content):
+        self._content = iter(content)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._content)
+        except StopIteration:
+            reset_primary_pin()
+            raise
+
+    def close(self):
+        reset_primary_pin()
+
+
+async def _areset_pin_after(content):
+    # ASGI: each request runs in its own context, so an unstarted body cannot leak the pin
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        reset_primary_pin()
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """
+    Request-scoped pin: reset at request start and end (threads are reused under WSGI).
+    A streaming body is produced after process_response(), so there the pin is
+    reset once the body is exhausted or closed (the response closes its iterator).
+    """
+
+    def process_request(self, request):
+        reset_primary_pin()
+        return None
+
+    def process_response(self, request, response):
+        if response.streaming:
+            wrap = _areset_pin_after if response.is_async else _PinResettingStream
+            response.streaming_content = wrap(response.streaming_content)
+        else:
+            reset_primary_pin()
+        return response
@@ -0,0 +1,311 @@
+# factory_manager/instrumentation.py
+from __future__ import annotations
+
+import functools
+import ipaddress
+from abc import ABC, abstractmethod
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+
+logger = logging.getLogger("factory_manager.instrumentation")
+
+# =========================
+# Configuration (settings driven, opt-in)
+# =========================
+# INSTRUMENTATION_SINKS="memory,log,prometheus"   empty => disabled (spans are a shared no-op)
+# INSTRUMENTATION_SLOW_MS=N                        log sink: only spans >= N ms (0 => every span)
+SINK_NAMES = ("memory", "log", "prometheus")
+
+# Histogram upper bounds (seconds), Prometheus-style cumulative buckets
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    name: str
+    duration_s: float
+    queries: int
+    error: bool = False
+
+
+# =========================
+# Sinks
+# =========================
+class Sink(ABC):
+    @abstractmethod
+    def record(self, rec: SpanRecord) -> None:
+        """Consume one finished span (called on the request thread: keep it cheap)."""
+
+
+@dataclass
+class SpanHistogram:
+    count: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    queries: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(DURATION_BUCKETS) + 1))
+
+    def add(self, rec: SpanRecord) -> None:
+        self.count += 1
+        self.errors += int(rec.error)
+        self.total_s += rec.duration_s
+        self.max_s = max(self.max_s, rec.duration_s)
+        self.queries += rec.queries
+        self.buckets[bisect_left(DURATION_BUCKETS, rec.duration_s)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_s * 1000.0, 3),
+            "avg_ms": round(self.total_s * 1000.0 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_s * 1000.0, 3),
+            "queries": self.queries,
+        }
+
+
+class MemorySink(Sink):
+    """
+    In-process histograms per span name (thread-safe).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: dict[str, SpanHistogram] = {}
+
+    def record(self, rec: SpanRecord) -> None:
+        with self._lock:
+            hist = self._spans.get(rec.name)
+            if hist is None:
+                hist = self._spans[rec.name] = SpanHistogram()
+            hist.add(rec)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: hist.as_dict() for name, hist in sorted(self._spans.items())}
+
+    def histograms(self) -> dict[str, SpanHistogram]:
+        with self._lock:
+            return {
+                name: SpanHistogram(h.count, h.errors, h.total_s, h.max_s, h.queries, list(h.buckets))
+                for name, h in sorted(self._spans.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class LogSink(Sink):
+    """
+    One log line per span at or above `slow_ms` (slow-path profiler).
+    """
+
+    def __init__(self, slow_ms: float = 0.0) -> None:
+        self.slow_ms = slow_ms
+
+    def record(self, rec: SpanRecord) -> None:
+        ms = rec.duration_s * 1000.0
+        if ms < self.slow_ms:
+            return
+        logger.info("span name=%s ms=%.3f queries=%d error=%s", rec.name, ms, rec.queries, rec.error)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusSink(MemorySink):
+    """
+    MemorySink rendered as Prometheus text exposition (served by `metrics_view`).
+    """
+
+    def render(self) -> str:
+        lines = [
+            "# HELP fm_span_duration_seconds Duration of instrumented spans.",
+            "# TYPE fm_span_duration_seconds histogram",
+        ]
+        hists = self.histograms()
+        for name, h in hists.items():
+            span = _label(name)
+            cumulative = 0
+            for bound, n in zip(DURATION_BUCKETS, h.buckets):
+                cumulative += n
+                lines.append(f'fm_span_duration_seconds_bucket{{span="{span}",le="{bound}"}} {cumulative}')
+            lines.append(f'fm_span_duration_seconds_bucket{{span="{span}",le="+Inf"}} {h.count}')
+            lines.append(f'fm_span_duration_seconds_sum{{span="{span}"}} {h.total_s:.6f}')
+            lines.append(f'fm_span_duration_seconds_count{{span="{span}"}} {h.count}')
+
+        lines += ["# HELP fm_span_queries_total Database queries executed inside spans.", "# TYPE fm_span_queries_total counter"]
+        lines += [f'fm_span_queries_total{{span="{_label(name)}"}} {h.queries}' for name, h in hists.items()]
+
+        lines += ["# HELP fm_span_errors_total Spans that exited with an exception.", "# TYPE fm_span_errors_total counter"]
+        lines += [f'fm_span_errors_total{{span="{_label(name)}"}} {h.errors}' for name, h in hists.items()]
+        return "\n".join(lines) + "\n"
+
+
+# =========================
+# Registry
+# =========================
+_sinks: list[Sink] | None = None  # None => not configured yet (read settings on first span)
+
+
+def _build_sink(name: str) -> Sink:
+    if name == "memory":
+        return MemorySink()
+    if name == "log":
+        return LogSink(slow_ms=float(getattr(settings, "INSTRUMENTATION_SLOW_MS", 0) or 0))
+    if name == "prometheus":
+        return PrometheusSink()
+    raise ValueError(f"Unknown instrumentation sink: {name} (expected one of {SINK_NAMES})")
+
+
+def configure_instrumentation(sinks: Iterable[str | Sink] | None = None) -> list[Sink]:
+    """
+    (Re)configure active sinks. None => settings.INSTRUMENTATION_SINKS; empty => disabled.
+    """
+    global _sinks
+    if sinks is None:
+        raw = getattr(settings, "INSTRUMENTATION_SINKS", "") or ""
+        sinks = [s.strip() for s in raw.split(",") if s.strip()]
+    _sinks = [s if isinstance(s, Sink) else _build_sink(s) for s in sinks]
+    return _sinks
+
+
+def active_sinks() -> list[Sink]:
+    if _sinks is None:
+        return configure_instrumentation()
+    return _sinks
+
+
+def get_sink(kind: type[Sink]) -> Sink | None:
+    for sink in active_sinks():
+        if isinstance(sink, kind):
+            return sink
+    return None
+
+
+def is_enabled() -> bool:
+    return bool(active_sinks())
+
+
+# =========================
+# Spans
+# =========================
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+@contextmanager
+def _live_span(name: str, sinks: list[Sink], using: str) -> Iterator[None]:
+    queries = 0
+
+    def _count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    error = False
+    started = time.perf_counter()
+    try:
+        with connections[using].execute_wrapper(_count):
+            yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        rec = SpanRecord(name=name, duration_s=time.perf_counter() - started, queries=queries, error=error)
+        for sink in sinks:
+            try:
+                sink.record(rec)
+            except Exception:
+                # Never let a sink break the instrumented write path
+                logger.exception("instrumentation sink failed: %s", type(sink).__name__)
+
+
+def span(name: str, *, using: str = DEFAULT_DB_ALIAS):
+    """
+    Time a block and count the queries it runs on `using`. Nested spans each count
+    their own queries. Disabled => returns a shared no-op context manager.
+    """
+    sinks = _sinks if _sinks is not None else active_sinks()
+    if not sinks:
+        return NOOP_SPAN
+    return _live_span(name, sinks, using)
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Decorator form of `span` (one attribute check per call when disabled).
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            sinks = _sinks if _sinks is not None else active_sinks()
+            if not sinks:
+                return fn(*args, **kwargs)
+            with _live_span(name, sinks, DEFAULT_DB_ALIAS):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# =========================
+# Endpoint
+# =========================
+def _scraper_allowed(request) -> bool:
+    """
+    REMOTE_ADDR inside INSTRUMENTATION_METRICS_ALLOWED_IPS (comma list of
+    addresses / CIDR networks; empty => nobody). Loopback is not trusted by
+    itself: behind a local reverse proxy every client looks local.
+    """
+    raw = getattr(settings, "INSTRUMENTATION_METRICS_ALLOWED_IPS", "")
+    networks = [v.strip() for v in raw.split(",") if v.strip()] if isinstance(raw, str) else list(raw)
+    if not networks:
+        return False
+    try:
+        addr = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+        return any(addr in ipaddress.ip_network(net, strict=False) for net in networks)
+    except ValueError:
+        return False
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Prometheus text exposition of span metrics (staff or an allowlisted
+    scraper address only, fail-closed). 404 unless the prometheus sink is configured.
+    """
+    user = getattr(request, "user", None)
+    if not ((user and user.is_authenticated and user.is_staff) or _scraper_allowed(request)):
+        raise PermissionDenied("Staff or allowlisted scraper only.")
+
+    sink = get_sink(PrometheusSink)
+    if sink is None:
+        raise Http404("Prometheus sink is not configured.")
+    return HttpResponse(sink.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,180 @@
+# factory_manager/query_budget.py
+from __future__ import annotations
+
+import functools
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+logger = logging.getLogger("factory_manager.query_budget")
+
+# =========================
+# Configuration
+# =========================
+# QUERY_BUDGET_MODE = "off" | "log" | "raise"  (default: off; the test runner and QueryBudgetTestMixin => raise)
+BUDGET_MODES = ("off", "log", "raise")
+DEFAULT_BUDGET_MODE = "off"
+
+_SAVEPOINT = re.compile(r'(SAVEPOINT )"[^"]+"')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%s|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WS = re.compile(r"\s+")
+
+
+def sql_shape(sql: str) -> str:
+    """
+    Normalise a statement to its shape: literals/params => ?, IN lists => (...).
+    Two executions of the same ORM query differ only in parameters => same shape.
+    """
+    shape = _SAVEPOINT.sub(r"\1?", sql)
+    shape = _STRING.sub("?", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(...)", shape)
+    return _WS.sub(" ", shape).strip()
+
+
+@dataclass
+class BudgetReport:
+    name: str
+    max_queries: int
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def executed(self) -> int:
+        return len(self.statements)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.executed > self.max_queries
+
+    def repeated_shapes(self) -> list[tuple[str, int]]:
+        counts = Counter(sql_shape(sql) for sql in self.statements)
+        return [(shape, n) for shape, n in counts.most_common() if n > 1]
+
+    def format(self) -> str:
+        lines = [f"query budget exceeded: {self.name} executed {self.executed} queries (budget {self.max_queries})"]
+        repeated = self.repeated_shapes()
+        if repeated:
+            lines.append("repeated shapes:")
+            lines += [f"  {n}x {shape}" for shape, n in repeated]
+        else:
+            lines.append("no repeated shapes; statements:")
+            lines += [f"  {sql_shape(sql)}" for sql in self.statements]
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, report: BudgetReport):
+        super().__init__(report.format())
+        self.report = report
+
+
+def _default_mode() -> str:
+    mode = getattr(settings, "QUERY_BUDGET_MODE", DEFAULT_BUDGET_MODE) or DEFAULT_BUDGET_MODE
+    if mode not in BUDGET_MODES:
+        raise ValueError(f"Unknown QUERY_BUDGET_MODE: {mode} (expected one of {BUDGET_MODES})")
+    return mode
+
+
+class query_budget:
+    """
+    Cap the number of queries a block (or function) runs on `using`.
+
+        with query_budget(5, name="ledger.post"):
+            ...
+
+        @query_budget(5)
+        def service(...): ...
+
+    Over budget => log a warning or raise QueryBudgetExceeded (mode / QUERY_BUDGET_MODE),
+    listing the SQL shapes that repeated (usual N+1 signature). A block that raises
+    is not reported (its exception wins). mode="off" installs nothing.
+    """
+
+    def __init__(self, max_queries: int, *, name: str | None = None, mode: str | None = None, using: str = DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.name = name
+        self.mode = mode
+        self.using = using
+        self.report: BudgetReport | None = None
+        self._wrapper = None
+
+    def _capture(self, execute, sql, params, many, context):
+        self.report.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        mode = self.mode or _default_mode()
+        if mode == "off":
+            return self
+        self._mode = mode
+        self.report = BudgetReport(name=self.name or "query_budget", max_queries=self.max_queries)
+        self._wrapper = connections[self.using].execute_wrapper(self._capture)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._wrapper is None:
+            return False
+        self._wrapper.__exit__(exc_type, exc, tb)
+        self._wrapper = None
+
+        if exc_type is not None or not self.report.exceeded:
+            return False
+        if self._mode == "raise":
+            raise QueryBudgetExceeded(self.report)
+        logger.warning(self.report.format())
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        name = self.name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # fresh instance per call: re-entrant and thread-safe
+            with query_budget(self.max_queries, name=name, mode=self.mode, using=self.using):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+# =========================
+# Admin + test helpers
+# =========================
+class QueryBudgetAdminMixin:
+    """
+    ModelAdmin mixin: guard changelist_view with `changelist_query_budget` (None => unguarded).
+    """
+
+    changelist_query_budget: int | None = None
+
+    def changelist_view(self, request, extra_context=None):
+        if self.changelist_query_budget is None:
+            return super().changelist_view(request, extra_context)
+
+        name = f"admin.{self.model._meta.label_lower}.changelist"
+        with query_budget(self.changelist_query_budget, name=name):
+            response = super().changelist_view(request, extra_context)
+            # TemplateResponse: the changelist queries run while rendering
+            if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+                response.render()
+        return response
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin: `with self.assertQueryBudget(n): ...` fails the test (with the
+    repeated SQL shapes) when the block runs more than n queries.
+    """
+
+    def assertQueryBudget(self, max_queries: int, *, name: str | None = None, using: str = DEFAULT_DB_ALIAS):
+        return query_budget(max_queries, name=name or self.id(), mode="raise", using=using)
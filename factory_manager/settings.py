@@ -6,6 +6,8 @@ import os
 from dotenv import load_dotenv
 import dj_database_url
 
+from factory_manager.db_pool import configure_database
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # .env is optional locally, but required vars are not optional
@@ -43,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "apps.tenancy.middleware.TenantContextMiddleware",
+    "factory_manager.db_routing.PrimaryPinMiddleware",
 
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -77,6 +80,49 @@ WSGI_APPLICATION = "factory_manager.wsgi.application"
 DATABASES = {
     "default": dj_database_url.parse(DATABASE_URL, conn_max_age=600),
 }
+# Opt-in: DB_POOL=1 (psycopg pool), DB_PREPARE_THRESHOLD=N (server-side prepared statements)
+configure_database(DATABASES["default"])
+
+# Optional read replica (reports / read models). Local testing: a second Postgres
+# or a SQLite copy of the primary can stand in.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = configure_database(dj_database_url.parse(DATABASE_REPLICA_URL, conn_max_age=600))
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["factory_manager.db_routing.PrimaryReplicaRouter"]
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "5"))
+DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS = float(os.getenv("DATABASE_REPLICA_LAG_CHECK_INTERVAL_SECONDS", "2"))
+
+# Write-path spans (factory_manager.instrumentation): comma list of memory,log,prometheus; empty => disabled
+INSTRUMENTATION_SINKS = os.getenv("INSTRUMENTATION_SINKS", "")
+INSTRUMENTATION_SLOW_MS = float(os.getenv("INSTRUMENTATION_SLOW_MS", "0"))
+# /ops/metrics/ without staff login: comma list of scraper IPs / CIDRs (empty => staff only)
+INSTRUMENTATION_METRICS_ALLOWED_IPS = os.getenv("INSTRUMENTATION_METRICS_ALLOWED_IPS", "")
+
+# factory_manager.query_budget: off | log | raise (over-budget critical paths); the test runner defaults to raise
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "off")
+TEST_RUNNER = "factory_manager.test_runner.BudgetedTestRunner"
+
+# apps.inventory.cdc: pg_notify per ledger insert, opt-in (NOTIFY takes a cluster-wide lock at commit)
+LEDGER_CDC_NOTIFY = os.getenv("LEDGER_CDC_NOTIFY", "0") == "1"
+
+# apps.inventory.ledger_sequence: PostgreSQL consumers always read rows older than this (> longest ledger transaction)
+LEDGER_CONSUMER_HOLDBACK_SECONDS = float(os.getenv("LEDGER_CONSUMER_HOLDBACK_SECONDS", "10"))
+
+# apps.inventory.ledger_sequence: max clock skew between app servers (created_at) when the
+# horizon is bounded by the oldest open transaction instead of the holdback
+LEDGER_CONSUMER_CLOCK_SKEW_SECONDS = float(os.getenv("LEDGER_CONSUMER_CLOCK_SKEW_SECONDS", "0.1"))
+
+# apps.inventory.services: worker threads for async ledger posts (keep <= DB connection budget; 0 => thread-sensitive)
+LEDGER_ASYNC_WORKERS = int(os.getenv("LEDGER_ASYNC_WORKERS", os.getenv("DB_POOL_MAX_SIZE", "10")))
+
+# apps.inventory.part_cache: per-process Part attribute LRU (TTL bounds staleness across processes)
+PART_CACHE_MAX_SIZE = int(os.getenv("PART_CACHE_MAX_SIZE", "10000"))
+PART_CACHE_TTL_SECONDS = float(os.getenv("PART_CACHE_TTL_SECONDS", "300"))
+
+# apps.inventory.stock_deltas: striped qty counters per part for hot parts (0 => off; run compact_stock_deltas)
+STOCK_SUMMARY_STRIPES = int(os.getenv("STOCK_SUMMARY_STRIPES", "0"))
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -0,0 +1,20 @@
+# factory_manager/test_runner.py
+from __future__ import annotations
+
+import os
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class BudgetedTestRunner(DiscoverRunner):
+    """
+    The suite runs with QUERY_BUDGET_MODE=raise (deployments default to off), so a
+    critical path that grows past its query budget fails the test that drove it.
+    An explicit QUERY_BUDGET_MODE in the environment wins, e.g. "log" for a local
+    run that should only report.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "raise")
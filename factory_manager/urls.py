@@ -15,8 +15,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from factory_manager.instrumentation import metrics_view
+from factory_manager.views import pool_metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('ops/db-pool/', pool_metrics, name='db_pool_metrics'),
+    path('ops/metrics/', metrics_view, name='instrumentation_metrics'),
+    path('inventory/', include('apps.inventory.urls')),
 ]
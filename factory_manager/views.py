@@ -0,0 +1,23 @@
+# factory_manager/views.py
+from __future__ import annotations
+
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from factory_manager.db_pool import pool_stats
+
+
+# =========================
+# Ops endpoints (/ops/...: staff only, outside tenant scoping)
+# =========================
+@require_GET
+def pool_metrics(request):
+    """
+    JSON pool metrics for every configured alias (staff only, fail-closed).
+    """
+    user = getattr(request, "user", None)
+    if not (user and user.is_authenticated and user.is_staff):
+        raise PermissionDenied("Staff only.")
+    return JsonResponse({"databases": [pool_stats(alias) for alias in connections]})